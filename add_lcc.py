@@ -5,10 +5,16 @@ import os
 import pathlib
 import typing
 
-import networkx as nx
+import numpy as np
+import numpy.typing as npt
+import scipy.sparse
+import scipy.sparse.csgraph
 import yaml
 
+import edge_files
 import graph_properties
+import read_graph
+import write_graph
 
 __all__ = ["for_graph", "for_graphs_in_root"]
 
@@ -36,6 +42,15 @@ def main() -> None:
             "an empty string, the path will be read from stdin"
         ),
     )
+    _ = parser.add_argument(
+        "-c",
+        "--compression",
+        choices=[c for c in edge_files.SUFFIXES if c is not None],
+        help=(
+            "Compress the edge list of the LCC: 'gz' or 'xz' for a compressed text "
+            "file, or 'dv' for a delta-encoded binary file (default: plain text)"
+        ),
+    )
 
     args = parser.parse_args()
 
@@ -43,13 +58,14 @@ def main() -> None:
         args.path = input()
 
     if args.all:
-        for_graphs_in_root(args.path)
+        for_graphs_in_root(args.path, compression=args.compression)
     else:
-        for_graph(args.path)
+        for_graph(args.path, compression=args.compression)
 
 
 def for_graphs_in_root(
     rootdir: pathlib.Path | os.PathLike[typing.Any] | str = "./data/graphs/",
+    compression: edge_files.Compression | None = None,
 ) -> None:
     if not os.fspath(rootdir):
         raise ValueError("Cannot specify an empty path or string for path")
@@ -57,13 +73,16 @@ def for_graphs_in_root(
         rootdir = pathlib.Path(rootdir)
 
     for dir in rootdir.iterdir():
-        if not dir.is_dir:
+        if not dir.is_dir():
             continue
 
-        for_graph(dir)
+        for_graph(dir, compression)
 
 
-def for_graph(dir: pathlib.Path | os.PathLike[typing.Any] | str) -> None:
+def for_graph(
+    dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    compression: edge_files.Compression | None = None,
+) -> None:
     if not os.fspath(dir):
         raise ValueError("Cannot specify an empty path or string for dir")
     else:
@@ -84,29 +103,114 @@ def for_graph(dir: pathlib.Path | os.PathLike[typing.Any] | str) -> None:
         return
 
     # read
-    g_path = dir / "graph.edges"
-    g: nx.Graph[int] = nx.read_edgelist(g_path, nodetype=int)
+    edges_path = edge_files.find(dir)
+    if edges_path is None:
+        raise FileNotFoundError(f"No edge list in '{dir}'")
+    edges = read_graph.read_edge_arrays(edges_path)
+    if edges.labels is not None:
+        raise ValueError(f"Non-integer node labels in '{edges_path}'")
 
     # get LCC and node mapping
-    lcc_nodes = max(nx.connected_components(g), key=len)
-    lcc_nodes = sorted(lcc_nodes)
-    lcc = g.subgraph(lcc_nodes)
-    mapping = dict(zip(lcc_nodes, range(len(lcc_nodes)), strict=False))
-    lcc = nx.relabel_nodes(lcc, mapping)
+    lcc_sources, lcc_targets, lcc_nodes = _lcc_edges(edges.sources, edges.targets)
+    del edges
 
     # write
     lcc_dir.mkdir()
-    with open(lcc_dir / "graph.edges", "wb") as f:
-        nx.write_edgelist(lcc, f, data=False)
-    with open(lcc_dir / "properties.yaml", "w") as f:
-        for key, val in graph_properties.compute(lcc).items():
-            _ = f.write(f"{key}: {graph_properties.format_value(val)}\n")
-    with open(lcc_dir / "node_mapping.txt", "w") as f:
-        for orig, new in mapping.items():
-            _ = f.write(f"{new} {orig}\n")
+    write_graph.to_edge_list_file(
+        edge_files.path_for(lcc_dir, compression), lcc_sources, lcc_targets
+    )
+    graph_properties.write_properties(
+        lcc_dir,
+        graph_properties.compute_from_edges(
+            lcc_sources, lcc_targets, num_nodes=lcc_nodes.size
+        ),
+    )
+    write_graph.to_node_mapping_file(
+        lcc_dir / "node_mapping.txt", np.arange(lcc_nodes.size), lcc_nodes
+    )
 
     print(lcc_dir)
 
 
+def _lcc_edges(
+    sources: npt.NDArray[np.int64], targets: npt.NDArray[np.int64]
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    r"""Finds the largest connected component (LCC) of the graph with the given
+    edges, whose endpoints are integer node labels.
+
+    The LCC and the order of its edges are the same as if the graph were read with
+    :func:`nx.read_edgelist`, its LCC taken as the largest of
+    :func:`nx.connected_components`, and its edges listed by
+    :func:`nx.write_edgelist` after taking the subgraph induced by the sorted LCC
+    nodes and relabeling them, so that the files written are identical.
+
+    :return: The endpoints of the LCC's edges, relabeled to the indices of the
+        endpoints in the sorted LCC nodes and oriented and ordered as
+        :func:`nx.write_edgelist` would list them, and the sorted original labels of
+        the LCC's nodes
+    """
+
+    # number the nodes in ascending order of their labels, and record the order in
+    # which nx.Graph would have them: that of first appearance in the file
+    endpoints = np.stack((sources, targets), axis=1).ravel()
+    labels, first_pos, inverse = np.unique(
+        endpoints, return_index=True, return_inverse=True
+    )
+    del endpoints
+    num_nodes = labels.size
+    us, vs = inverse[0::2], inverse[1::2]
+    del inverse
+    insertion_rank = np.empty(num_nodes, dtype=np.int64)
+    insertion_rank[np.argsort(first_pos)] = np.arange(num_nodes)
+    del first_pos
+
+    # drop repeated edges, keeping the first occurrence of each like nx.Graph does
+    keys = np.minimum(us, vs) * num_nodes + np.maximum(us, vs)
+    _, first_edges = np.unique(keys, return_index=True)
+    del keys
+    first_edges.sort()
+    us, vs = us[first_edges], vs[first_edges]
+    del first_edges
+
+    # the LCC is the first of the largest components in the order in which
+    # nx.connected_components finds them, i.e., by their first inserted node
+    adj = scipy.sparse.coo_array(
+        (np.ones(us.size, dtype=np.int8), (us, vs)), shape=(num_nodes, num_nodes)
+    )
+    _, component = scipy.sparse.csgraph.connected_components(adj, directed=False)
+    del adj
+    sizes = np.bincount(component)
+    first_rank = np.full(sizes.size, num_nodes, dtype=np.int64)
+    np.minimum.at(first_rank, component, insertion_rank)
+    largest = np.flatnonzero(sizes == sizes.max())
+    in_lcc = component == largest[np.argmin(first_rank[largest])]
+    del component
+    lcc_nodes = np.flatnonzero(in_lcc)
+
+    # the subgraph view iterates over its nodes in the order of the graph, unless it
+    # is less than half the graph, in which case it iterates over a set of them
+    if 2 * lcc_nodes.size < num_nodes:
+        lcc_labels = labels[lcc_nodes].tolist()
+        set_order = np.array(list(set(lcc_labels)), dtype=np.int64)
+        view_rank = np.empty(num_nodes, dtype=np.int64)
+        view_rank[np.searchsorted(labels, set_order)] = np.arange(lcc_nodes.size)
+    else:
+        view_rank = insertion_rank
+    del insertion_rank
+
+    # each edge is listed under the endpoint that comes first in the view, in the
+    # order in which it was added to that endpoint's adjacency
+    lcc_edges = np.flatnonzero(in_lcc[us])
+    us, vs = us[lcc_edges], vs[lcc_edges]
+    swap = view_rank[vs] < view_rank[us]
+    us, vs = np.where(swap, vs, us), np.where(swap, us, vs)
+    order = np.argsort(view_rank[us], kind="stable")
+
+    # the nodes are numbered in ascending order of their labels, so relabeling them
+    # to their indices among the sorted LCC nodes is a single lookup
+    new_label = np.cumsum(in_lcc) - 1
+    return new_label[us[order]], new_label[vs[order]], labels[lcc_nodes]
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+import argparse
+import sys
+import typing
+from collections import abc
+
+import numpy as np
+import numpy.typing as npt
+
+import read_graph
+import utils
+import vc_bounds
+from csr_graph import CSRGraph
+
+__all__ = [
+    "ALGORITHMS",
+    "Cover",
+    "greedy_cover",
+    "local_ratio_cover",
+    "matching_cover",
+    "solve",
+]
+
+logger = utils.configure_logger(__name__)
+
+Cover: typing.TypeAlias = npt.NDArray[np.bool_]
+
+# number of nodes of a solution formatted at once, which bounds the memory used for
+# the text
+_NODES_PER_CHUNK = 1 << 16
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Find a vertex cover of the graph whose edge list is read from stdin with "
+            "a baseline algorithm, and print it as a 'node, node, ... => cardinality' "
+            "line, like the solvers run by run_experiments.py."
+        )
+    )
+    _ = parser.add_argument(
+        "algorithm",
+        choices=sorted(ALGORITHMS),
+        help="Algorithm to run",
+    )
+    _ = parser.add_argument(
+        "-i",
+        "--input",
+        help="Path to the edge list, which may be compressed (default: stdin)",
+    )
+
+    args = parser.parse_args()
+
+    edges = read_graph.read_edge_arrays(args.input or sys.stdin.buffer)
+    cover, labels = solve(edges, args.algorithm)
+    nodes = np.flatnonzero(cover)
+    logger.info(f"Found a cover of {nodes.size} nodes with {args.algorithm}")
+
+    out = sys.stdout.buffer
+    for start in range(0, nodes.size, _NODES_PER_CHUNK):
+        chunk = labels[nodes[start : start + _NODES_PER_CHUNK]].tolist()
+        if start:
+            _ = out.write(b", ")
+        _ = out.write(", ".join(map(str, chunk)).encode())
+    _ = out.write(f" => {nodes.size}\n".encode())
+    out.flush()
+
+
+def solve(
+    edges: read_graph.EdgeArrays, algorithm: str
+) -> tuple[Cover, npt.NDArray[typing.Any]]:
+    r"""Finds a vertex cover of the graph with the given edges with one of the
+    :data:`ALGORITHMS`.
+
+    The nodes are numbered in ascending order of their labels (or in order of first
+    appearance, for string labels), and the edges are passed to the algorithm in the
+    order in which they were read.  The nodes with self-loops are added to the cover
+    of the rest of the graph.
+
+    :return: Whether each node is in the cover, and the label of each node
+    """
+
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unrecognized algorithm: {algorithm}")
+
+    if edges.labels is None:
+        labels, inverse = np.unique(
+            np.concatenate((edges.sources, edges.targets)), return_inverse=True
+        )
+        sources, targets = np.split(inverse, 2)
+    else:
+        labels = np.array(edges.labels, dtype=object)
+        sources, targets = edges.sources, edges.targets
+
+    loops = sources == targets
+    cover = ALGORITHMS[algorithm](sources[~loops], targets[~loops], labels.size)
+    cover[sources[loops]] = True
+    return cover, labels
+
+
+def local_ratio_cover(
+    sources: npt.NDArray[np.int64], targets: npt.NDArray[np.int64], num_nodes: int
+) -> Cover:
+    r"""Finds a vertex cover of a graph without self-loops with the local-ratio
+    2-approximation of Bar-Yehuda and Even for unit weights.
+
+    Each edge in turn lowers the weights of both of its endpoints by the smaller of
+    the two, and the nodes whose weight reaches zero form the cover; with unit
+    weights, this takes both endpoints of every edge that has neither in the cover
+    yet.  The edges are processed in the given order, which makes this inherently
+    sequential, so it runs as a plain loop over the edges.
+    """
+
+    covered = bytearray(num_nodes)
+    for u, v in zip(sources.tolist(), targets.tolist(), strict=True):
+        if not (covered[u] or covered[v]):
+            covered[u] = covered[v] = 1
+
+    return np.frombuffer(covered, dtype=np.bool_).copy()
+
+
+def matching_cover(
+    sources: npt.NDArray[np.int64], targets: npt.NDArray[np.int64], num_nodes: int
+) -> Cover:
+    r"""Finds a vertex cover of a graph without self-loops from the endpoints of a
+    maximal matching, which is found in parallel rounds (see
+    :func:`vc_bounds.maximal_matching`), and is a 2-approximation."""
+
+    matching = vc_bounds.maximal_matching(sources, targets, num_nodes)
+    cover = np.zeros(num_nodes, dtype=np.bool_)
+    cover[sources[matching]] = True
+    cover[targets[matching]] = True
+    return cover
+
+
+def greedy_cover(
+    sources: npt.NDArray[np.int64], targets: npt.NDArray[np.int64], num_nodes: int
+) -> Cover:
+    r"""Finds a vertex cover of a graph without self-loops greedily, by repeatedly
+    taking a node of maximum degree and removing it from the graph.
+
+    The nodes are kept in buckets by degree, and as degrees only decrease, the
+    buckets are updated lazily: a node popped from a bucket above its current degree
+    is moved to the right bucket then.  This takes linear time overall.
+    """
+
+    g = CSRGraph.from_edges(sources, targets, num_nodes=num_nodes)
+    indptr, indices = g.indptr.tolist(), g.indices.tolist()
+    degrees = g.degree().tolist()
+
+    buckets: list[list[int]] = [[] for _ in range(max(degrees, default=0) + 1)]
+    for v, d in enumerate(degrees):
+        buckets[d].append(v)
+
+    cover = bytearray(num_nodes)
+    d = len(buckets) - 1
+    while d > 0:
+        bucket = buckets[d]
+        if not bucket:
+            d -= 1
+            continue
+
+        v = bucket.pop()
+        if cover[v]:
+            continue
+        if degrees[v] < d:
+            buckets[degrees[v]].append(v)
+            continue
+
+        cover[v] = 1
+        degrees[v] = 0
+        for w in indices[indptr[v] : indptr[v + 1]]:
+            if not cover[w]:
+                degrees[w] -= 1
+
+    return np.frombuffer(cover, dtype=np.bool_).copy()
+
+
+# the algorithms by name, each of which takes the endpoints of the edges of a graph
+# without self-loops and its number of nodes, and returns whether each node is in
+# the cover
+ALGORITHMS: dict[
+    str,
+    abc.Callable[[npt.NDArray[np.int64], npt.NDArray[np.int64], int], Cover],
+] = {
+    "local_ratio_vc": local_ratio_cover,
+    "matching_vc": matching_cover,
+    "greedy_vc": greedy_cover,
+}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+
+import argparse
+import concurrent.futures
+import contextlib
+import io
+import os
+import pathlib
+import time
+import traceback
+import typing
+from collections import abc
+
+import yaml
+
+import add_lcc
+import cache_graphs
+import edge_files
+import graph_properties
+import kernelize
+import reorder_graph
+import utils
+
+__all__ = ["OPERATIONS", "Outcome", "graph_dirs", "run"]
+
+logger = utils.configure_logger(__name__)
+
+# typical number of bytes per edge of the edge-list files of the dataset by their
+# compression, to estimate the number of edges of graphs without properties
+_BYTES_PER_EDGE: dict[edge_files.Compression | None, float] = {
+    None: 10.5,
+    "dv": 2.2,
+    "gz": 2.5,
+    "xz": 1.2,
+}
+
+# per-graph operations by name; each takes the directory of a graph in the dataset
+OPERATIONS: dict[str, abc.Callable[[pathlib.Path], None]] = {
+    "add_lcc": add_lcc.for_graph,
+    "cache": cache_graphs.for_graph,
+    "kernelize": kernelize.for_graph,
+    "properties": graph_properties.for_graph,
+    "reorder": reorder_graph.for_graph,
+}
+
+
+class Outcome(typing.NamedTuple):
+    r"""The result of applying an operation to one graph."""
+
+    dir: pathlib.Path
+    ok: bool
+    message: str
+    seconds: float
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Apply a per-graph operation to all graphs in the dataset in parallel, "
+            "largest graphs first, and print a summary."
+        )
+    )
+    _ = parser.add_argument(
+        "operation",
+        choices=sorted(OPERATIONS),
+        help=(
+            "Operation to apply: 'add_lcc' adds the LCC of each disconnected graph, "
+            "'cache' builds the binary cache files, 'kernelize' adds the vertex cover "
+            "kernel of each graph, 'properties' writes the missing 'properties.yaml' "
+            "files from 'graph.edges', and 'reorder' adds a copy of each graph with "
+            "its nodes in reverse Cuthill-McKee order"
+        ),
+    )
+    _ = parser.add_argument(
+        "rootdir",
+        nargs="?",
+        default="./data/graphs/",
+        help="Parent directory of the graphs (default: ./data/graphs/)",
+    )
+    _ = parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Number of worker processes (default: the number of CPUs)",
+    )
+    _ = parser.add_argument(
+        "-g",
+        "--graph",
+        action="append",
+        dest="graphs",
+        help=(
+            "Name of a graph to process; can be given multiple times (default: all "
+            "graphs in the root directory)"
+        ),
+    )
+
+    args = parser.parse_args()
+
+    dirs = graph_dirs(args.rootdir)
+    if args.graphs:
+        dirs = [dir for dir in dirs if dir.name in args.graphs]
+
+    outcomes = run(args.operation, dirs, jobs=args.jobs)
+
+    failures = [outcome for outcome in outcomes if not outcome.ok]
+    print(
+        f"Done: {len(outcomes) - len(failures)} succeeded, {len(failures)} failed, "
+        f"{sum(outcome.seconds for outcome in outcomes):.1f}s of work in total."
+    )
+    for outcome in failures:
+        print(f"FAILED {outcome.dir.name}: {outcome.message}")
+
+    if failures:
+        raise SystemExit(1)
+
+
+def graph_dirs(
+    rootdir: pathlib.Path | os.PathLike[typing.Any] | str = "./data/graphs/",
+) -> list[pathlib.Path]:
+    r"""Returns the directories of the graphs in ``rootdir`` (those that contain an
+    edge-list file, see :func:`edge_files.find`), largest graph first.
+
+    The size of a graph is the number of edges recorded in its ``properties.yaml``,
+    or an estimate of it from the size of its edge-list file if that is unavailable.
+    """
+
+    if not os.fspath(rootdir):
+        raise ValueError("Cannot specify an empty path or string for rootdir")
+    else:
+        rootdir = pathlib.Path(rootdir)
+
+    dirs = [dir for dir in rootdir.iterdir() if edge_files.find(dir) is not None]
+    return sorted(dirs, key=lambda dir: (-_estimated_size(dir), dir.name))
+
+
+def run(
+    operation: str,
+    dirs: abc.Iterable[pathlib.Path],
+    jobs: int | None = None,
+) -> list[Outcome]:
+    r"""Applies one of the :data:`OPERATIONS` to each graph directory in a pool of
+    worker processes, printing a line of progress as each graph finishes.
+
+    The directories are scheduled in the order given (see :func:`graph_dirs` for
+    largest-first order).  A failure on one graph is recorded in its outcome and
+    does not stop the others.
+
+    :param operation: Name of the operation
+    :param dirs: Directories of the graphs
+    :param jobs: Number of worker processes; if None, the number of CPUs
+    :return: The outcome for each graph, in the order in which they finished
+    """
+
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unrecognized operation: {operation}")
+
+    dirs = list(dirs)
+    outcomes: list[Outcome] = []
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_run_one, operation, dir) for dir in dirs]
+
+        for future in concurrent.futures.as_completed(futures):
+            outcome = future.result()
+            outcomes.append(outcome)
+
+            status = "ok" if outcome.ok else "FAILED"
+            print(
+                f"[{len(outcomes)}/{len(dirs)}] {outcome.dir.name}: {status} "
+                f"({outcome.seconds:.1f}s) {outcome.message}",
+                flush=True,
+            )
+
+    return outcomes
+
+
+def _run_one(operation: str, dir: pathlib.Path) -> Outcome:
+    start = time.perf_counter()
+    output = io.StringIO()
+
+    try:
+        with contextlib.redirect_stdout(output):
+            OPERATIONS[operation](dir)
+    except Exception as e:
+        logger.debug(traceback.format_exc())
+        return Outcome(dir, False, f"{type(e).__name__}: {e}", _elapsed(start))
+
+    # the operations print '<dir> => <result>'; keep only the result
+    message = output.getvalue().strip().rpartition(" => ")[2]
+    return Outcome(dir, True, message, _elapsed(start))
+
+
+def _elapsed(start: float) -> float:
+    return time.perf_counter() - start
+
+
+def _estimated_size(dir: pathlib.Path) -> int:
+    try:
+        with open(dir / "properties.yaml") as f:
+            return int(yaml.load(f, yaml.SafeLoader)["size"])
+    except (OSError, KeyError, TypeError, ValueError, yaml.YAMLError):
+        path = typing.cast(pathlib.Path, edge_files.find(dir))
+        bytes_per_edge = _BYTES_PER_EDGE[edge_files.compression_of(path)]
+        return round(path.stat().st_size / bytes_per_edge)
+
+
+if __name__ == "__main__":
+    main()
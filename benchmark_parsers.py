@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+
+import argparse
+import pathlib
+import statistics
+import time
+import typing
+from collections import abc
+
+import networkx as nx
+import numpy as np
+import scipy.io
+import scipy.sparse
+import tabulate
+
+import read_graph
+import utils
+
+__all__ = [
+    "EdgeListTimes",
+    "MtxTimes",
+    "benchmark_edge_list_parsers",
+    "benchmark_mtx_parsers",
+]
+
+logger = utils.configure_logger(__name__)
+
+
+class EdgeListTimes(typing.NamedTuple):
+    r"""The running times in seconds of the edge-list parsers on one file."""
+
+    name: str
+    bytes: int
+    lines_s: float
+    arrays_s: float
+    arrays_nx_s: float
+    arrays_speedup: float
+    arrays_nx_speedup: float
+
+
+class MtxTimes(typing.NamedTuple):
+    r"""The running times in seconds of the Matrix Market readers on one file."""
+
+    name: str
+    bytes: int
+    mmread_s: float
+    arrays_s: float
+    mmread_nx_s: float
+    arrays_nx_s: float
+    arrays_speedup: float
+    arrays_nx_speedup: float
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare the running times of the line-by-line and the vectorized "
+            "edge-list parsers in read_graph on graph files from the dataset, or of "
+            "scipy.io.mmread and read_graph's Matrix Market reader on .mtx files."
+        )
+    )
+    _ = parser.add_argument(
+        "paths",
+        nargs="*",
+        help=(
+            "Paths of the edge-list files to parse (default: every graph.edges file "
+            "in the 'data/graphs' directory, or every .mtx file in it with --mtx)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-m",
+        "--mtx",
+        action="store_true",
+        help="Benchmark the Matrix Market readers instead (default: edge lists)",
+    )
+    _ = parser.add_argument(
+        "-n",
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of times to run each parser on each file (default: 3)",
+    )
+    _ = parser.add_argument(
+        "-f",
+        "--format",
+        default="simple",
+        help=(
+            "Name of the format of the output table as used by the python-tabulate "
+            "package (default: simple)."
+        ),
+    )
+
+    args = parser.parse_args()
+
+    pattern = "**/*.mtx" if args.mtx else "*/graph.edges"
+    paths = (
+        [pathlib.Path(p) for p in args.paths]
+        if args.paths
+        else sorted(pathlib.Path("data/graphs/").glob(pattern))
+    )
+
+    data: list[EdgeListTimes] | list[MtxTimes]
+    if args.mtx:
+        data = benchmark_mtx_parsers(paths, repeat=args.repeat)
+    else:
+        data = benchmark_edge_list_parsers(paths, repeat=args.repeat)
+
+    table_str = tabulate.tabulate(data, headers="keys", tablefmt=args.format)
+    print(table_str)
+
+
+def benchmark_edge_list_parsers(
+    paths: abc.Iterable[pathlib.Path], repeat: int = 3
+) -> list[EdgeListTimes]:
+    r"""Times :func:`read_graph.parse_edge_list` on the lines of each file against
+    :func:`read_graph.read_edge_arrays` alone and followed by
+    :func:`read_graph.from_edge_arrays`, checking that all three agree.
+
+    :return: For each file, its name, size in bytes and the median of ``repeat``
+        running times of each parser, along with the speedups of the vectorized
+        parser
+    """
+
+    data: list[EdgeListTimes] = []
+
+    for path in paths:
+        logger.info(f"Benchmarking the parsers on '{path}'")
+
+        def parse_lines(path: pathlib.Path = path) -> typing.Any:
+            with open(path) as f:
+                return read_graph.parse_edge_list(f.readlines())
+
+        def parse_arrays(path: pathlib.Path = path) -> typing.Any:
+            return read_graph.read_edge_arrays(path)
+
+        def parse_arrays_nx(path: pathlib.Path = path) -> typing.Any:
+            return read_graph.from_edge_list_file(path)
+
+        lines_s, g_lines = _time(parse_lines, repeat)
+        arrays_s, _ = _time(parse_arrays, repeat)
+        arrays_nx_s, g_arrays = _time(parse_arrays_nx, repeat)
+
+        if {frozenset(e) for e in g_lines.edges} != {
+            frozenset(map(str, e)) for e in g_arrays.edges
+        }:
+            raise RuntimeError(f"The parsers disagree on the edges of '{path}'")
+
+        data.append(
+            EdgeListTimes(
+                path.parent.name,
+                path.stat().st_size,
+                lines_s,
+                arrays_s,
+                arrays_nx_s,
+                lines_s / arrays_s,
+                lines_s / arrays_nx_s,
+            )
+        )
+
+    return data
+
+
+def benchmark_mtx_parsers(
+    paths: abc.Iterable[pathlib.Path], repeat: int = 3
+) -> list[MtxTimes]:
+    r"""Times :func:`scipy.io.mmread` on each Matrix Market file against
+    :func:`read_graph.read_mtx_arrays`, and building an :class:`nx.Graph` from the
+    matrix returned by :func:`scipy.io.mmread` (as ``read_graph.from_mtx_file`` used
+    to, reading the header again with :func:`scipy.io.mminfo`) against
+    :func:`read_graph.from_mtx_file`, checking that they find the same edges.
+
+    :return: For each file, its name, size in bytes and the median of ``repeat``
+        running times of each reader, along with the speedups of
+        :mod:`read_graph`'s readers
+    """
+
+    data: list[MtxTimes] = []
+
+    for path in paths:
+        logger.info(f"Benchmarking the Matrix Market readers on '{path}'")
+
+        def mmread(path: pathlib.Path = path) -> typing.Any:
+            return scipy.io.mmread(path)
+
+        def read_arrays(path: pathlib.Path = path) -> typing.Any:
+            return read_graph.read_mtx_arrays(path)
+
+        def mmread_nx(path: pathlib.Path = path) -> typing.Any:
+            adj_mat = scipy.io.mmread(path)
+            if scipy.io.mminfo(path)[3] == "array":
+                return nx.from_numpy_array(adj_mat)
+            return nx.from_scipy_sparse_array(adj_mat)
+
+        def read_arrays_nx(path: pathlib.Path = path) -> typing.Any:
+            return read_graph.from_mtx_file(path)
+
+        mmread_s, mat = _time(mmread, repeat)
+        arrays_s, edges = _time(read_arrays, repeat)
+        mmread_nx_s, g_mmread = _time(mmread_nx, repeat)
+        arrays_nx_s, g_arrays = _time(read_arrays_nx, repeat)
+
+        if isinstance(mat, np.ndarray):
+            rows, cols = np.nonzero(mat)
+        else:
+            coo = scipy.sparse.coo_array(mat)
+            rows, cols = coo.row, coo.col
+        if not (
+            np.array_equal(rows, edges.sources)
+            and np.array_equal(cols, edges.targets)
+            and list(g_mmread.edges) == list(g_arrays.edges)
+        ):
+            raise RuntimeError(f"The readers disagree on the edges of '{path}'")
+
+        data.append(
+            MtxTimes(
+                path.name,
+                path.stat().st_size,
+                mmread_s,
+                arrays_s,
+                mmread_nx_s,
+                arrays_nx_s,
+                mmread_s / arrays_s,
+                mmread_nx_s / arrays_nx_s,
+            )
+        )
+
+    return data
+
+
+def _time(func: abc.Callable[[], typing.Any], repeat: int) -> tuple[float, typing.Any]:
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import pathlib
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+import typing
+from collections import abc
+
+import networkx as nx
+import numpy as np
+import numpy.typing as npt
+import tabulate
+
+import add_lcc
+import edge_files
+import graph_properties
+import preprocess_graph
+import read_graph
+import utils
+import write_graph
+from csr_graph import CSRGraph
+
+__all__ = [
+    "STAGES",
+    "benchmark",
+    "compare",
+    "synthetic_graph_dir",
+]
+
+logger = utils.configure_logger(__name__)
+
+
+class _Inputs:
+    r"""The graph in a directory of the dataset, read lazily and at most once so
+    that preparing the input of a stage is not part of its measurements."""
+
+    def __init__(self, dir: pathlib.Path):
+        edges_path = edge_files.find(dir)
+        if edges_path is None:
+            raise FileNotFoundError(f"No edge list in '{dir}'")
+        self.dir = dir
+        self.edges_path = edges_path
+
+    @functools.cached_property
+    def nx_graph(self) -> nx.Graph:
+        return read_graph.from_file(self.edges_path, cache=False)
+
+    @functools.cached_property
+    def csr_graph(self) -> CSRGraph:
+        return read_graph.from_file(self.edges_path, backend="csr", cache=False)
+
+
+def _copy_graph(inputs: _Inputs, scratch: pathlib.Path) -> pathlib.Path:
+    dir = scratch / inputs.dir.name
+    dir.mkdir()
+    for path in (inputs.edges_path, inputs.dir / "properties.yaml"):
+        _ = shutil.copy(path, dir / path.name)
+    return dir
+
+
+def _quietly(func: abc.Callable[[pathlib.Path], None], dir: pathlib.Path) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(dir)
+
+
+# the stages of the pipeline by name; each takes the graph and an empty scratch
+# directory and returns the work to measure, so that any setup is not measured
+STAGES: dict[
+    str, abc.Callable[[_Inputs, pathlib.Path], abc.Callable[[], typing.Any]]
+] = {
+    "read_networkx": lambda inputs, scratch: functools.partial(
+        read_graph.from_file, inputs.edges_path, cache=False
+    ),
+    "read_csr": lambda inputs, scratch: functools.partial(
+        read_graph.from_file, inputs.edges_path, backend="csr", cache=False
+    ),
+    "properties_networkx": lambda inputs, scratch: functools.partial(
+        graph_properties.compute, inputs.nx_graph
+    ),
+    "properties_csr": lambda inputs, scratch: functools.partial(
+        graph_properties.compute, inputs.csr_graph
+    ),
+    "add_lcc": lambda inputs, scratch: functools.partial(
+        _quietly, add_lcc.for_graph, _copy_graph(inputs, scratch)
+    ),
+    "write_edgelist_networkx": lambda inputs, scratch: functools.partial(
+        nx.write_edgelist, inputs.nx_graph, scratch / "graph.edges", data=False
+    ),
+    "write_edge_list": lambda inputs, scratch: functools.partial(
+        write_graph.to_edge_list_file,
+        scratch / "graph.edges",
+        *inputs.csr_graph.edges(),
+    ),
+    "preprocess": lambda inputs, scratch: functools.partial(
+        preprocess_graph.in_extracted_dir, _copy_graph(inputs, scratch)
+    ),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure the running time and peak memory of each stage of the "
+            "data-preparation pipeline on graphs from the dataset and on synthetic "
+            "graphs of growing size, optionally comparing them with a baseline."
+        )
+    )
+    _ = parser.add_argument(
+        "-g",
+        "--graph",
+        action="append",
+        dest="graphs",
+        default=[],
+        help=(
+            "Name of a graph in the data directory to benchmark on; can be given "
+            "multiple times (default: none)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-d",
+        "--data_dir",
+        default="data/graphs/",
+        help=(
+            "Directory whose subdirectories contain the graphs (default: data/graphs/)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-s",
+        "--synthetic",
+        action="append",
+        type=int,
+        metavar="ORDER",
+        help=(
+            "Order of a random synthetic graph with an average degree of 8 to "
+            "benchmark on; can be given multiple times (default: 10000 and 100000)"
+        ),
+    )
+    _ = parser.add_argument(
+        "--stage",
+        action="append",
+        dest="stages",
+        choices=list(STAGES),
+        help="Stage to benchmark; can be given multiple times (default: all)",
+    )
+    _ = parser.add_argument(
+        "-n",
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of times to time each stage on each graph (default: 3)",
+    )
+    _ = parser.add_argument(
+        "-o",
+        "--output",
+        help="Path of a JSON file to write the measurements to (default: none)",
+    )
+    _ = parser.add_argument(
+        "-b",
+        "--baseline",
+        help=(
+            "Path of a JSON file written by an earlier run with --output to compare "
+            "with; exits with status 1 if a stage regressed (default: none)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help=(
+            "Fraction by which a stage may be slower or use more memory than in the "
+            "baseline before it counts as a regression (default: 0.25)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-f",
+        "--format",
+        default="simple",
+        help=(
+            "Name of the format of the output table as used by the python-tabulate "
+            "package (default: simple)."
+        ),
+    )
+
+    args = parser.parse_args()
+
+    synthetic = args.synthetic if args.synthetic is not None else [10_000, 100_000]
+    stages = args.stages or list(STAGES)
+
+    with tempfile.TemporaryDirectory() as tmp_name:
+        tmp = pathlib.Path(tmp_name)
+
+        dirs = [pathlib.Path(args.data_dir) / name for name in args.graphs]
+        for order in synthetic:
+            dirs.append(synthetic_graph_dir(tmp / f"synthetic_{order}", order))
+
+        report = benchmark(dirs, stages, repeat=args.repeat)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            _ = f.write("\n")
+
+    results = report["results"]
+    regressions: list[dict[str, typing.Any]] = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        results, regressions = compare(results, baseline["results"], args.tolerance)
+
+    print(tabulate.tabulate(results, headers="keys", tablefmt=args.format))
+
+    for r in regressions:
+        print(f"REGRESSION {r['stage']} on {r['graph']}")
+    if regressions:
+        raise SystemExit(1)
+
+
+def benchmark(
+    dirs: abc.Iterable[pathlib.Path],
+    stages: abc.Iterable[str] = STAGES,
+    repeat: int = 3,
+) -> dict[str, typing.Any]:
+    r"""Measures each stage of the pipeline (see :data:`STAGES`) on each graph
+    directory, which must contain an edge-list file (see :func:`edge_files.find`)
+    and ``properties.yaml``.
+
+    A stage is timed ``repeat`` times and then run once more under
+    :mod:`tracemalloc` to find the peak memory it allocates, which is measured
+    separately as tracing slows it down.
+
+    :return: A JSON-serializable report with the versions of the software used and,
+        for each graph and stage, the graph's order and size, the median and minimum
+        running times in seconds and the peak memory in MiB
+    """
+
+    stages = list(stages)
+    for stage in stages:
+        if stage not in STAGES:
+            raise ValueError(f"Unrecognized stage: {stage}")
+
+    results: list[dict[str, typing.Any]] = []
+
+    for dir in dirs:
+        inputs = _Inputs(dir)
+
+        with tempfile.TemporaryDirectory() as scratch_name:
+            scratch = pathlib.Path(scratch_name)
+
+            for stage in stages:
+                logger.info(f"Benchmarking '{stage}' on '{dir.name}'")
+
+                times = []
+                for _ in range(repeat):
+                    work = _prepare(stage, inputs, scratch)
+                    start = time.perf_counter()
+                    _ = work()
+                    times.append(time.perf_counter() - start)
+
+                work = _prepare(stage, inputs, scratch)
+                tracemalloc.start()
+                try:
+                    _ = work()
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+
+                results.append(
+                    {
+                        "graph": dir.name,
+                        "order": inputs.csr_graph.order(),
+                        "size": inputs.csr_graph.size(),
+                        "stage": stage,
+                        "seconds": statistics.median(times) if times else None,
+                        "min_seconds": min(times) if times else None,
+                        "peak_mib": peak / (1 << 20),
+                    }
+                )
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "versions": {
+            "networkx": nx.__version__,
+            "numpy": np.__version__,
+        },
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(
+    results: abc.Iterable[dict[str, typing.Any]],
+    baseline: abc.Iterable[dict[str, typing.Any]],
+    tolerance: float = 0.25,
+) -> tuple[list[dict[str, typing.Any]], list[dict[str, typing.Any]]]:
+    r"""Compares measurements with those of a baseline, matching them by graph and
+    stage.
+
+    :param tolerance: Fraction by which a stage may take longer (by its median time)
+        or use more memory than in the baseline before it counts as a regression
+    :return: The measurements with the ratios of their times and peak memory to the
+        baseline's added (None where the baseline has no match), and those among them
+        that regressed
+    """
+
+    base = {(b["graph"], b["stage"]): b for b in baseline}
+    compared: list[dict[str, typing.Any]] = []
+    regressions: list[dict[str, typing.Any]] = []
+
+    for r in results:
+        b = base.get((r["graph"], r["stage"]))
+        time_ratio = _ratio(r["seconds"], b["seconds"]) if b else None
+        peak_ratio = _ratio(r["peak_mib"], b["peak_mib"]) if b else None
+
+        r = {**r, "time_ratio": time_ratio, "peak_ratio": peak_ratio}
+        compared.append(r)
+        if any(
+            ratio is not None and ratio > 1 + tolerance
+            for ratio in (time_ratio, peak_ratio)
+        ):
+            regressions.append(r)
+
+    return compared, regressions
+
+
+def synthetic_graph_dir(
+    dir: pathlib.Path, order: int, avg_degree: float = 8.0, seed: int = 0
+) -> pathlib.Path:
+    r"""Writes a random graph as a graph directory of the dataset.
+
+    The graph has ``order`` nodes joined by about ``order * avg_degree / 2`` random
+    edges, plus a separate triangle so that it is disconnected and has an LCC to
+    extract.
+
+    :return: ``dir``
+    """
+
+    rng = np.random.default_rng(seed)
+    num_edges = int(order * avg_degree / 2)
+
+    pairs = rng.integers(0, order, size=(num_edges, 2))
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    pairs = np.unique(np.sort(pairs, axis=1), axis=0)
+    rng.shuffle(pairs)
+    triangle = order + np.array([[0, 1], [1, 2], [0, 2]])
+    pairs = np.concatenate((pairs, triangle))
+
+    sources: npt.NDArray[np.int64] = pairs[:, 0]
+    targets: npt.NDArray[np.int64] = pairs[:, 1]
+
+    dir.mkdir(parents=True, exist_ok=True)
+    write_graph.to_edge_list_file(dir / "graph.edges", sources, targets)
+    with open(dir / "properties.yaml", "w") as f:
+        props = graph_properties.compute_from_edges(sources, targets)
+        for key, val in props.items():
+            _ = f.write(f"{key}: {graph_properties.format_value(val)}\n")
+
+    return dir
+
+
+def _prepare(
+    stage: str, inputs: _Inputs, scratch: pathlib.Path
+) -> abc.Callable[[], typing.Any]:
+    shutil.rmtree(scratch, ignore_errors=True)
+    scratch.mkdir()
+    return STAGES[stage](inputs, scratch)
+
+
+def _ratio(value: float | None, base: float | None) -> float | None:
+    if value is None or not base:
+        return None
+    return value / base
+
+
+if __name__ == "__main__":
+    main()
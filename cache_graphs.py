@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import pathlib
+import typing
+
+import edge_files
+import graph_cache
+import read_graph
+
+__all__ = ["for_graph", "for_graphs_in_root"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Build the binary cache file that read_graph loads instead of parsing "
+            "'graph.edges' for a graph (or all graphs) in the dataset."
+        )
+    )
+    _ = parser.add_argument(
+        "-a",
+        "--all",
+        action="store_true",
+        help="Process all graph data points that are subdirectories of the given path",
+    )
+    _ = parser.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        help="Rebuild cache files even if they are up to date (default: skip them)",
+    )
+    _ = parser.add_argument(
+        "path",
+        nargs="?",
+        help=(
+            "Directory for the graph or the parent directory for all graphs if `--all` "
+            "is specified; if this argument is either not provided or provided as an "
+            "empty string, the path will be read from stdin"
+        ),
+    )
+
+    args = parser.parse_args()
+
+    if not args.path:
+        args.path = input()
+
+    if args.all:
+        for_graphs_in_root(args.path, force=args.force)
+    else:
+        for_graph(args.path, force=args.force)
+
+
+def for_graphs_in_root(
+    rootdir: pathlib.Path | os.PathLike[typing.Any] | str = "./data/graphs/",
+    force: bool = False,
+) -> None:
+    if not os.fspath(rootdir):
+        raise ValueError("Cannot specify an empty path or string for path")
+    else:
+        rootdir = pathlib.Path(rootdir)
+
+    for dir in sorted(rootdir.iterdir()):
+        if edge_files.find(dir) is None:
+            continue
+
+        for_graph(dir, force=force)
+
+
+def for_graph(
+    dir: pathlib.Path | os.PathLike[typing.Any] | str, force: bool = False
+) -> None:
+    if not os.fspath(dir):
+        raise ValueError("Cannot specify an empty path or string for dir")
+    else:
+        dir = pathlib.Path(dir)
+
+    print(f"{dir} => ", end="")
+
+    edges_path = edge_files.find(dir)
+    if edges_path is None:
+        raise FileNotFoundError(f"No edge list in '{dir}'")
+    if not force and graph_cache.load(edges_path) is not None:
+        print("skipped")
+        return
+
+    g = read_graph.to_csr(read_graph.read_edge_arrays(edges_path))
+    print(graph_cache.store(edges_path, g))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import pathlib
+import shutil
+import typing
+
+import numpy as np
+
+import edge_files
+import read_graph
+import write_graph
+
+__all__ = ["for_graph", "for_graphs_in_root"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Convert the edge list of a graph (or all graphs) in the dataset to a "
+            "compressed file, or back to plain text."
+        )
+    )
+    _ = parser.add_argument(
+        "-a",
+        "--all",
+        action="store_true",
+        help="Process all graph data points that are subdirectories of the given path",
+    )
+    _ = parser.add_argument(
+        "-c",
+        "--compression",
+        choices=["none", *(c for c in edge_files.SUFFIXES if c is not None)],
+        default="dv",
+        help=(
+            "'gz' or 'xz' for a compressed text file, 'dv' for a delta-encoded binary "
+            "file, or 'none' for plain text (default: dv)"
+        ),
+    )
+    _ = parser.add_argument(
+        "path",
+        nargs="?",
+        help=(
+            "Directory for the graph or the parent directory for all graphs if `--all` "
+            "is specified; if this argument is either not provided or provided as an "
+            "empty string, the path will be read from stdin"
+        ),
+    )
+
+    args = parser.parse_args()
+
+    if not args.path:
+        args.path = input()
+
+    compression = None if args.compression == "none" else args.compression
+    if args.all:
+        for_graphs_in_root(args.path, compression)
+    else:
+        for_graph(args.path, compression)
+
+
+def for_graphs_in_root(
+    rootdir: pathlib.Path | os.PathLike[typing.Any] | str = "./data/graphs/",
+    compression: edge_files.Compression | None = "dv",
+) -> None:
+    if not os.fspath(rootdir):
+        raise ValueError("Cannot specify an empty path or string for path")
+    else:
+        rootdir = pathlib.Path(rootdir)
+
+    for dir in sorted(rootdir.iterdir()):
+        if edge_files.find(dir) is None:
+            continue
+
+        for_graph(dir, compression)
+
+
+def for_graph(
+    dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    compression: edge_files.Compression | None = "dv",
+) -> None:
+    r"""Replaces the edge list of the graph in ``dir`` with one with the given
+    compression (see :mod:`edge_files`) that reads as the same edges in the same
+    order.
+
+    The new file is read back and compared with the old one before the old one is
+    deleted.
+    """
+
+    if not os.fspath(dir):
+        raise ValueError("Cannot specify an empty path or string for dir")
+    else:
+        dir = pathlib.Path(dir)
+
+    print(f"{dir} => ", end="")
+
+    old_path = edge_files.find(dir)
+    if old_path is None:
+        raise FileNotFoundError(f"No edge list in '{dir}'")
+    new_path = edge_files.path_for(dir, compression)
+    if old_path == new_path:
+        print("skipped")
+        return
+
+    # name the temporary file like the new one so that it is written the same way
+    tmp_path = new_path.with_name(f".tmp.{new_path.name}")
+    try:
+        old_compression = edge_files.compression_of(old_path)
+        if old_compression != "dv" and compression != "dv":
+            # the text is kept byte for byte
+            with (
+                edge_files.open_edges(old_path) as src,
+                edge_files.open_edges(tmp_path, "wb") as dst,
+            ):
+                shutil.copyfileobj(src, dst)
+            with (
+                edge_files.open_edges(old_path) as old,
+                edge_files.open_edges(tmp_path) as new,
+            ):
+                same = _same_contents(old, new)
+        else:
+            edges = read_graph.read_edge_arrays(old_path)
+            if edges.labels is not None:
+                raise ValueError(f"Non-integer node labels in '{old_path}'")
+            write_graph.to_edge_list_file(tmp_path, edges.sources, edges.targets)
+            written = read_graph.read_edge_arrays(tmp_path)
+            same = np.array_equal(written.sources, edges.sources) and np.array_equal(
+                written.targets, edges.targets
+            )
+
+        if not same:
+            raise RuntimeError(f"'{new_path}' does not read as '{old_path}'")
+        os.replace(tmp_path, new_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    old_path.unlink()
+    print(new_path)
+
+
+def _same_contents(a: typing.BinaryIO, b: typing.BinaryIO) -> bool:
+    while True:
+        chunk = a.read(1 << 20)
+        if chunk != b.read(1 << 20):
+            return False
+        if not chunk:
+            return True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+import typing
+from collections import abc
+
+import networkx as nx
+import numpy as np
+import numpy.typing as npt
+import scipy.sparse
+
+__all__ = ["CSRGraph"]
+
+
+class CSRGraph:
+    r"""An undirected, unweighted graph stored as a symmetric adjacency matrix in the
+    compressed sparse row (CSR) format.
+
+    The nodes are the integers ``0, 1, ..., n - 1``; the neighbors of node ``v`` are
+    ``indices[indptr[v]:indptr[v + 1]]``, sorted in ascending order and without
+    duplicates.  A self-loop at ``v`` is stored once, as ``v`` in its own row.
+
+    If :attr:`labels` is not ``None``, ``labels[v]`` is the original label of node
+    ``v`` (e.g., as it appeared in the file the graph was read from).
+    """
+
+    indptr: npt.NDArray[np.int64]
+    indices: npt.NDArray[np.int64]
+    labels: abc.Sequence[typing.Any] | npt.NDArray[typing.Any] | None
+
+    def __init__(
+        self,
+        indptr: npt.ArrayLike,
+        indices: npt.ArrayLike,
+        labels: abc.Sequence[typing.Any] | npt.NDArray[typing.Any] | None = None,
+    ) -> None:
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.labels = labels
+
+        if self.indptr.ndim != 1 or self.indptr.size == 0:
+            raise ValueError("indptr must be a non-empty one-dimensional array")
+        if self.indptr[-1] != self.indices.size:
+            raise ValueError(
+                f"indptr ends with {self.indptr[-1]}, but there are "
+                f"{self.indices.size} indices"
+            )
+        if labels is not None and len(labels) != self.order():
+            raise ValueError(
+                f"Expected {self.order()} labels, but {len(labels)} were given"
+            )
+
+    @classmethod
+    def from_edges(
+        cls,
+        sources: npt.ArrayLike,
+        targets: npt.ArrayLike,
+        num_nodes: int | None = None,
+        labels: abc.Sequence[typing.Any] | npt.NDArray[typing.Any] | None = None,
+    ) -> "CSRGraph":
+        r"""Creates a graph from the endpoints of its edges, which are node indices.
+
+        Duplicate edges (in either direction) are merged.
+
+        :param sources: One endpoint of each edge
+        :param targets: The other endpoint of each edge
+        :param num_nodes: Number of nodes; if None, one more than the largest index
+        :param labels: Original labels of the nodes, if any
+        """
+
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+
+        if num_nodes is None:
+            num_nodes = (
+                int(max(sources.max(), targets.max())) + 1 if sources.size else 0
+            )
+
+        rows = np.concatenate((sources, targets))
+        cols = np.concatenate((targets, sources))
+        return cls._from_entries(rows, cols, num_nodes, labels)
+
+    @classmethod
+    def from_labeled_edges(
+        cls, sources: npt.ArrayLike, targets: npt.ArrayLike
+    ) -> "CSRGraph":
+        r"""Creates a graph from the endpoints of its edges, which are arbitrary
+        integer labels, numbering the nodes in ascending order of their labels.
+
+        If the labels are exactly ``0, 1, ..., n - 1``, :attr:`labels` is None.
+        """
+
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+
+        uniques, inverse = np.unique(
+            np.concatenate((sources, targets)), return_inverse=True
+        )
+        labels = (
+            None
+            if uniques.size == 0
+            or (uniques[0] == 0 and uniques[-1] == uniques.size - 1)
+            else uniques
+        )
+        return cls.from_edges(
+            inverse[: sources.size],
+            inverse[sources.size :],
+            num_nodes=uniques.size,
+            labels=labels,
+        )
+
+    @classmethod
+    def from_networkx(cls, g: nx.Graph) -> "CSRGraph":
+        r"""Creates a graph from an :class:`nx.Graph`, numbering its nodes in their
+        iteration order.
+
+        If the nodes of ``g`` are exactly ``0, 1, ..., n - 1`` in that order,
+        :attr:`labels` is None.
+        """
+
+        nodes = list(g)
+        index = {node: i for i, node in enumerate(nodes)}
+
+        endpoints = np.fromiter(
+            (index[x] for edge in g.edges for x in edge),
+            dtype=np.int64,
+            count=2 * g.number_of_edges(),
+        )
+
+        labels = None if nodes == list(range(len(nodes))) else nodes
+        return cls.from_edges(
+            endpoints[0::2], endpoints[1::2], num_nodes=len(nodes), labels=labels
+        )
+
+    @classmethod
+    def _from_entries(
+        cls,
+        rows: npt.NDArray[np.int64],
+        cols: npt.NDArray[np.int64],
+        num_nodes: int,
+        labels: abc.Sequence[typing.Any] | npt.NDArray[typing.Any] | None,
+    ) -> "CSRGraph":
+        # sort the (row, col) entries and drop duplicates in one pass by encoding
+        # each of them as a single integer
+        keys = np.unique(rows * num_nodes + cols)
+        rows, cols = np.divmod(keys, num_nodes) if num_nodes else (keys, keys)
+
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+        return cls(indptr, cols, labels)
+
+    def order(self) -> int:
+        r"""Returns the number of nodes."""
+
+        return self.indptr.size - 1
+
+    def size(self) -> int:
+        r"""Returns the number of edges."""
+
+        return (self.indices.size + self.number_of_selfloops()) // 2
+
+    def degree(self) -> npt.NDArray[np.int64]:
+        r"""Returns the degree of every node, counting a self-loop twice as
+        :class:`nx.Graph` does."""
+
+        deg = np.diff(self.indptr)
+        loops = self._selfloop_entries()
+        if loops.any():
+            deg += np.bincount(self.indices[loops], minlength=self.order())
+        return deg
+
+    def neighbors(self, v: int) -> npt.NDArray[np.int64]:
+        r"""Returns the neighbors of node ``v`` in ascending order (as a view)."""
+
+        return self.indices[self.indptr[v] : self.indptr[v + 1]]
+
+    def number_of_selfloops(self) -> int:
+        return int(np.count_nonzero(self._selfloop_entries()))
+
+    def without_selfloops(self) -> "CSRGraph":
+        r"""Returns a copy of the graph with the self-loops removed."""
+
+        keep = ~self._selfloop_entries()
+        if keep.all():
+            return CSRGraph(self.indptr.copy(), self.indices.copy(), self.labels)
+
+        rows = self._rows()[keep]
+        indptr = np.zeros_like(self.indptr)
+        np.cumsum(np.bincount(rows, minlength=self.order()), out=indptr[1:])
+        return CSRGraph(indptr, self.indices[keep], self.labels)
+
+    def relabeled(self, order: npt.ArrayLike) -> "CSRGraph":
+        r"""Returns a copy of the graph with the nodes renumbered so that node ``i``
+        of the copy is node ``order[i]`` of this graph.
+
+        The labels of the copy's nodes are their labels in this graph, or their
+        indices in this graph if it has no labels.
+
+        :param order: A permutation of the nodes
+        """
+
+        order = np.asarray(order, dtype=np.int64)
+        if order.shape != (self.order(),):
+            raise ValueError("order must be a permutation of the nodes")
+
+        new_index = np.empty_like(order)
+        new_index[order] = np.arange(order.size)
+
+        return CSRGraph._from_entries(
+            new_index[self._rows()],
+            new_index[self.indices],
+            self.order(),
+            order if self.labels is None else self._labels_at(order),
+        )
+
+    def without_labels(self) -> "CSRGraph":
+        r"""Returns the graph with the node indices as its labels, which is the
+        counterpart of :func:`nx.convert_node_labels_to_integers`."""
+
+        return CSRGraph(self.indptr, self.indices)
+
+    def subgraph(self, nodes: npt.ArrayLike) -> "CSRGraph":
+        r"""Returns the subgraph induced by ``nodes``, with the nodes renumbered
+        consecutively in ascending order of their indices in this graph.
+
+        The labels of the subgraph's nodes are their labels in this graph, or their
+        indices in this graph if it has no labels.
+
+        :param nodes: Indices of the nodes, or a boolean mask over all nodes
+        """
+
+        nodes = np.asarray(nodes)
+        if nodes.dtype == np.bool_:
+            keep = nodes
+        else:
+            keep = np.zeros(self.order(), dtype=np.bool_)
+            keep[nodes] = True
+
+        new_index = np.cumsum(keep) - 1
+        kept = np.flatnonzero(keep)
+
+        # renumbering is monotone, so the rows remain sorted
+        entries = keep[self._rows()] & keep[self.indices]
+        rows = new_index[self._rows()[entries]]
+        indptr = np.zeros(kept.size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=kept.size), out=indptr[1:])
+
+        labels = kept if self.labels is None else self._labels_at(kept)
+        return CSRGraph(indptr, new_index[self.indices[entries]], labels)
+
+    def edges(self) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        r"""Returns the endpoints ``(u, v)`` of every edge, with ``u <= v``, sorted
+        by ``u`` and then by ``v``."""
+
+        rows = self._rows()
+        upper = rows <= self.indices
+        return rows[upper], self.indices[upper]
+
+    def to_scipy(self) -> scipy.sparse.csr_array:
+        r"""Returns the adjacency matrix as a :class:`scipy.sparse.csr_array` that
+        shares its index arrays with this graph.
+
+        A self-loop has a single entry on the diagonal.
+        """
+
+        n = self.order()
+        return scipy.sparse.csr_array(
+            (np.ones(self.indices.size, dtype=np.int8), self.indices, self.indptr),
+            shape=(n, n),
+        )
+
+    def to_networkx(self) -> nx.Graph:
+        r"""Converts the graph to an :class:`nx.Graph`, whose nodes are the labels
+        if there are any, and the node indices otherwise."""
+
+        sources, targets = self.edges()
+        nodes: abc.Iterable[typing.Any] = range(self.order())
+
+        g = nx.Graph()
+        if self.labels is None:
+            g.add_nodes_from(nodes)
+            g.add_edges_from(zip(sources.tolist(), targets.tolist(), strict=True))
+        else:
+            labels = (
+                self.labels.tolist()
+                if isinstance(self.labels, np.ndarray)
+                else list(self.labels)
+            )
+            g.add_nodes_from(labels)
+            g.add_edges_from(
+                (labels[u], labels[v])
+                for u, v in zip(sources.tolist(), targets.tolist(), strict=True)
+            )
+        return g
+
+    def _rows(self) -> npt.NDArray[np.int64]:
+        r"""Returns the row (source node) of every entry of :attr:`indices`."""
+
+        return np.repeat(np.arange(self.order()), np.diff(self.indptr))
+
+    def _selfloop_entries(self) -> npt.NDArray[np.bool_]:
+        return self._rows() == self.indices
+
+    def _labels_at(
+        self, nodes: npt.NDArray[np.int64]
+    ) -> abc.Sequence[typing.Any] | npt.NDArray[typing.Any] | None:
+        if self.labels is None:
+            return None
+        if isinstance(self.labels, np.ndarray):
+            return self.labels[nodes]
+        return [self.labels[i] for i in nodes.tolist()]
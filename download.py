@@ -1,19 +1,40 @@
 #!/usr/bin/env python3
 
 import argparse
+import concurrent.futures
+import email.utils
+import json
 import os
 import os.path
 import pathlib
+import shutil
 import tempfile
 import typing
-from urllib import request
+from collections import abc
+from urllib import error, request
 
+import download_cache
 import utils
 
-__all__ = ["download"]
+__all__ = ["Outcome", "download", "download_all", "read_manifest"]
 
 logger = utils.configure_logger(__name__)
 
+# seconds to wait for the server to respond or send more data
+_TIMEOUT = 60
+
+# number of bytes copied from a response to the file at once
+_CHUNK_SIZE = 1 << 20
+
+
+class Outcome(typing.NamedTuple):
+    r"""The result of downloading one URL of a batch."""
+
+    url: str
+    path: pathlib.Path | None
+    ok: bool
+    message: str
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -42,6 +63,36 @@ def main():
         "--filename",
         help="Filename to save the file as (default: guessed from the URL)",
     )
+    _ = parser.add_argument(
+        "-m",
+        "--manifest",
+        help=(
+            "Path of a manifest file listing the URLs to download, one per line and "
+            "optionally followed by whitespace and the filename to save the file as; "
+            "blank lines and lines starting with '#' are ignored.  The files are "
+            "downloaded concurrently into the destination directory (default: "
+            "download a single URL)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=4,
+        help=(
+            "Number of files to download at the same time with --manifest (default: 4)"
+        ),
+    )
+    _ = parser.add_argument(
+        "--no-cache",
+        action="store_false",
+        dest="cache",
+        help=(
+            "Download the file even if it is in the download cache, and do not add it "
+            "to the cache (default: use the cache in $VC_DOWNLOAD_CACHE or "
+            "~/.cache/vc-research-experiments/downloads/)"
+        ),
+    )
     _ = parser.add_argument(
         "-n",
         "--noclobber",
@@ -53,6 +104,26 @@ def main():
     )
     args = parser.parse_args()
 
+    if args.manifest:
+        if args.url or args.filename or args.noclobber:
+            parser.error("Cannot combine --manifest with a URL, -o or -n")
+        if args.destdir is None:
+            parser.error("--destdir is required with --manifest")
+
+        outcomes = download_all(
+            read_manifest(args.manifest),
+            args.destdir,
+            max_workers=args.jobs,
+            cache=args.cache,
+        )
+
+        failures = [outcome for outcome in outcomes if not outcome.ok]
+        for outcome in failures:
+            print(f"FAILED {outcome.url}: {outcome.message}")
+        if failures:
+            raise SystemExit(1)
+        return
+
     if not args.url:
         args.url = input()
 
@@ -61,6 +132,7 @@ def main():
         destdir=args.destdir,
         filename=args.filename,
         no_clobber=args.noclobber,
+        cache=args.cache,
     )
 
     print(path)
@@ -72,6 +144,7 @@ def download(
     destdir: pathlib.Path | os.PathLike[typing.Any] | str | None = None,
     filename: str | None = None,
     no_clobber: bool = False,
+    cache: bool = True,
 ) -> str:
     """Downloads a file from a URL.
 
@@ -82,6 +155,10 @@ def download(
         otherwise it must not contain path separators and must not be an empty string
     :param no_clobber: Do not overwrite an existing file with the same path as the
         download's destination path, if it exists
+    :param cache: Whether to take the file from the download cache (see
+        :mod:`download_cache`) instead of downloading it if it is there, and to add it
+        to the cache otherwise; a file taken from the cache may be a hard link to the
+        cached file and must not be modified in place
     :return: Path to the downloaded file
     """
 
@@ -138,15 +215,211 @@ def download(
 
         logger.warning(
             (
-                f"Destination file '{destpath}' already exists; overwriting as {arg} "
-                "was NOT specified."
+                f"Destination file '{destpath}' already exists; overwriting it unless "
+                f"the server reports it unchanged, as {arg} was NOT specified."
             )
         )
 
-    path, headers = request.urlretrieve(url, filename=destpath)
-    logger.debug(f"Downloaded to '{path}' with headers: {headers}")
+    if cache and (cached := download_cache.lookup(url)) is not None:
+        _link_or_copy(cached, destpath)
+        logger.debug(f"Took '{destpath}' from the download cache")
+        return str(destpath)
+
+    status = _fetch(url, destpath)
+    logger.debug(f"Finished downloading to '{destpath}': {status}")
+
+    if cache:
+        try:
+            _ = download_cache.add(url, destpath)
+        except OSError as e:
+            logger.warning(f"Could not add '{url}' to the download cache: {e}")
+
+    return str(destpath)
+
+
+def read_manifest(
+    path: pathlib.Path | os.PathLike[typing.Any] | str,
+) -> list[tuple[str, str | None]]:
+    r"""Reads a manifest of URLs to download, one per line, each optionally followed
+    by whitespace and the filename to save it as.  Blank lines and lines starting with
+    ``#`` are ignored.
+
+    :return: The URL and filename (or None) on each line
+    """
+
+    entries: list[tuple[str, str | None]] = []
+
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            fields = line.split()
+            if len(fields) > 2:
+                raise ValueError(f"Malformed manifest line: '{line}'")
+            entries.append((fields[0], fields[1] if len(fields) == 2 else None))
+
+    return entries
+
+
+def download_all(
+    entries: abc.Iterable[str | tuple[str, str | None]],
+    destdir: pathlib.Path | os.PathLike[typing.Any] | str,
+    max_workers: int = 4,
+    cache: bool = True,
+) -> list[Outcome]:
+    r"""Downloads many URLs concurrently into ``destdir``, printing a line of
+    progress as each finishes.
+
+    Each file is downloaded as with :func:`download`: an interrupted download is
+    resumed where it left off, and a file whose server reports it unchanged since it
+    was downloaded is not downloaded again.  A failure to download one URL is
+    recorded in its outcome and does not stop the others.
+
+    :param entries: URLs, or pairs of a URL and the filename to save it as (or None
+        to guess it from the URL), as returned by :func:`read_manifest`
+    :param destdir: Destination directory to save the files
+    :param max_workers: Number of files to download at the same time
+    :param cache: Whether to use the download cache, as in :func:`download`
+    :return: The outcome for each URL, in the order in which they finished
+    """
+
+    entries = [(e, None) if isinstance(e, str) else e for e in entries]
+    outcomes: list[Outcome] = []
+
+    def download_one(url: str, filename: str | None) -> Outcome:
+        try:
+            path = download(url, destdir=destdir, filename=filename, cache=cache)
+        except Exception as e:
+            return Outcome(url, None, False, f"{type(e).__name__}: {e}")
+        return Outcome(url, pathlib.Path(path), True, "")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(download_one, *entry) for entry in entries]
+
+        for future in concurrent.futures.as_completed(futures):
+            outcome = future.result()
+            outcomes.append(outcome)
+
+            status = str(outcome.path) if outcome.ok else f"FAILED ({outcome.message})"
+            print(
+                f"[{len(outcomes)}/{len(entries)}] {outcome.url} => {status}",
+                flush=True,
+            )
+
+    return outcomes
+
+
+def _fetch(url: str, destpath: pathlib.Path) -> str:
+    r"""Downloads ``url`` to ``destpath`` through a partial file next to it, which is
+    renamed to ``destpath`` once complete.
+
+    The ETag and Last-Modified validators sent by the server are saved in a hidden
+    file next to ``destpath``.  They are used to resume a partial file with a Range
+    request that the server honors only if the file has not changed since (If-Range),
+    and to skip downloading a complete file again if it has not changed
+    (If-None-Match and If-Modified-Since).
+
+    :return: What was done: ``"downloaded"``, ``"resumed"`` or ``"not modified"``
+    """
+
+    part_path = destpath.with_name(f".{destpath.name}.part")
+    validators_path = destpath.with_name(f".{destpath.name}.http.json")
+
+    validators = _read_validators(validators_path, url)
+    validator = validators.get("etag") or validators.get("last_modified")
+
+    headers: dict[str, str] = {}
+    offset = 0
+    if part_path.exists() and not validators.get("complete") and validator:
+        offset = part_path.stat().st_size
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = validator
+        logger.info(f"Resuming the download of '{destpath}' from byte {offset}")
+    elif destpath.exists() and validators.get("complete"):
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    try:
+        resp = request.urlopen(request.Request(url, headers=headers), timeout=_TIMEOUT)
+    except error.HTTPError as e:
+        if e.code == 304:
+            logger.info(f"Skipping '{url}' as it has not changed since downloaded")
+            return "not modified"
+        if e.code == 416 and offset:
+            # the partial file is no longer a prefix of the file on the server
+            logger.info(f"Restarting the download of '{destpath}'")
+            part_path.unlink()
+            return _fetch(url, destpath)
+        raise
+
+    with resp:
+        resumed = resp.status == 206
+        if resumed and not resp.headers.get("Content-Range", "").startswith(
+            f"bytes {offset}-"
+        ):
+            raise ValueError(f"Unexpected Content-Range for '{url}'")
+        if not resumed:
+            offset = 0
+
+        validators = {"url": url, "complete": False}
+        if etag := resp.headers.get("ETag"):
+            validators["etag"] = etag
+        if last_modified := resp.headers.get("Last-Modified"):
+            validators["last_modified"] = last_modified
+        _write_validators(validators_path, validators)
+
+        content_length = resp.headers.get("Content-Length")
+        with open(part_path, "ab" if resumed else "wb") as f:
+            shutil.copyfileobj(resp, f, _CHUNK_SIZE)
+            size = f.tell()
+
+    if content_length is not None and size != offset + int(content_length):
+        raise OSError(
+            f"Download of '{url}' ended after {size} of "
+            f"{offset + int(content_length)} bytes; run again to resume it"
+        )
+
+    os.replace(part_path, destpath)
+    if "last_modified" in validators:
+        mtime = email.utils.parsedate_to_datetime(validators["last_modified"])
+        os.utime(destpath, (mtime.timestamp(), mtime.timestamp()))
+
+    validators["complete"] = True
+    _write_validators(validators_path, validators)
+
+    return "resumed" if resumed else "downloaded"
+
+
+def _link_or_copy(src: pathlib.Path, dest: pathlib.Path) -> None:
+    tmp_path = dest.with_name(f".{dest.name}.part")
+    tmp_path.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp_path)
+    except OSError:
+        _ = shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dest)
+
+
+def _read_validators(path: pathlib.Path, url: str) -> dict[str, typing.Any]:
+    try:
+        with open(path) as f:
+            validators = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    # validators saved for another URL say nothing about this one
+    return validators if validators.get("url") == url else {}
+
 
-    return path
+def _write_validators(path: pathlib.Path, validators: dict[str, typing.Any]) -> None:
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(validators, f)
+    os.replace(tmp_path, path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+import threading
+import time
+import typing
+
+import utils
+
+__all__ = ["DEFAULT_MAX_BYTES", "add", "cache_dir", "evict", "lookup"]
+
+logger = utils.configure_logger(__name__)
+
+# total size of the downloads kept in the cache, beyond which the least recently used
+# are evicted; can be overridden with the VC_DOWNLOAD_CACHE_MAX_BYTES environment
+# variable
+DEFAULT_MAX_BYTES = 10 << 30
+
+
+def cache_dir() -> pathlib.Path:
+    r"""Returns the directory of the download cache, which is given by the
+    ``VC_DOWNLOAD_CACHE`` environment variable, or defaults to
+    ``vc-research-experiments/downloads`` in the user's cache directory.
+
+    The directory contains the downloaded files in ``objects/``, each named after
+    its SHA-256 digest, and a small JSON file per URL in ``urls/`` that records the
+    digest of the file downloaded from it and when it was last used.
+    """
+
+    if path := os.environ.get("VC_DOWNLOAD_CACHE"):
+        return pathlib.Path(path)
+
+    base = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(base) / "vc-research-experiments" / "downloads"
+
+
+def lookup(url: str) -> pathlib.Path | None:
+    r"""Finds the file downloaded from ``url`` in the cache and verifies that its
+    SHA-256 digest is still the one it was added with.
+
+    A file that fails verification is removed from the cache.  A file that is found
+    is marked as the most recently used.
+
+    :return: The path of the cached file, which must not be modified, or None if the
+        URL is not in the cache
+    """
+
+    try:
+        with open(_entry_path(url)) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        logger.debug(f"'{url}' is not in the download cache")
+        return None
+
+    path = _object_path(entry["sha256"])
+    try:
+        digest = _sha256(path)
+    except OSError:
+        logger.info(f"The cached download of '{url}' has been evicted")
+        _entry_path(url).unlink(missing_ok=True)
+        return None
+
+    if digest != entry["sha256"]:
+        logger.warning(f"Removing the corrupt cached download of '{url}'")
+        path.unlink(missing_ok=True)
+        _entry_path(url).unlink(missing_ok=True)
+        return None
+
+    # the times of the file itself are not touched, as it may be hard-linked to a
+    # copy outside the cache
+    _write_entry(url, digest, path.stat().st_size)
+    logger.info(f"Found '{url}' in the download cache")
+    return path
+
+
+def add(
+    url: str,
+    path: pathlib.Path | os.PathLike[typing.Any] | str,
+    max_bytes: int | None = None,
+) -> pathlib.Path:
+    r"""Adds the file in ``path``, downloaded from ``url``, to the cache, and then
+    evicts the least recently used files until the cache fits in ``max_bytes``.
+
+    The file is hard-linked into the cache if possible, and copied otherwise.
+
+    :param max_bytes: Size limit of the cache in bytes; if None, the value of the
+        ``VC_DOWNLOAD_CACHE_MAX_BYTES`` environment variable, or
+        :data:`DEFAULT_MAX_BYTES`
+    :return: The path of the cached file
+    """
+
+    path = pathlib.Path(path)
+    digest = _sha256(path)
+    obj_path = _object_path(digest)
+
+    if not obj_path.exists():
+        obj_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = _tmp_path(obj_path)
+        try:
+            os.link(path, tmp_path)
+        except OSError:
+            _ = shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, obj_path)
+
+    _write_entry(url, digest, obj_path.stat().st_size)
+    logger.info(f"Added '{url}' to the download cache as '{obj_path}'")
+
+    if max_bytes is None:
+        max_bytes = int(
+            os.environ.get("VC_DOWNLOAD_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+        )
+    _ = evict(max_bytes)
+
+    return obj_path
+
+
+def evict(max_bytes: int) -> int:
+    r"""Removes the least recently used files from the cache until their total size
+    is at most ``max_bytes``, and the entries of the URLs whose files are gone.
+
+    A file was last used when it was last added or found for any of the URLs that it
+    was downloaded from, as recorded in their entries.
+
+    :return: The number of bytes freed
+    """
+
+    entries: list[tuple[pathlib.Path, str]] = []
+    last_used: dict[str, float] = {}
+    for entry_path in (cache_dir() / "urls").glob("*.json"):
+        try:
+            with open(entry_path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            continue
+        digest = entry["sha256"]
+        entries.append((entry_path, digest))
+        last_used[digest] = max(last_used.get(digest, 0.0), entry.get("last_used", 0.0))
+
+    objects: list[tuple[float, int, pathlib.Path]] = []
+    for path in (cache_dir() / "objects").glob("*/*"):
+        if path.name.startswith("."):
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        # a file whose entry is not written yet was just linked or copied into the
+        # cache, which sets its change time
+        objects.append((last_used.get(path.name, stat.st_ctime), stat.st_size, path))
+
+    total = sum(size for _, size, _ in objects)
+    freed = 0
+
+    for _, size, path in sorted(objects):
+        if total - freed <= max_bytes:
+            break
+
+        logger.info(f"Evicting '{path}' from the download cache")
+        path.unlink(missing_ok=True)
+        freed += size
+
+    for entry_path, digest in entries:
+        if not _object_path(digest).exists():
+            entry_path.unlink(missing_ok=True)
+
+    return freed
+
+
+def _write_entry(url: str, digest: str, size: int) -> None:
+    r"""Records that the file with the given digest was downloaded from ``url`` and
+    has just been used."""
+
+    entry = {"url": url, "sha256": digest, "size": size, "last_used": time.time()}
+    entry_path = _entry_path(url)
+    entry_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = _tmp_path(entry_path)
+    with open(tmp_path, "w") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, entry_path)
+
+
+def _entry_path(url: str) -> pathlib.Path:
+    return cache_dir() / "urls" / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+
+def _object_path(digest: str) -> pathlib.Path:
+    return cache_dir() / "objects" / digest[:2] / digest
+
+
+def _tmp_path(path: pathlib.Path) -> pathlib.Path:
+    # unique per process and thread, and hidden from evict()
+    unique = f"{os.getpid()}.{threading.get_ident()}.{time.monotonic_ns()}"
+    return path.with_name(f".{path.name}.{unique}.tmp")
+
+
+def _sha256(path: pathlib.Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
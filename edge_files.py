@@ -0,0 +1,227 @@
+import builtins
+import gzip
+import lzma
+import os
+import pathlib
+import typing
+
+import numpy as np
+import numpy.typing as npt
+
+__all__ = [
+    "SUFFIXES",
+    "Compression",
+    "compression_of",
+    "decode_delta",
+    "encode_delta",
+    "find",
+    "open_edges",
+    "path_for",
+]
+
+Compression: typing.TypeAlias = typing.Literal["gz", "xz", "dv"]
+
+# suffix of the edge-list file of a graph by its compression, in the order in which
+# :func:`find` looks for them; ``dv`` is the binary format of :func:`encode_delta`
+SUFFIXES: dict[Compression | None, str] = {
+    None: ".edges",
+    "dv": ".edges.dv",
+    "gz": ".edges.gz",
+    "xz": ".edges.xz",
+}
+
+# compression levels that trade little of the ratio for much faster writing
+_GZIP_LEVEL = 6
+_XZ_PRESET = 6
+
+# magic number and version at the start of a delta-encoded edge list
+_DELTA_MAGIC = b"EDGESDV\x01"
+
+# the smallest values that take 2, 3, ..., 10 bytes as varints
+_VARINT_LIMITS = np.array([1 << (7 * k) for k in range(1, 10)], dtype=np.uint64)
+
+# number of varints encoded or decoded at once, which bounds the memory used
+_VARINTS_PER_CHUNK = 1 << 22
+
+
+def path_for(
+    graph_dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    compression: Compression | None = None,
+) -> pathlib.Path:
+    r"""Returns the path of the edge-list file of the graph in ``graph_dir`` with the
+    given compression, e.g., ``graph.edges.gz`` for ``"gz"``."""
+
+    if not os.fspath(graph_dir):
+        raise ValueError("Cannot specify an empty path or string for graph_dir")
+    if compression not in SUFFIXES:
+        raise ValueError(f"Unrecognized compression: {compression}")
+
+    return pathlib.Path(graph_dir) / f"graph{SUFFIXES[compression]}"
+
+
+def find(
+    graph_dir: pathlib.Path | os.PathLike[typing.Any] | str,
+) -> pathlib.Path | None:
+    r"""Returns the path of the edge-list file of the graph in ``graph_dir``, which
+    may be compressed, or None if it has none."""
+
+    for compression in SUFFIXES:
+        path = path_for(graph_dir, compression)
+        if path.is_file():
+            return path
+    return None
+
+
+def compression_of(
+    filepath: pathlib.Path | os.PathLike[typing.Any] | str,
+) -> Compression | None:
+    r"""Returns the compression of a file by its filename extension, or None if it
+    is not compressed."""
+
+    suffix = pathlib.PurePath(filepath).suffix
+    return (
+        typing.cast(Compression, suffix[1:])
+        if suffix in (".gz", ".xz", ".dv")
+        else None
+    )
+
+
+def open_edges(
+    filepath: pathlib.Path | os.PathLike[typing.Any] | str,
+    mode: typing.Literal["rb", "wb"] = "rb",
+) -> typing.BinaryIO:
+    r"""Opens a plain, gzip- or xz-compressed file in binary mode, decompressing it
+    as it is read or compressing it as it is written.
+
+    Delta-encoded files cannot be streamed this way; use :func:`decode_delta` and
+    :func:`encode_delta`.
+    """
+
+    match compression_of(filepath):
+        case None:
+            return builtins.open(filepath, mode)
+        case "gz":
+            return typing.cast(
+                typing.BinaryIO, gzip.open(filepath, mode, compresslevel=_GZIP_LEVEL)
+            )
+        case "xz":
+            return typing.cast(
+                typing.BinaryIO,
+                lzma.open(filepath, mode, preset=None if mode == "rb" else _XZ_PRESET),
+            )
+        case compression:
+            raise ValueError(f"Cannot stream a file with compression '{compression}'")
+
+
+def encode_delta(sources: npt.ArrayLike, targets: npt.ArrayLike) -> bytes:
+    r"""Encodes an edge list with non-negative integer endpoints compactly.
+
+    Each edge is stored as two varints (LEB128): the zigzag-encoded difference of
+    its source from the previous source, and that of its target from the previous
+    target if the source is the same and from its own source otherwise.  The edges
+    of the dataset are listed by source, with nearby targets, so most edges take two
+    or three bytes, and the order of the edges is preserved exactly.
+    """
+
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    if sources.shape != targets.shape or sources.ndim != 1:
+        raise ValueError("Expected one-dimensional arrays of equal lengths")
+    if sources.size and min(sources.min(), targets.min()) < 0:
+        raise ValueError("Expected non-negative node labels")
+
+    source_deltas = np.diff(sources, prepend=0)
+    previous_targets = np.concatenate(([0], targets[:-1]))
+    target_bases = np.where(source_deltas == 0, previous_targets, sources)
+    if sources.size:
+        target_bases[0] = sources[0]
+    deltas = np.stack((source_deltas, targets - target_bases), axis=1).ravel()
+    del source_deltas, previous_targets, target_bases
+
+    header = _DELTA_MAGIC + np.uint64(sources.size).tobytes()
+    return header + b"".join(
+        _encode_varints(_zigzag(deltas[start : start + _VARINTS_PER_CHUNK]))
+        for start in range(0, deltas.size, _VARINTS_PER_CHUNK)
+    )
+
+
+def decode_delta(
+    data: bytes | npt.NDArray[np.uint8],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    r"""Decodes an edge list encoded by :func:`encode_delta`.
+
+    :return: The arrays of sources and targets
+    """
+
+    buf = np.frombuffer(data, dtype=np.uint8)
+    header_size = len(_DELTA_MAGIC) + 8
+    if buf.size < header_size or buf[: len(_DELTA_MAGIC)].tobytes() != _DELTA_MAGIC:
+        raise ValueError("Not a delta-encoded edge list")
+    num_edges = int(buf[len(_DELTA_MAGIC) : header_size].view(np.uint64)[0])
+    buf = buf[header_size:]
+
+    # decode in chunks that end with the last byte of a varint
+    ends = np.flatnonzero(buf < 0x80)
+    if ends.size != 2 * num_edges or (buf.size and buf[-1] >= 0x80):
+        raise ValueError("Truncated or corrupt delta-encoded edge list")
+    deltas = np.empty(2 * num_edges, dtype=np.int64)
+    for start in range(0, ends.size, _VARINTS_PER_CHUNK):
+        stop = min(start + _VARINTS_PER_CHUNK, ends.size)
+        first_byte = int(ends[start - 1]) + 1 if start else 0
+        deltas[start:stop] = _unzigzag(
+            _decode_varints(buf[first_byte : ends[stop - 1] + 1])
+        )
+    del ends
+
+    source_deltas, target_deltas = deltas[0::2], deltas[1::2]
+    sources = np.cumsum(source_deltas)
+
+    # the targets are running sums that restart from the source at each edge whose
+    # source differs from the previous one
+    restarts = source_deltas != 0
+    if num_edges:
+        restarts[0] = True
+    steps = np.where(restarts, sources + target_deltas, target_deltas)
+    sums = np.cumsum(steps)
+    restart_pos = np.maximum.accumulate(np.where(restarts, np.arange(num_edges), 0))
+    targets = sums - (sums - steps)[restart_pos]
+
+    return sources, targets
+
+
+def _zigzag(values: npt.NDArray[np.int64]) -> npt.NDArray[np.uint64]:
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+
+def _unzigzag(values: npt.NDArray[np.uint64]) -> npt.NDArray[np.int64]:
+    return ((values >> np.uint64(1)) ^ -(values & np.uint64(1))).view(np.int64)
+
+
+def _encode_varints(values: npt.NDArray[np.uint64]) -> bytes:
+    # the number of 7-bit groups of each value, at least one
+    lengths = np.searchsorted(_VARINT_LIMITS, values, side="right") + 1
+
+    # the position of each byte in its varint, and the value it comes from
+    owner = np.repeat(np.arange(values.size), lengths)
+    ends = np.cumsum(lengths)
+    position = np.arange(ends[-1] if ends.size else 0) - np.repeat(
+        ends - lengths, lengths
+    )
+    groups = (values[owner] >> (7 * position).astype(np.uint64)) & np.uint64(0x7F)
+    is_last = position == lengths[owner] - 1
+    return (
+        (groups | np.where(is_last, 0, 0x80).astype(np.uint64))
+        .astype(np.uint8)
+        .tobytes()
+    )
+
+
+def _decode_varints(buf: npt.NDArray[np.uint8]) -> npt.NDArray[np.uint64]:
+    # buf ends with the last byte of a varint
+    is_last = buf < 0x80
+    starts = np.concatenate(([0], np.flatnonzero(is_last)[:-1] + 1))
+    position = np.arange(buf.size) - np.repeat(
+        starts, np.diff(np.append(starts, buf.size))
+    )
+    groups = (buf & 0x7F).astype(np.uint64) << (7 * position).astype(np.uint64)
+    return np.add.reduceat(groups, starts) if buf.size else np.empty(0, np.uint64)
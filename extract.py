@@ -3,13 +3,20 @@
 import argparse
 import os
 import pathlib
+import shutil
 import typing
 import zipfile
 
 import utils
 
+__all__ = ["GRAPH_SUFFIXES", "extraction_dir", "graph_member", "unzip"]
+
 logger = utils.configure_logger(__name__)
 
+# suffixes of the names of the files that hold a graph, which
+# preprocess_graph.in_extracted_dir reads
+GRAPH_SUFFIXES = (".mtx", ".edges")
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -49,6 +56,16 @@ def main():
         action="store_true",
         help="Keep the ZIP file after extraction (default: delete it)",
     )
+    _ = parser.add_argument(
+        "-a",
+        "--all",
+        action="store_true",
+        help=(
+            "Extract every file in the archive (default: only the first file with a "
+            + " or ".join(f"'{suffix}'" for suffix in GRAPH_SUFFIXES)
+            + " suffix, which holds the graph)"
+        ),
+    )
 
     args = parser.parse_args()
 
@@ -60,6 +77,7 @@ def main():
         out_parent=args.outdir,
         no_clobber=args.noclobber,
         keep=args.keep,
+        graph_only=not args.all,
     )
 
     print(path)
@@ -70,6 +88,7 @@ def unzip(
     out_parent: pathlib.Path | os.PathLike[typing.Any] | str | None = None,
     no_clobber: bool = False,
     keep: bool = False,
+    graph_only: bool = True,
 ) -> pathlib.Path:
     """Unzip a ZIP file to a directory.
 
@@ -80,9 +99,53 @@ def unzip(
         named using the ZIP file's name's prefix upto and excluding the first dot
     :param no_clobber: Whether to raise an error if a file already exists
     :param keep: Whether to keep the ZIP file after extraction
+    :param graph_only: Whether to extract only the file holding the graph (see
+        :func:`graph_member`), directly into the extracted directory, instead of every
+        file in the archive
     :return: The path to the extracted directory
     """
 
+    zip_filepath = pathlib.Path(zip_filepath)
+    exdir = extraction_dir(zip_filepath, out_parent)
+    logger.info(f"Extracting '{zip_filepath}' to '{exdir}'")
+
+    if exdir.exists() and no_clobber:
+        raise FileExistsError(
+            f"Extraction destination '{exdir}' already exists, but "
+            + ("the --noclobber flag" if __name__ == "__main__" else "no_clobber=True")
+            + " was specified"
+        )
+
+    with zipfile.ZipFile(zip_filepath, mode="r") as zip_file:
+        if graph_only:
+            member = graph_member(zip_file)
+            exdir.mkdir(exist_ok=True)
+            logger.info(f"Extracting only '{member.filename}'")
+            with (
+                zip_file.open(member) as src,
+                open(exdir / pathlib.PurePosixPath(member.filename).name, "wb") as dst,
+            ):
+                shutil.copyfileobj(src, dst, 1 << 20)
+        else:
+            zip_file.extractall(path=exdir)
+
+    if not keep:
+        logger.info(f"Deleting '{zip_filepath}'")
+        zip_filepath.unlink()
+
+    return exdir
+
+
+def extraction_dir(
+    zip_filepath: pathlib.Path | os.PathLike[typing.Any] | str,
+    out_parent: pathlib.Path | os.PathLike[typing.Any] | str | None = None,
+) -> pathlib.Path:
+    """Returns the directory into which :func:`unzip` extracts a ZIP file, creating
+    its parent if it does not exist.
+
+    See :func:`unzip` for the parameters.
+    """
+
     if out_parent is None:
         out_parent = pathlib.Path(__file__).parent / "data/graphs/"
         logger.info(f"Using '{out_parent}' as the default extraction parent directory")
@@ -103,29 +166,26 @@ def unzip(
                 "a directory"
             )
 
-    zip_filepath = pathlib.Path(zip_filepath)
-
     # the prefix of zip_filepath.name until the first '.'
-    filename_stem = zip_filepath.name.split(".", maxsplit=1)[0]
+    filename_stem = pathlib.Path(zip_filepath).name.split(".", maxsplit=1)[0]
 
-    exdir = out_parent / filename_stem
-    logger.info(f"Extracting '{zip_filepath}' to '{exdir}'")
+    return out_parent / filename_stem
 
-    if exdir.exists() and no_clobber:
-        raise FileExistsError(
-            f"Extraction destination '{exdir}' already exists, but "
-            + ("the --noclobber flag" if __name__ == "__main__" else "no_clobber=True")
-            + " was specified"
-        )
 
-    with zipfile.ZipFile(zip_filepath, mode="r") as zip_file:
-        zip_file.extractall(path=exdir)
+def graph_member(zip_file: zipfile.ZipFile) -> zipfile.ZipInfo:
+    """Finds the file holding the graph in a Network Repository archive: the first
+    file, in the order of the archive, whose name has one of the
+    :data:`GRAPH_SUFFIXES`.
 
-        if not keep:
-            logger.info(f"Deleting '{zip_filepath}'")
-            zip_filepath.unlink()
+    The member can be read without extracting it with :meth:`zipfile.ZipFile.open`,
+    e.g., by passing the opened file to :func:`read_graph.from_file`.
+    """
 
-    return exdir
+    for info in zip_file.infolist():
+        if not info.is_dir() and info.filename.endswith(GRAPH_SUFFIXES):
+            return info
+
+    raise ValueError(f"No graph data files found in '{zip_file.filename}'")
 
 
 if __name__ == "__main__":
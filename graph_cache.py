@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import pathlib
+import struct
+import tempfile
+import typing
+import zipfile
+
+import numpy as np
+import numpy.typing as npt
+
+import edge_files
+import utils
+from csr_graph import CSRGraph
+
+__all__ = ["cache_path", "load", "store"]
+
+logger = utils.configure_logger(__name__)
+
+# bump whenever the layout of the cache files changes to invalidate old caches
+_FORMAT_VERSION = 1
+
+
+def cache_path(
+    edges_path: pathlib.Path | os.PathLike[typing.Any] | str,
+) -> pathlib.Path:
+    r"""Returns the path of the cache file for an edge-list file, which sits next to
+    it, e.g., ``graph.csr.npz`` for ``graph.edges`` or ``graph.edges.gz``."""
+
+    edges_path = pathlib.Path(edges_path)
+    if edge_files.compression_of(edges_path) is not None:
+        edges_path = edges_path.with_suffix("")
+    return edges_path.with_suffix(".csr.npz")
+
+
+def store(
+    edges_path: pathlib.Path | os.PathLike[typing.Any] | str, g: CSRGraph
+) -> pathlib.Path:
+    r"""Writes ``g``, which must have been read from ``edges_path``, to the cache file
+    for ``edges_path``, along with the size, modification time and SHA-256 digest of
+    ``edges_path`` for invalidation.
+
+    The arrays are stored uncompressed so that :func:`load` can memory-map them, and
+    the file is replaced atomically.
+
+    :return: The path of the cache file
+    """
+
+    edges_path = pathlib.Path(edges_path)
+    return _write(edges_path, g, edges_path.stat(), _sha256(edges_path))
+
+
+def load(
+    edges_path: pathlib.Path | os.PathLike[typing.Any] | str,
+) -> CSRGraph | None:
+    r"""Loads the graph in ``edges_path`` from its cache file, memory-mapping the
+    arrays instead of reading them.
+
+    The cache is considered stale if it was written by a different version of this
+    module, or if the size of ``edges_path`` has changed, or if its modification time
+    has changed and so has its SHA-256 digest.  If only the modification time has
+    changed, the cache file is rewritten with the new one.
+
+    :return: The cached graph, or None if there is no cache file or it is stale
+    """
+
+    edges_path = pathlib.Path(edges_path)
+    path = cache_path(edges_path)
+
+    if not path.is_file():
+        logger.debug(f"No cache file found for '{edges_path}'")
+        return None
+
+    try:
+        arrays = _mmap_npz(path)
+        meta = json.loads(str(arrays["meta"]))
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        logger.warning(f"Ignoring the unreadable cache file '{path}': {e}")
+        return None
+
+    if meta.get("version") != _FORMAT_VERSION:
+        logger.info(f"Ignoring the cache file '{path}' of an old format version")
+        return None
+
+    stat = edges_path.stat()
+    if stat.st_size != meta["source_size"]:
+        logger.info(f"Ignoring the stale cache file '{path}' (size changed)")
+        return None
+    g = CSRGraph(arrays["indptr"], arrays["indices"], arrays.get("labels"))
+    if stat.st_mtime_ns != meta["source_mtime_ns"]:
+        digest = _sha256(edges_path)
+        if digest != meta["source_sha256"]:
+            logger.info(f"Ignoring the stale cache file '{path}' (contents changed)")
+            return None
+
+        # record the new modification time so that later loads need not hash the
+        # file again, e.g., after a fresh checkout
+        try:
+            _ = _write(edges_path, g, stat, digest)
+        except OSError as e:
+            logger.debug(f"Could not update the cache file '{path}': {e}")
+
+    logger.info(f"Loaded '{edges_path}' from the cache file '{path}'")
+    return g
+
+
+def _write(
+    edges_path: pathlib.Path, g: CSRGraph, stat: os.stat_result, digest: str
+) -> pathlib.Path:
+    path = cache_path(edges_path)
+    meta = {
+        "version": _FORMAT_VERSION,
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_sha256": digest,
+    }
+
+    arrays: dict[str, npt.NDArray[typing.Any]] = {
+        "meta": np.array(json.dumps(meta)),
+        "indptr": g.indptr,
+        "indices": g.indices,
+    }
+    if g.labels is not None:
+        arrays["labels"] = np.asarray(g.labels)
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, allow_pickle=False, **arrays)
+        os.chmod(tmp_name, stat.st_mode & 0o666)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+    logger.info(f"Wrote the cache file '{path}'")
+    return path
+
+
+def _sha256(path: pathlib.Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _mmap_npz(path: pathlib.Path) -> dict[str, npt.NDArray[typing.Any]]:
+    r"""Memory-maps every array in an uncompressed ``.npz`` file.
+
+    :func:`np.load` only memory-maps ``.npy`` files, so this locates each member's
+    data in the ZIP archive and the array data after the member's ``.npy`` header.
+    """
+
+    arrays: dict[str, npt.NDArray[typing.Any]] = {}
+
+    with zipfile.ZipFile(path) as zip_file, open(path, "rb") as f:
+        for info in zip_file.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Member '{info.filename}' is compressed")
+
+            # skip the member's local file header, whose name and extra fields have
+            # variable lengths
+            f.seek(info.header_offset)
+            local_header = f.read(30)
+            name_len, extra_len = struct.unpack("<HH", local_header[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+
+            name = info.filename.removesuffix(".npy")
+            if dtype.hasobject:
+                raise ValueError(f"Member '{info.filename}' holds Python objects")
+            if 0 in shape or shape == ():
+                # zero-sized arrays cannot be memory-mapped, and scalars are tiny
+                count = int(np.prod(shape))
+                arrays[name] = np.fromfile(f, dtype=dtype, count=count).reshape(shape)
+            else:
+                arrays[name] = np.memmap(
+                    path,
+                    dtype=dtype,
+                    mode="r",
+                    offset=f.tell(),
+                    shape=shape,
+                    order="F" if fortran_order else "C",
+                )
+
+    return arrays
@@ -1,22 +1,66 @@
 import argparse
+import concurrent.futures
+import hashlib
+import json
 import os
 import pathlib
 import typing
+from collections import abc
 
 import networkx as nx
+import numpy as np
+import numpy.typing as npt
+import scipy.sparse
+import scipy.sparse.csgraph
+import yaml
 
+import edge_files
+import properties_index
 import read_graph
 import utils
+import vc_bounds
+from csr_graph import CSRGraph
 
 __all__ = [
+    "EXTRA_PROPERTIES",
+    "ExtraProperty",
     "compute",
+    "compute_extra",
+    "compute_from_edges",
     "compute_from_file",
     "density",
+    "for_graph",
+    "for_graphs_in_root",
     "max_and_avg_degrees",
+    "write_properties",
 ]
 
 logger = utils.configure_logger(__name__)
 
+# keys in 'properties.yaml' that record the versions of the extra properties in it
+# and the digest of the graph they were computed for
+_VERSIONS_KEY = "property_versions"
+_DIGEST_KEY = "graph_digest"
+
+# number of wedges (paths of length 2) enumerated at once when counting triangles
+_WEDGES_PER_CHUNK = 1 << 24
+
+# number of breadth-first searches for the approximate diameter
+_DIAMETER_SWEEPS = 4
+
+
+class ExtraProperty(typing.NamedTuple):
+    r"""A property that is more expensive to compute than those of :func:`compute`
+    and is only computed on request.
+
+    The values are cached in ``properties.yaml`` along with :attr:`version`, which
+    must be bumped whenever the implementation changes the values.
+    """
+
+    version: int
+    keys: tuple[str, ...]
+    compute: abc.Callable[[CSRGraph], dict[str, int | float | bool | str]]
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -44,12 +88,47 @@ def main():
         ),
     )
 
+    _ = parser.add_argument(
+        "-c",
+        "--components",
+        action="store_true",
+        help=(
+            "Also print the number of connected components and the order of the "
+            "largest one"
+        ),
+    )
+    _ = parser.add_argument(
+        "-x",
+        "--extra",
+        action="append",
+        default=[],
+        choices=[*EXTRA_PROPERTIES, "all"],
+        help=(
+            "Also print an extra property, or all of them with 'all'; can be given "
+            "multiple times (default: none)"
+        ),
+    )
+    _ = parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=(
+            "Parse the input file even if it has an up-to-date binary cache file, and "
+            "do not write one (default: use and write cache files)"
+        ),
+    )
+
     args = parser.parse_args()
 
     if not args.graph_filepath:
         args.graph_filepath = input()
 
-    props = compute_from_file(args.graph_filepath, args.format)
+    props = compute_from_file(
+        args.graph_filepath,
+        args.format,
+        cache=not args.no_cache,
+        components=args.components,
+        extra=list(EXTRA_PROPERTIES) if "all" in args.extra else args.extra,
+    )
 
     logger.debug("Printing analysis results.")
     for key, val in props.items():
@@ -59,15 +138,242 @@ def main():
 def compute_from_file(
     filepath: pathlib.Path | os.PathLike[typing.Any] | str,
     format: typing.Literal["mtx", "edges"] | str | None = None,
-) -> dict[str, int | float | bool]:
+    cache: bool = True,
+    components: bool = False,
+    extra: abc.Iterable[str] = (),
+) -> dict[str, int | float | bool | str]:
     """Reads a graph from a file in one of the supported formats and computes its
-    properties that are relevant for our experiments."""
+    properties that are relevant for our experiments (see :func:`compute`), and the
+    given :data:`EXTRA_PROPERTIES` (see :func:`compute_extra`)."""
+
+    g = read_graph.from_file(filepath, format, backend="csr", cache=cache)
+    props: dict[str, int | float | bool | str] = {**compute(g, components)}
+    props.update(compute_extra(g, extra))
+    return props
+
+
+def for_graph(
+    dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    extra: abc.Iterable[str] = (),
+    isolated_nodes: int | None = None,
+) -> None:
+    r"""Brings the ``properties.yaml`` of the graph in a directory of the dataset up
+    to date, and rewrites it if it has changed.
+
+    The properties of :func:`compute` are only computed from the edge list (see
+    :func:`edge_files.find`) if there is no ``properties.yaml`` yet: those in the file
+    were computed from the original graph, whose isolated nodes the edge list does
+    not represent, so they are never overwritten.
+
+    The :data:`EXTRA_PROPERTIES` in ``extra`` are added, and those already in
+    ``properties.yaml`` are kept; either way, an extra property is only computed if
+    ``properties.yaml`` does not have its value for the same version of it and for
+    the same graph.  The nodes that the ``order`` in ``properties.yaml`` counts
+    beyond those of the edge list are taken to be isolated nodes.
+
+    :param isolated_nodes: If not None, the edge list has changed since the
+        properties were computed: those of :func:`compute` are recomputed from it,
+        with this many isolated nodes added, and replace those in
+        ``properties.yaml``
+    """
+
+    if not os.fspath(dir):
+        raise ValueError("Cannot specify an empty path or string for dir")
+    else:
+        dir = pathlib.Path(dir)
+
+    print(f"{dir} => ", end="")
+    path = _update(dir, extra, isolated_nodes)
+    print("unchanged" if path is None else path)
+
+
+def for_graphs_in_root(
+    rootdir: pathlib.Path | os.PathLike[typing.Any] | str = "./data/graphs/",
+    extra: abc.Iterable[str] = (),
+    jobs: int | None = None,
+    graphs: abc.Iterable[str] | None = None,
+) -> int:
+    r"""Adds the given :data:`EXTRA_PROPERTIES` to the ``properties.yaml`` of every
+    graph in ``rootdir`` that has an edge list and lacks any of them, as
+    :func:`for_graph` does, in a pool of worker processes.
+
+    :param jobs: Number of worker processes; if None, the number of CPUs
+    :param graphs: Names of the graphs to consider; if None, all of them
+    :return: The number of graphs whose ``properties.yaml`` was rewritten
+    """
+
+    if not os.fspath(rootdir):
+        raise ValueError("Cannot specify an empty path or string for rootdir")
+    else:
+        rootdir = pathlib.Path(rootdir)
+
+    extra = _check_extra(extra)
+    versions = {name: EXTRA_PROPERTIES[name].version for name in extra}
+    graphs = None if graphs is None else set(graphs)
+
+    # the digests are checked by _update, but the versions can be checked cheaply
+    dirs: list[pathlib.Path] = []
+    for dir in sorted(rootdir.iterdir()):
+        if graphs is not None and dir.name not in graphs:
+            continue
+        if edge_files.find(dir) is None:
+            continue
+        old = _read_yaml(dir / "properties.yaml")
+        if not versions.items() <= _parse_versions(old.get(_VERSIONS_KEY)).items():
+            dirs.append(dir)
+
+    if not dirs:
+        return 0
+
+    logger.info(f"Computing {', '.join(extra)} for {len(dirs)} graphs")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        paths = executor.map(_update, dirs, [extra] * len(dirs))
+        return sum(path is not None for path in paths)
 
-    g = read_graph.from_file(filepath, format)
-    return compute(g)
 
+def write_properties(
+    dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    props: abc.Mapping[str, int | float | bool | str],
+) -> None:
+    r"""Writes the properties of a new graph in the dataset to the
+    ``properties.yaml`` in its directory, one ``key: value`` line each (see
+    :func:`format_value`), and adds them to the properties index (see
+    :func:`properties_index.update`)."""
 
-def compute(g: nx.Graph) -> dict[str, int | float | bool]:
+    if not os.fspath(dir):
+        raise ValueError("Cannot specify an empty path or string for dir")
+    else:
+        dir = pathlib.Path(dir)
+
+    path = dir / "properties.yaml"
+    logger.info(f"Writing '{path}'")
+    with open(path, "w") as f:
+        for key, val in props.items():
+            _ = f.write(f"{key}: {format_value(val)}\n")
+    properties_index.update(dir, props)
+
+
+def _update(
+    dir: pathlib.Path, extra: abc.Iterable[str], isolated_nodes: int | None = None
+) -> pathlib.Path | None:
+    r"""Rewrites the ``properties.yaml`` of the graph in ``dir`` as described in
+    :func:`for_graph`.
+
+    :return: The path of ``properties.yaml`` if it was rewritten, or None
+    """
+
+    extra = _check_extra(extra)
+
+    path = dir / "properties.yaml"
+    old_text = path.read_text() if path.exists() else ""
+    old = _read_yaml(path)
+    old_versions = _parse_versions(old.get(_VERSIONS_KEY))
+    names = [name for name in EXTRA_PROPERTIES if name in extra or name in old_versions]
+    if old and not names and isolated_nodes is None:
+        return None
+
+    edges_path = edge_files.find(dir)
+    if edges_path is None:
+        raise FileNotFoundError(f"No edge list in '{dir}'")
+    g = read_graph.from_file(edges_path, backend="csr")
+    order = old.get("order") if isolated_nodes is None else g.order() + isolated_nodes
+    if isinstance(order, int) and order > g.order():
+        # the extra properties are those of the original graph, whose isolated nodes
+        # the edge list lacks, e.g., in the degree histogram
+        g = CSRGraph(np.pad(g.indptr, (0, order - g.order()), mode="edge"), g.indices)
+
+    # the properties of an existing file are kept as they are (see for_graph)
+    props: dict[str, int | float | bool | str] = (
+        {**compute(g)} if not old or isolated_nodes is not None else {}
+    )
+
+    if names:
+        digest = _digest(g)
+        same_graph = old.get(_DIGEST_KEY) == digest
+        versions: dict[str, int] = {}
+        for name in names:
+            prop = EXTRA_PROPERTIES[name]
+            if (
+                same_graph
+                and old_versions.get(name) == prop.version
+                and all(key in old for key in prop.keys)
+            ):
+                props.update({key: old[key] for key in prop.keys})
+            else:
+                logger.info(f"Computing {name} for '{dir.name}'")
+                props.update(prop.compute(g))
+            versions[name] = prop.version
+
+        props[_VERSIONS_KEY] = " ".join(f"{k}={v}" for k, v in versions.items())
+        props[_DIGEST_KEY] = digest
+
+    text = _merged(old_text, props)
+    if text == old_text:
+        return None
+
+    _ = path.write_text(text)
+    properties_index.update(dir, {**old, **props})
+    return path
+
+
+def _merged(text: str, props: abc.Mapping[str, int | float | bool | str]) -> str:
+    r"""Returns the text of a ``properties.yaml`` file with the lines of the given
+    properties replaced by their new values, and those of the properties it lacks
+    appended, leaving the other lines as they are."""
+
+    lines = text.splitlines(keepends=True)
+    if lines and not lines[-1].endswith("\n"):
+        lines[-1] += "\n"
+
+    pending = dict(props)
+    for i, line in enumerate(lines):
+        key, sep, _ = line.partition(":")
+        if sep and key in pending:
+            lines[i] = f"{key}: {format_value(pending.pop(key))}\n"
+    lines.extend(f"{key}: {format_value(val)}\n" for key, val in pending.items())
+
+    return "".join(lines)
+
+
+def _check_extra(extra: abc.Iterable[str]) -> list[str]:
+    extra = list(extra)
+    for name in extra:
+        if name not in EXTRA_PROPERTIES:
+            raise ValueError(f"Unknown extra property: {name}")
+    return extra
+
+
+def _read_yaml(path: pathlib.Path) -> dict[str, typing.Any]:
+    try:
+        with open(path) as f:
+            return yaml.load(f, yaml.SafeLoader) or {}
+    except FileNotFoundError:
+        return {}
+
+
+def _parse_versions(text: str | None) -> dict[str, int]:
+    r"""Parses the ``name=version`` pairs that record the versions of the extra
+    properties in ``properties.yaml``."""
+
+    if not text:
+        return {}
+    pairs = (item.partition("=") for item in text.split())
+    return {name: int(version) for name, _, version in pairs}
+
+
+def _digest(g: CSRGraph) -> str:
+    r"""Identifies a graph by the SHA-256 digest of its adjacency structure, which
+    does not depend on how its edge list is stored."""
+
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(g.indptr, dtype=np.int64).data)
+    digest.update(np.ascontiguousarray(g.indices, dtype=np.int64).data)
+    return digest.hexdigest()[:16]
+
+
+def compute(
+    g: nx.Graph | CSRGraph, components: bool = False
+) -> dict[str, int | float | bool]:
     r"""Computes the following metadata and statistical properties of a graph:
 
     * ``"order"``: number of nodes in the graph
@@ -77,12 +383,23 @@ def compute(g: nx.Graph) -> dict[str, int | float | bool]:
     * ``"density"``: density of the graph
     * ``"connected"``: whether the graph is connected or not
 
+    If ``components`` is true, the following are computed as well:
+
+    * ``"components"``: number of connected components
+    * ``"lcc_order"``: number of nodes in the largest connected component
+
+    A :class:`CSRGraph` is analyzed with vectorized sparse-matrix operations (see
+    :func:`compute_from_edges`), and an :class:`nx.Graph` with networkx.
+
     :return: a dictionary containing the properties of the graph with the keys
         described above
     """
 
+    if isinstance(g, CSRGraph):
+        return _compute_from_sparse(g.degree(), g.to_scipy(), components)
+
     max_deg, avg_deg = max_and_avg_degrees(g)
-    return {
+    props: dict[str, int | float | bool] = {
         "order": g.order(),
         "size": g.size(),
         "max_degree": max_deg,
@@ -91,6 +408,287 @@ def compute(g: nx.Graph) -> dict[str, int | float | bool]:
         "connected": nx.is_connected(g),
     }
 
+    if components:
+        sizes = [len(c) for c in nx.connected_components(g)]
+        props["components"] = len(sizes)
+        props["lcc_order"] = max(sizes)
+
+    return props
+
+
+def compute_from_edges(
+    sources: npt.ArrayLike,
+    targets: npt.ArrayLike,
+    num_nodes: int | None = None,
+    components: bool = False,
+) -> dict[str, int | float | bool]:
+    r"""Computes the same properties as :func:`compute` for the graph with the given
+    edges, which must not contain duplicates (in either direction).
+
+    Degrees are counted with :func:`np.bincount` and connectivity is determined by
+    labeling the connected components with
+    :func:`scipy.sparse.csgraph.connected_components`.
+
+    :param sources: One endpoint of each edge, as a node index
+    :param targets: The other endpoint of each edge, as a node index
+    :param num_nodes: Number of nodes; if None, one more than the largest index
+    """
+
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+
+    if num_nodes is None:
+        num_nodes = int(max(sources.max(), targets.max())) + 1 if sources.size else 0
+
+    # a self-loop adds 2 to the degree of its node, as in nx.Graph
+    degrees = np.bincount(sources, minlength=num_nodes) + np.bincount(
+        targets, minlength=num_nodes
+    )
+    adj = scipy.sparse.coo_array(
+        (np.ones(sources.size, dtype=np.int8), (sources, targets)),
+        shape=(num_nodes, num_nodes),
+    )
+    return _compute_from_sparse(degrees, adj, components)
+
+
+def _compute_from_sparse(
+    degrees: npt.NDArray[np.int64],
+    adj: scipy.sparse.sparray,
+    components: bool,
+) -> dict[str, int | float | bool]:
+    order = degrees.size
+    total_deg = int(degrees.sum())
+    size = total_deg // 2
+
+    num_components, labels = scipy.sparse.csgraph.connected_components(
+        adj, directed=False
+    )
+
+    # same arithmetic as in max_and_avg_degrees and density, on Python numbers
+    props: dict[str, int | float | bool] = {
+        "order": order,
+        "size": size,
+        "max_degree": int(degrees.max()) if order else 0,
+        "avg_degree": total_deg / order,
+        "density": 2 * size / (order * (order - 1)),
+        "connected": num_components == 1,
+    }
+
+    if components:
+        props["components"] = num_components
+        props["lcc_order"] = int(np.bincount(labels).max())
+
+    return props
+
+
+def compute_extra(
+    g: CSRGraph, names: abc.Iterable[str]
+) -> dict[str, int | float | bool | str]:
+    r"""Computes the given :data:`EXTRA_PROPERTIES` of a graph.
+
+    :return: The values of the keys of each property
+    """
+
+    props: dict[str, int | float | bool | str] = {}
+    for name in _check_extra(names):
+        props.update(EXTRA_PROPERTIES[name].compute(g))
+    return props
+
+
+def _degeneracy(g: CSRGraph) -> dict[str, int | float | bool | str]:
+    r"""Computes the degeneracy, the largest ``k`` such that the graph has a
+    nonempty ``k``-core, i.e., the largest core number of a node.
+
+    The nodes are peeled off in rounds: each round removes every remaining node
+    whose degree among the remaining nodes is at most the current ``k`` and only
+    examines the neighbors of the removed nodes in the next round.
+    """
+
+    if g.number_of_selfloops():
+        g = g.without_selfloops()
+
+    degrees = g.degree()
+    alive = np.ones(g.order(), dtype=np.bool_)
+    remaining = g.order()
+    k = 0
+
+    while remaining:
+        k = max(k, int(degrees[alive].min()))
+        frontier = np.flatnonzero(alive & (degrees <= k))
+        while frontier.size:
+            alive[frontier] = False
+            remaining -= frontier.size
+            neighbors = _neighbors_of(g, frontier)
+            neighbors, counts = np.unique(
+                neighbors[alive[neighbors]], return_counts=True
+            )
+            degrees[neighbors] -= counts
+            frontier = neighbors[degrees[neighbors] <= k]
+
+    return {"degeneracy": k}
+
+
+def _triangles(g: CSRGraph) -> dict[str, int | float | bool | str]:
+    r"""Counts the triangles and computes the transitivity (the fraction of paths of
+    length 2 that are closed), as :func:`nx.triangles` and :func:`nx.transitivity`
+    do.
+
+    Each edge is oriented from the endpoint of lower degree to that of higher degree,
+    so that every triangle is counted once, as a path ``u -> v -> w`` closed by an
+    edge ``u -> w``, and the number of such paths, which are enumerated by sparse
+    matrix products over chunks of rows, is ``O(m^1.5)``.
+    """
+
+    if g.number_of_selfloops():
+        g = g.without_selfloops()
+
+    n = g.order()
+    degrees = g.degree()
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.lexsort((np.arange(n), degrees))] = np.arange(n)
+
+    rows = g._rows()
+    forward = rank[rows] < rank[g.indices]
+    oriented = scipy.sparse.csr_array(
+        (
+            np.ones(int(forward.sum()), dtype=np.int64),
+            (rows[forward], g.indices[forward]),
+        ),
+        shape=(n, n),
+    )
+    del rows, forward
+
+    # split the rows into chunks with about the same number of paths
+    out_degrees = np.diff(oriented.indptr)
+    paths_per_row = oriented @ out_degrees
+    bounds = np.searchsorted(
+        np.cumsum(paths_per_row),
+        np.arange(_WEDGES_PER_CHUNK, int(paths_per_row.sum()), _WEDGES_PER_CHUNK),
+    )
+
+    triangles = 0
+    for start, stop in zip(
+        np.concatenate(([0], bounds)), np.append(bounds, n), strict=True
+    ):
+        chunk = oriented[start:stop]
+        triangles += int((chunk @ oriented).multiply(chunk).sum())
+
+    paths = int((degrees * (degrees - 1) // 2).sum())
+    return {
+        "triangles": triangles,
+        "transitivity": 3 * triangles / paths if paths else 0.0,
+    }
+
+
+def _degree_histogram(g: CSRGraph) -> dict[str, int | float | bool | str]:
+    r"""Counts the nodes by degree in bins of powers of 2, formatted as, e.g.,
+    ``"1:10 2-3:25 4-7:3"`` (the degrees ``1``, ``2`` to ``3``, and ``4`` to ``7``),
+    omitting empty bins."""
+
+    degrees = g.degree()
+    # bin 0 holds the isolated nodes, and bin i > 0 the degrees 2^(i-1) to 2^i - 1
+    bins = np.zeros(degrees.size, dtype=np.int64)
+    positive = degrees > 0
+    bins[positive] = np.floor(np.log2(degrees[positive])).astype(np.int64) + 1
+    counts = np.bincount(bins)
+
+    items: list[str] = []
+    for i in np.flatnonzero(counts).tolist():
+        low, high = (0, 0) if i == 0 else (1 << (i - 1), (1 << i) - 1)
+        label = str(low) if low == high else f"{low}-{high}"
+        items.append(f"{label}:{counts[i]}")
+
+    return {"degree_histogram": " ".join(items)}
+
+
+def _bipartite(g: CSRGraph) -> dict[str, int | float | bool | str]:
+    r"""Determines whether the graph is bipartite.
+
+    A connected graph is bipartite if and only if its bipartite double cover, which
+    has two copies ``v`` and ``v'`` of each node ``v`` and the edges ``u v'`` and
+    ``u' v`` for each edge ``u v``, is disconnected, so the graph is bipartite if
+    and only if its double cover has twice as many connected components.
+    """
+
+    n = g.order()
+    sources, targets = g.edges()
+    cover = scipy.sparse.coo_array(
+        (
+            np.ones(2 * sources.size, dtype=np.int8),
+            (
+                np.concatenate((sources, sources + n)),
+                np.concatenate((targets + n, targets)),
+            ),
+        ),
+        shape=(2 * n, 2 * n),
+    )
+    num_components, _ = scipy.sparse.csgraph.connected_components(
+        g.to_scipy(), directed=False
+    )
+    num_cover_components, _ = scipy.sparse.csgraph.connected_components(
+        cover, directed=False
+    )
+    return {"bipartite": num_cover_components == 2 * num_components}
+
+
+def _approx_diameter(g: CSRGraph) -> dict[str, int | float | bool | str]:
+    r"""Computes a lower bound on the diameter of the largest connected component
+    (which is the diameter of the graph if it is connected) by repeated
+    breadth-first searches, each starting from a node farthest from the start of
+    the previous one, beginning with a node of maximum degree.
+
+    The bound is exact for trees and usually exact or close on sparse graphs.
+    """
+
+    adj = g.to_scipy()
+    _, component = scipy.sparse.csgraph.connected_components(adj, directed=False)
+    largest = np.argmax(np.bincount(component)) if component.size else 0
+    in_largest = component == largest
+
+    degrees = g.degree()
+    start = int(np.argmax(np.where(in_largest, degrees, -1))) if g.order() else 0
+    diameter = 0
+    for _ in range(_DIAMETER_SWEEPS if g.order() else 0):
+        distances = scipy.sparse.csgraph.shortest_path(
+            adj, method="D", unweighted=True, indices=start
+        )
+        distances[~in_largest] = -1
+        farthest = int(np.argmax(distances))
+        if distances[farthest] <= diameter:
+            break
+        diameter = int(distances[farthest])
+        start = farthest
+
+    return {"approx_diameter": diameter}
+
+
+def _bandwidth(g: CSRGraph) -> dict[str, int | float | bool | str]:
+    r"""Measures how far apart the endpoints of the edges are in the numbering of
+    the nodes (in ascending order of their labels): the bandwidth of the adjacency
+    matrix, i.e., the largest difference, and the average difference."""
+
+    spans = np.abs(g._rows() - g.indices)
+    return {
+        "bandwidth": int(spans.max()) if spans.size else 0,
+        "avg_edge_span": float(spans.mean()) if spans.size else 0.0,
+    }
+
+
+def _vc_bounds(g: CSRGraph) -> dict[str, int | float | bool | str]:
+    r"""Computes bounds on the size of a minimum vertex cover (see
+    :func:`vc_bounds.compute`)."""
+
+    return dict(vc_bounds.compute(g))
+
+
+def _neighbors_of(g: CSRGraph, nodes: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+    r"""Returns the neighbors of each of ``nodes``, concatenated."""
+
+    starts = g.indptr[nodes]
+    lengths = g.indptr[nodes + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return g.indices[offsets + np.arange(offsets.size)]
+
 
 def max_and_avg_degrees(g: nx.Graph) -> tuple[int, float]:
     max_deg = 0
@@ -106,13 +704,28 @@ def density(g: nx.Graph) -> float:
     return 2 * g.size() / (g.order() * (g.order() - 1))
 
 
-def format_value(val: int | float | bool) -> str:
+def format_value(val: int | float | bool | str) -> str:
     match val:
         case bool():
             return "yes" if val else "no"
+        case str():
+            # quoted, as YAML would read, e.g., '1:20' as a number
+            return json.dumps(val)
         case _:
             return str(val)
 
 
+# properties that are only computed on request, by name
+EXTRA_PROPERTIES: dict[str, ExtraProperty] = {
+    "degeneracy": ExtraProperty(1, ("degeneracy",), _degeneracy),
+    "triangles": ExtraProperty(1, ("triangles", "transitivity"), _triangles),
+    "degree_histogram": ExtraProperty(1, ("degree_histogram",), _degree_histogram),
+    "bipartite": ExtraProperty(1, ("bipartite",), _bipartite),
+    "approx_diameter": ExtraProperty(1, ("approx_diameter",), _approx_diameter),
+    "vc_bounds": ExtraProperty(1, vc_bounds.KEYS, _vc_bounds),
+    "bandwidth": ExtraProperty(1, ("bandwidth", "avg_edge_span"), _bandwidth),
+}
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,608 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import pathlib
+import typing
+from collections import abc
+
+import numpy as np
+import numpy.typing as npt
+
+import edge_files
+import graph_properties
+import read_graph
+import utils
+import vc_bounds
+import write_graph
+from csr_graph import CSRGraph
+
+__all__ = [
+    "LOG_FILENAME",
+    "Kernel",
+    "ReductionLog",
+    "for_graph",
+    "for_graphs_in_root",
+    "kernelize",
+    "lift",
+    "lift_results",
+    "read_log",
+    "write_log",
+]
+
+logger = utils.configure_logger(__name__)
+
+# name of the file in the directory of a kernel that holds its reduction log
+LOG_FILENAME = "reductions.npz"
+
+# largest degree of a node that is checked for being dominated by a neighbor, which
+# bounds the work of the dominance rule to this many times the number of edges
+_DOMINANCE_MAX_DEGREE = 8
+
+# seed of the random priorities that decide which reductions are applied together
+_SEED = 0
+
+
+class ReductionLog(typing.NamedTuple):
+    r"""The reductions that turned a graph into its kernel, from which a cover of
+    the kernel is lifted to a cover of the graph (see :func:`lift`).
+
+    The nodes are the indices of the nodes of the graph, i.e., the positions of
+    their labels in :attr:`labels`.
+    """
+
+    # the original label of each node of the graph
+    labels: npt.NDArray[np.int64]
+    # the node of the graph that each node of the kernel is, by kernel label
+    kernel_nodes: npt.NDArray[np.int64]
+    # the nodes taken into the cover
+    cover: npt.NDArray[np.int64]
+    # the ``(v, u, w)`` nodes of each degree-2 fold, in the order of the folds
+    folds: npt.NDArray[np.int64]
+    # the index of the first fold of each round of folds, and the number of folds;
+    # the folds of a round are disjoint
+    fold_rounds: npt.NDArray[np.int64]
+
+
+class Kernel(typing.NamedTuple):
+    r"""The result of :func:`kernelize`."""
+
+    sources: npt.NDArray[np.int64]
+    targets: npt.NDArray[np.int64]
+    log: ReductionLog
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Reduce graphs to their vertex cover kernels, adding each kernel to the "
+            "dataset, or lift the solutions found on the kernels back to the graphs."
+        )
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reduce_parser = subparsers.add_parser(
+        "reduce",
+        help=(
+            "Add the kernel of a graph (or all graphs) to the dataset as "
+            "'<graph>_kernel', with the reduction log and the node mapping"
+        ),
+    )
+    _ = reduce_parser.add_argument(
+        "-a",
+        "--all",
+        action="store_true",
+        help="Process all graph data points that are subdirectories of the given path",
+    )
+    _ = reduce_parser.add_argument(
+        "-c",
+        "--compression",
+        choices=[c for c in edge_files.SUFFIXES if c is not None],
+        help=(
+            "Compress the edge list of the kernel: 'gz' or 'xz' for a compressed text "
+            "file, or 'dv' for a delta-encoded binary file (default: plain text)"
+        ),
+    )
+    _ = reduce_parser.add_argument(
+        "path",
+        nargs="?",
+        help=(
+            "Directory for the graph or the parent directory for all graphs if `--all` "
+            "is specified; if this argument is either not provided or provided as an "
+            "empty string, the path will be read from stdin"
+        ),
+    )
+
+    lift_parser = subparsers.add_parser(
+        "lift",
+        help=(
+            "Lift every solution in '<results_dir>/<graph>_kernel/' to a solution "
+            "'<solution>_kernel' in '<results_dir>/<graph>/'"
+        ),
+    )
+    _ = lift_parser.add_argument(
+        "-d",
+        "--data_dir",
+        default="data/graphs/",
+        help=(
+            "Directory whose subdirectories contain the graphs (default: data/graphs/)"
+        ),
+    )
+    _ = lift_parser.add_argument(
+        "-r",
+        "--results_dir",
+        default="results/cvc_and_vc_vs_local_ratio_vc/",
+        help=(
+            "Directory containing results for one experiment, one subdirectory per "
+            "graph (default: results/cvc_and_vc_vs_local_ratio_vc/)"
+        ),
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "lift":
+        for path in lift_results(args.data_dir, args.results_dir):
+            print(path)
+        return
+
+    if not args.path:
+        args.path = input()
+
+    if args.all:
+        for_graphs_in_root(args.path, compression=args.compression)
+    else:
+        for_graph(args.path, compression=args.compression)
+
+
+def for_graphs_in_root(
+    rootdir: pathlib.Path | os.PathLike[typing.Any] | str = "./data/graphs/",
+    compression: edge_files.Compression | None = None,
+) -> None:
+    if not os.fspath(rootdir):
+        raise ValueError("Cannot specify an empty path or string for path")
+    else:
+        rootdir = pathlib.Path(rootdir)
+
+    for dir in sorted(rootdir.iterdir()):
+        if edge_files.find(dir) is None:
+            continue
+
+        for_graph(dir, compression)
+
+
+def for_graph(
+    dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    compression: edge_files.Compression | None = None,
+) -> None:
+    r"""Adds the kernel of the graph in ``dir`` (see :func:`kernelize`) to the
+    dataset as ``<dir>_kernel``, with its edge list, its properties, a
+    ``node_mapping.txt`` file that maps its labels to those of the graph, as for the
+    LCCs, and its reduction log (see :func:`write_log`).
+
+    The properties include ``kernel_offset``, the number of nodes that the
+    reductions put in the cover, which is the difference between the sizes of the
+    minimum covers of the graph and of the kernel.  A graph that is reduced
+    completely has no kernel to add.
+    """
+
+    if not os.fspath(dir):
+        raise ValueError("Cannot specify an empty path or string for dir")
+    else:
+        dir = pathlib.Path(dir)
+
+    print(f"{dir} => ", end="")
+
+    # kernels are not reduced any further
+    kernel_dir = dir.parent / f"{dir.name}_kernel"
+    if kernel_dir.exists() or dir.name.endswith("_kernel"):
+        print("skipped")
+        return
+
+    edges_path = edge_files.find(dir)
+    if edges_path is None:
+        raise FileNotFoundError(f"No edge list in '{dir}'")
+    edges = read_graph.read_edge_arrays(edges_path)
+    if edges.labels is not None:
+        raise ValueError(f"Non-integer node labels in '{edges_path}'")
+
+    g = read_graph.to_csr(edges)
+    del edges
+    kernel = kernelize(g)
+    log = kernel.log
+    offset = log.cover.size + len(log.folds)
+    if log.kernel_nodes.size == 0:
+        print(f"skipped (solved: the minimum cover has {offset} nodes)")
+        return
+
+    # number the nodes of the kernel in ascending order of their labels
+    new_label = np.full(g.order(), -1, dtype=np.int64)
+    new_label[log.kernel_nodes] = np.arange(log.kernel_nodes.size)
+    sources, targets = new_label[kernel.sources], new_label[kernel.targets]
+    props = graph_properties.compute_from_edges(
+        sources, targets, num_nodes=log.kernel_nodes.size
+    )
+    props["kernel_offset"] = offset
+
+    kernel_dir.mkdir()
+    write_graph.to_edge_list_file(
+        edge_files.path_for(kernel_dir, compression), sources, targets
+    )
+    graph_properties.write_properties(kernel_dir, props)
+    write_graph.to_node_mapping_file(
+        kernel_dir / "node_mapping.txt",
+        np.arange(log.kernel_nodes.size),
+        log.labels[log.kernel_nodes],
+    )
+    write_log(kernel_dir / LOG_FILENAME, log)
+
+    print(kernel_dir)
+
+
+def kernelize(g: CSRGraph) -> Kernel:
+    r"""Reduces a graph to a kernel for the vertex cover problem.
+
+    The reductions are applied in rounds, each of a single kind, with the cheapest
+    kind that applies at all:
+
+    1. Dominance: a node ``v`` with a neighbor ``u`` such that ``N[u]`` is a subset
+       of ``N[v]`` is in some minimum cover, so it is taken into the cover.  This
+       includes the degree-1 rule (a leaf is dominated by its neighbor) and the
+       degree-2 rule for triangles.  Only the nodes ``u`` of degree at most
+       :data:`_DOMINANCE_MAX_DEGREE` are checked.
+    2. Degree-2 folding: a node ``v`` with two non-adjacent neighbors ``u`` and
+       ``w`` is merged with them into a single node, which stands for ``u`` and
+       ``w`` if it is in the cover and for ``v`` otherwise, and which keeps the
+       label of ``v``.
+    3. The crown reduction of Nemhauser and Trotter: the nodes with value 1 in a
+       half-integral optimal solution of the linear-programming relaxation (see
+       :func:`vc_bounds.half_integral_lp`) are in some minimum cover, and those
+       with value 0 are in none.
+
+    The reductions of a round are chosen to be independent, by random priorities,
+    so that applying them together is the same as applying them one by one.  After
+    the first round, only the nodes whose neighborhoods changed (and the dominated
+    nodes left over) are checked for dominance, so that peeling a graph layer by
+    layer takes time proportional to the layers rather than to the whole graph in
+    each round.  A node with a self-loop is in every cover and is taken first, and
+    the nodes left without edges are dropped.
+
+    :return: The edges of the kernel, between nodes of ``g``, and the reduction
+        log
+    """
+
+    n = g.order()
+    keys = np.random.default_rng(_SEED).permutation(n)
+    loops = g._rows()[g._selfloop_entries()]
+    graph = _ShrinkingGraph(*g.without_selfloops().edges(), n)
+
+    covers: list[npt.NDArray[np.int64]] = [loops]
+    folds: list[npt.NDArray[np.int64]] = []
+    candidates = np.union1d(graph.remove(loops), np.flatnonzero(graph.degrees))
+    num_rounds = 0
+
+    while True:
+        num_rounds += 1
+
+        taken, dominated = _dominating(graph, candidates, keys)
+        if taken.size:
+            covers.append(taken)
+            changed = graph.remove(taken)
+            candidates = np.union1d(changed, dominated[graph.alive[dominated]])
+            continue
+
+        group = _foldable(graph, keys)
+        if group.size:
+            folds.append(group)
+            candidates = graph.fold(group)
+            continue
+
+        taken = np.flatnonzero(
+            vc_bounds.half_integral_lp(CSRGraph.from_edges(*graph.edges(), n)) == 2
+        )
+        if not taken.size:
+            break
+        covers.append(taken)
+        candidates = graph.remove(taken)
+
+    logger.info(f"Reduced the graph in {num_rounds} rounds")
+
+    sources, targets = graph.edges()
+    kernel_nodes = np.unique(np.concatenate((sources, targets)))
+    fold_rounds = np.cumsum([0, *(len(group) for group in folds)])
+    log = ReductionLog(
+        labels=np.arange(n) if g.labels is None else np.asarray(g.labels, np.int64),
+        kernel_nodes=kernel_nodes,
+        cover=np.concatenate(covers),
+        folds=np.concatenate(folds) if folds else np.empty((0, 3), dtype=np.int64),
+        fold_rounds=fold_rounds.astype(np.int64),
+    )
+    return Kernel(sources, targets, log)
+
+
+def lift(log: ReductionLog, kernel_cover: npt.ArrayLike) -> npt.NDArray[np.bool_]:
+    r"""Lifts a vertex cover of a kernel to one of the graph it was reduced from.
+
+    The nodes taken into the cover by the reductions are added, and the folds are
+    undone in the reverse order, a round at a time.  If the cover of the kernel is a
+    minimum one, so is the lifted cover.
+
+    :param kernel_cover: The labels of the nodes of the kernel in its cover
+    :return: Whether each node of the graph is in the cover
+    """
+
+    cover = np.zeros(log.labels.size, dtype=np.bool_)
+    cover[log.kernel_nodes[np.asarray(kernel_cover, dtype=np.int64)]] = True
+    cover[log.cover] = True
+
+    for start, stop in reversed(
+        list(zip(log.fold_rounds[:-1], log.fold_rounds[1:], strict=True))
+    ):
+        v, u, w = log.folds[start:stop].T
+        merged = cover[v]
+        cover[u] = merged
+        cover[w] = merged
+        cover[v] = ~merged
+
+    return cover
+
+
+def write_log(
+    path: pathlib.Path | os.PathLike[typing.Any] | str, log: ReductionLog
+) -> None:
+    r"""Writes a reduction log to a compressed NumPy archive with an array per field
+    of :class:`ReductionLog`."""
+
+    with open(path, "wb") as f:
+        np.savez_compressed(f, **log._asdict())
+
+
+def read_log(path: pathlib.Path | os.PathLike[typing.Any] | str) -> ReductionLog:
+    r"""Reads a reduction log written by :func:`write_log`."""
+
+    with np.load(path) as data:
+        return ReductionLog(*(data[field] for field in ReductionLog._fields))
+
+
+def lift_results(
+    data_dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    results_dir: pathlib.Path | os.PathLike[typing.Any] | str,
+) -> list[pathlib.Path]:
+    r"""Lifts each solution ``<solution>_nodes.txt`` of a kernel in
+    ``<results_dir>/<graph>_kernel/`` to a solution named ``<solution>_kernel`` of
+    the graph, saved in ``<results_dir>/<graph>/`` with its cardinality, like the
+    solutions of the solvers.
+
+    :return: The paths of the lifted solutions
+    """
+
+    if not os.fspath(data_dir):
+        raise ValueError("Cannot specify an empty path or string for data_dir")
+    else:
+        data_dir = pathlib.Path(data_dir)
+
+    if not os.fspath(results_dir):
+        raise ValueError("Cannot specify an empty path or string for results_dir")
+    else:
+        results_dir = pathlib.Path(results_dir)
+
+    lifted: list[pathlib.Path] = []
+
+    for kernel_res_dir in sorted(results_dir.glob("*_kernel")):
+        log_path = data_dir / kernel_res_dir.name / LOG_FILENAME
+        if not log_path.is_file():
+            logger.warning(f"Skipping '{kernel_res_dir.name}', which has no log")
+            continue
+
+        log = read_log(log_path)
+        res_dir = results_dir / kernel_res_dir.name.removesuffix("_kernel")
+        res_dir.mkdir(exist_ok=True)
+
+        for nodes_path in sorted(kernel_res_dir.glob("*_nodes.txt")):
+            solution = nodes_path.name.removesuffix("_nodes.txt")
+            with open(nodes_path, "rb") as f:
+                kernel_cover = np.array(f.read().split(), dtype=np.int64)
+            cover = lift(log, kernel_cover)
+
+            lifted_path = res_dir / f"{solution}_kernel_nodes.txt"
+            _write_solution(lifted_path, log.labels[cover])
+            lifted.append(lifted_path)
+
+    return lifted
+
+
+def _write_solution(nodes_path: pathlib.Path, labels: npt.NDArray[np.int64]) -> None:
+    r"""Writes the nodes of a solution (one node per line) and its cardinality, as
+    :mod:`run_experiments` does, replacing the files atomically."""
+
+    files: abc.Mapping[pathlib.Path, str] = {
+        nodes_path: "".join(f"{label}\n" for label in labels.tolist()),
+        nodes_path.with_name(
+            nodes_path.name.replace("_nodes.txt", "_cardinality.txt")
+        ): str(labels.size),
+    }
+    for path, text in files.items():
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        _ = tmp_path.write_text(text)
+        os.replace(tmp_path, path)
+
+
+class _ShrinkingGraph:
+    r"""A graph whose nodes are removed by marking them, with the degrees kept up to
+    date, on top of an adjacency that is only rebuilt when nodes are merged or when
+    most of its entries are of removed nodes."""
+
+    def __init__(
+        self, sources: npt.NDArray[np.int64], targets: npt.NDArray[np.int64], n: int
+    ):
+        self.alive = np.ones(n, dtype=np.bool_)
+        self._rebuild(sources, targets)
+
+    def edges(self) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        sources, targets = self._h.edges()
+        keep = self.alive[sources] & self.alive[targets]
+        return sources[keep], targets[keep]
+
+    def neighbors(
+        self, nodes: npt.NDArray[np.int64]
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        r"""Returns the remaining neighbors of each of ``nodes``, concatenated, and
+        the position in ``nodes`` of the node each is a neighbor of."""
+
+        lengths = self._h.indptr[nodes + 1] - self._h.indptr[nodes]
+        owners = np.repeat(np.arange(nodes.size), lengths)
+        neighbors = graph_properties._neighbors_of(self._h, nodes)
+        keep = self.alive[neighbors]
+        return owners[keep], neighbors[keep]
+
+    def adjacent(
+        self, us: npt.NDArray[np.int64], vs: npt.NDArray[np.int64]
+    ) -> npt.NDArray[np.bool_]:
+        r"""Returns whether each ``(u, v)`` pair of remaining nodes is an edge, by a
+        binary search in the adjacency, whose indices are sorted within each
+        row."""
+
+        n = self.alive.size
+        pair_keys = us * n + vs
+        pos = np.searchsorted(self._entry_keys, pair_keys)
+        found = pos < self._entry_keys.size
+        found[found] = self._entry_keys[pos[found]] == pair_keys[found]
+        return found
+
+    def remove(self, nodes: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+        r"""Removes nodes with their edges.
+
+        :return: The remaining nodes that lost a neighbor
+        """
+
+        self.alive[nodes] = False
+        _, neighbors = self.neighbors(nodes)
+        np.subtract.at(self.degrees, neighbors, 1)
+        self.degrees[nodes] = 0
+
+        self._removed_entries += 2 * neighbors.size
+        if 2 * self._removed_entries > self._h.indices.size:
+            self._rebuild(*self.edges())
+
+        return np.unique(neighbors)
+
+    def fold(self, group: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+        r"""Merges the ``(v, u, w)`` nodes of each row of ``group`` into ``v``.
+
+        :return: The merged nodes and their neighbors, whose neighborhoods changed
+        """
+
+        merged = np.arange(self.alive.size)
+        merged[group[:, 1]] = group[:, 0]
+        merged[group[:, 2]] = group[:, 0]
+        sources, targets = self.edges()
+        sources, targets = merged[sources], merged[targets]
+        keep = sources != targets
+
+        self.alive[group[:, 1:]] = False
+        self._rebuild(sources[keep], targets[keep])
+        _, neighbors = self.neighbors(group[:, 0])
+        return np.union1d(group[:, 0], neighbors)
+
+    def _rebuild(
+        self, sources: npt.NDArray[np.int64], targets: npt.NDArray[np.int64]
+    ) -> None:
+        n = self.alive.size
+        self._h = CSRGraph.from_edges(sources, targets, num_nodes=n)
+        self._entry_keys = self._h._rows() * n + self._h.indices
+        self._removed_entries = 0
+        self.degrees = self._h.degree()
+
+
+def _dominating(
+    graph: _ShrinkingGraph,
+    candidates: npt.NDArray[np.int64],
+    keys: npt.NDArray[np.int64],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    r"""Finds nodes that dominate a neighbor and can all be taken into the cover
+    together.
+
+    A candidate ``u`` of degree at most :data:`_DOMINANCE_MAX_DEGREE` is dominated
+    by a neighbor ``v`` if ``v`` is adjacent to every other neighbor of ``u``, which
+    is checked by looking the pairs up in the adjacency.  Taking the dominating
+    nodes one by one stays valid as long as none of them is a dominated node whose
+    own dominator is taken too.
+
+    :return: The dominating nodes to take, and all dominated candidates
+    """
+
+    n = keys.size
+    degrees = graph.degrees[candidates]
+    us = candidates[(degrees > 0) & (degrees <= _DOMINANCE_MAX_DEGREE)]
+    owners, vs = graph.neighbors(us)
+    us = us[owners]
+
+    # the other neighbors of u, for each pair (u, v)
+    pair, others = graph.neighbors(us)
+    is_other = others != vs[pair]
+    pair, others = pair[is_other], others[is_other]
+
+    found = graph.adjacent(vs[pair], others)
+    hits = np.bincount(pair[found], minlength=us.size)
+    dominated = hits == graph.degrees[us] - 1
+    us, vs = us[dominated], vs[dominated]
+    if us.size == 0:
+        return us, us
+
+    # each dominated node picks one dominator, preferably one that is not
+    # dominated itself, as that never conflicts with another pick
+    dominated_nodes = np.unique(us)
+    rank = np.where(_contains(dominated_nodes, vs), keys[vs], n + keys[vs])
+    order = np.lexsort((rank, us))
+    last = np.append(us[order][1:] != us[order][:-1], True)
+    dominator = vs[order][last]
+
+    # a pick conflicts with one whose dominator is its dominated node, so a pick is
+    # used if its priority is lower than those of the picks it conflicts with
+    conflicts = np.flatnonzero(_contains(dominated_nodes, dominator))
+    lowest = np.full(dominated_nodes.size, n, dtype=np.int64)
+    np.minimum.at(
+        lowest,
+        np.searchsorted(dominated_nodes, dominator[conflicts]),
+        keys[dominated_nodes[conflicts]],
+    )
+    lowest[conflicts] = np.minimum(lowest[conflicts], keys[dominator[conflicts]])
+    used = keys[dominated_nodes] < lowest
+    return np.unique(dominator[used]), dominated_nodes
+
+
+def _foldable(
+    graph: _ShrinkingGraph, keys: npt.NDArray[np.int64]
+) -> npt.NDArray[np.int64]:
+    r"""Finds disjoint degree-2 folds.
+
+    Each node ``v`` of degree 2 with non-adjacent neighbors ``u`` and ``w`` can be
+    folded, and the folds of lowest priority at each of the nodes they involve are
+    disjoint.
+
+    :return: The ``(v, u, w)`` nodes of each fold, one fold per row
+    """
+
+    n = keys.size
+    vs = np.flatnonzero(graph.degrees == 2)
+    _, neighbors = graph.neighbors(vs)
+    us, ws = neighbors[0::2], neighbors[1::2]
+    keep = ~graph.adjacent(us, ws)
+    group = np.stack((vs[keep], us[keep], ws[keep]), axis=1)
+
+    lowest = np.full(n, n, dtype=np.int64)
+    np.minimum.at(lowest, group.ravel(), np.repeat(keys[group[:, 0]], 3))
+    chosen = (lowest[group] == keys[group[:, :1]]).all(axis=1)
+    return group[chosen]
+
+
+def _contains(
+    sorted_values: npt.NDArray[np.int64], values: npt.NDArray[np.int64]
+) -> npt.NDArray[np.bool_]:
+    pos = np.searchsorted(sorted_values, values)
+    found = pos < sorted_values.size
+    found[found] = sorted_values[pos[found]] == values[found]
+    return found
+
+
+if __name__ == "__main__":
+    main()
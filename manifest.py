@@ -0,0 +1,322 @@
+import concurrent.futures
+import hashlib
+import importlib.metadata
+import json
+import os
+import pathlib
+import threading
+import time
+import typing
+from collections import abc
+
+import utils
+
+__all__ = [
+    "MANIFEST_NAME",
+    "Hasher",
+    "Manifest",
+    "Record",
+    "tool_version",
+]
+
+logger = utils.configure_logger(__name__)
+
+# name of the manifest file in each directory of derived artifacts
+MANIFEST_NAME = "manifest.json"
+
+# bump whenever the layout of the manifest changes to invalidate old manifests
+_FORMAT_VERSION = 1
+
+# number of bytes hashed at once
+_CHUNK_SIZE = 1 << 20
+
+
+class Record(typing.NamedTuple):
+    r"""How an artifact was derived: the SHA-256 digests of the files it was derived
+    from and of the files it consists of, by their paths relative to the manifest's
+    directory, and the versions of the tools that derived it, along with any values
+    noted about the artifact that rebuilding it needs once its inputs have
+    changed."""
+
+    inputs: dict[str, str]
+    outputs: dict[str, str]
+    tool: dict[str, str]
+    notes: dict[str, int]
+
+
+class Hasher:
+    r"""Computes the SHA-256 digests of files in a pool of threads, streaming each
+    file in chunks, and remembers them by the size and modification time of the file
+    so that unchanged files are not hashed again."""
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers
+        # size, modification time and digest by resolved path
+        self._known: dict[pathlib.Path, tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def remember(self, path: pathlib.Path, size: int, mtime_ns: int, digest: str):
+        r"""Records a digest computed earlier, which is used as long as the size and
+        modification time of the file are unchanged."""
+
+        with self._lock:
+            self._known[path.resolve()] = (size, mtime_ns, digest)
+
+    def stat(self, path: pathlib.Path) -> tuple[int, int, str] | None:
+        r"""Returns the size, modification time and digest of a file that was hashed
+        or remembered and has not changed since, or None."""
+
+        with self._lock:
+            known = self._known.get(path.resolve())
+        if known is None:
+            return None
+
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if (stat.st_size, stat.st_mtime_ns) != known[:2]:
+            return None
+        return known
+
+    def digests(
+        self, paths: abc.Iterable[pathlib.Path]
+    ) -> dict[pathlib.Path, str | None]:
+        r"""Returns the digest of each file, hashing in parallel those that were not
+        hashed before or have changed since.
+
+        :return: The digest of each file by its path, or None for a missing file
+        """
+
+        paths = list(dict.fromkeys(paths))
+        result: dict[pathlib.Path, str | None] = {}
+        todo: list[pathlib.Path] = []
+
+        for path in paths:
+            if (known := self.stat(path)) is not None:
+                result[path] = known[2]
+            else:
+                todo.append(path)
+
+        if todo:
+            logger.info(f"Hashing {len(todo)} files")
+            with concurrent.futures.ThreadPoolExecutor(self.max_workers) as executor:
+                for path, digest in zip(
+                    todo, executor.map(self._hash, todo), strict=True
+                ):
+                    result[path] = digest
+
+        return {path: result[path] for path in paths}
+
+    def _hash(self, path: pathlib.Path) -> str | None:
+        digest = hashlib.sha256()
+        try:
+            # compare the modification time before and after, so that a file that
+            # is modified while it is hashed is not remembered with the wrong digest
+            stat = path.stat()
+            with open(path, "rb") as f:
+                while chunk := f.read(_CHUNK_SIZE):
+                    digest.update(chunk)
+            after = path.stat()
+        except FileNotFoundError:
+            return None
+
+        hexdigest = digest.hexdigest()
+        if (stat.st_size, stat.st_mtime_ns) == (after.st_size, after.st_mtime_ns):
+            self.remember(path, stat.st_size, stat.st_mtime_ns, hexdigest)
+        return hexdigest
+
+
+class Manifest:
+    r"""The records of the artifacts in a directory, stored in its
+    :data:`MANIFEST_NAME` file along with the sizes, modification times and digests
+    of the files they refer to."""
+
+    def __init__(self, dir: pathlib.Path, hasher: Hasher):
+        self.dir = dir
+        self.path = dir / MANIFEST_NAME
+        self.hasher = hasher
+        self.records: dict[str, Record] = {}
+
+    @classmethod
+    def load(
+        cls, dir: pathlib.Path | os.PathLike[typing.Any] | str, hasher: Hasher
+    ) -> "Manifest":
+        r"""Reads the manifest of a directory, which is empty if the directory has
+        no manifest or it cannot be read, and lets ``hasher`` reuse the digests it
+        records."""
+
+        if not os.fspath(dir):
+            raise ValueError("Cannot specify an empty path or string for dir")
+
+        manifest = cls(pathlib.Path(dir), hasher)
+
+        try:
+            with open(manifest.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return manifest
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring the unreadable manifest '{manifest.path}': {e}")
+            return manifest
+
+        if data.get("version") != _FORMAT_VERSION:
+            logger.info(f"Ignoring the manifest '{manifest.path}' of an old version")
+            return manifest
+
+        for name, entry in data["files"].items():
+            hasher.remember(
+                manifest.dir / name, entry["size"], entry["mtime_ns"], entry["sha256"]
+            )
+        for name, record in data["artifacts"].items():
+            manifest.records[name] = Record(
+                record["inputs"],
+                record["outputs"],
+                record["tool"],
+                record.get("notes", {}),
+            )
+
+        return manifest
+
+    def relative(self, path: pathlib.Path) -> str:
+        r"""Returns the path of a file relative to the manifest's directory, as the
+        records refer to it."""
+
+        return pathlib.Path(os.path.relpath(path, self.dir)).as_posix()
+
+    def check(
+        self,
+        name: str,
+        inputs: abc.Iterable[pathlib.Path],
+        outputs: abc.Iterable[pathlib.Path],
+        tool: abc.Mapping[str, str],
+    ) -> str | None:
+        r"""Checks whether an artifact is up to date: whether it is recorded as
+        derived from the current contents of ``inputs`` by the same versions of the
+        tools, and ``outputs`` still have the contents recorded.
+
+        :return: Why the artifact is stale, or None if it is up to date
+        """
+
+        record = self.records.get(name)
+        if record is None:
+            return "no record"
+
+        inputs = list(inputs)
+        outputs = list(outputs)
+        digests = self.hasher.digests(inputs + outputs)
+
+        for path in outputs:
+            if digests[path] is None:
+                return f"'{self.relative(path)}' is missing"
+            if digests[path] != record.outputs.get(self.relative(path)):
+                return f"'{self.relative(path)}' was modified"
+
+        for path in inputs:
+            if digests[path] is None:
+                return f"input '{self.relative(path)}' is missing"
+            if digests[path] != record.inputs.get(self.relative(path)):
+                return f"input '{self.relative(path)}' changed"
+        if set(record.inputs) != {self.relative(path) for path in inputs}:
+            return "inputs changed"
+
+        for key in tool.keys() | record.tool.keys():
+            if tool.get(key) != record.tool.get(key):
+                return f"{key} changed"
+
+        return None
+
+    def record(
+        self,
+        name: str,
+        inputs: abc.Iterable[pathlib.Path],
+        outputs: abc.Iterable[pathlib.Path],
+        tool: abc.Mapping[str, str],
+        notes: abc.Mapping[str, int] | None = None,
+    ) -> None:
+        r"""Records that an artifact consisting of ``outputs`` was derived from
+        ``inputs`` by the given versions of the tools, along with ``notes`` about it,
+        and saves the manifest.
+
+        :raise FileNotFoundError: If an input or output does not exist
+        """
+
+        inputs = list(inputs)
+        outputs = list(outputs)
+        digests = self.hasher.digests(inputs + outputs)
+        for path in inputs + outputs:
+            if digests[path] is None:
+                raise FileNotFoundError(f"Cannot record missing file '{path}'")
+
+        self.records[name] = Record(
+            {self.relative(path): typing.cast(str, digests[path]) for path in inputs},
+            {self.relative(path): typing.cast(str, digests[path]) for path in outputs},
+            dict(tool),
+            dict(notes or {}),
+        )
+        self.save()
+
+    def save(self) -> None:
+        r"""Writes the manifest atomically."""
+
+        files: dict[str, dict[str, typing.Any]] = {}
+        for record in self.records.values():
+            for name in (*record.inputs, *record.outputs):
+                known = self.hasher.stat(self.dir / name)
+                if known is not None:
+                    size, mtime_ns, digest = known
+                    files[name] = {"size": size, "mtime_ns": mtime_ns, "sha256": digest}
+
+        data = {
+            "version": _FORMAT_VERSION,
+            "files": dict(sorted(files.items())),
+            "artifacts": {
+                name: record._asdict() for name, record in sorted(self.records.items())
+            },
+        }
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        unique = f"{os.getpid()}.{threading.get_ident()}.{time.monotonic_ns()}"
+        tmp_path = self.path.with_name(f".{self.path.name}.{unique}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2)
+            _ = f.write("\n")
+        os.replace(tmp_path, self.path)
+
+
+def tool_version(
+    modules: abc.Iterable[str] = (),
+    packages: abc.Iterable[str] = (),
+    executables: abc.Iterable[pathlib.Path] = (),
+    hasher: Hasher | None = None,
+) -> dict[str, str]:
+    r"""Describes the versions of the tools that derive an artifact, so that the
+    artifact is rebuilt when any of them changes.
+
+    :param modules: Names of the modules of this repository that are involved,
+        identified by the digests of their source files
+    :param packages: Names of the installed distributions that are involved,
+        identified by their versions
+    :param executables: Paths of the programs that are involved, identified by the
+        digests of the files (or ``missing``)
+    :param hasher: Hasher used for the digests of the source files and programs
+    """
+
+    if hasher is None:
+        hasher = Hasher()
+
+    modules = list(modules)
+    here = pathlib.Path(__file__).parent
+    sources = [here / f"{module}.py" for module in modules]
+    executables = list(executables)
+    digests = hasher.digests(sources + executables)
+
+    tool: dict[str, str] = {}
+    for module, path in zip(modules, sources, strict=True):
+        tool[f"module:{module}"] = digests[path] or "missing"
+    for package in packages:
+        tool[f"package:{package}"] = importlib.metadata.version(package)
+    for path in executables:
+        tool[f"executable:{path}"] = digests[path] or "missing"
+
+    return tool
@@ -1,39 +1,353 @@
 #!/usr/bin/env python3
 
 import argparse
+import concurrent.futures
+import os
+import pathlib
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import traceback
+import typing
+from collections import abc
 
 import download
 import extract
 import preprocess_graph
+import properties_index
 import utils
 
+__all__ = ["STAGES", "Outcome", "prepare_all"]
+
 logger = utils.configure_logger(__name__)
 
+# the stages that each graph goes through in order when preparing many graphs
+STAGES = ("download", "extract", "preprocess")
+
+
+class Outcome(typing.NamedTuple):
+    r"""The result of obtaining and preparing one graph of a batch."""
+
+    url: str
+    graph_dir: pathlib.Path | None
+    ok: bool
+    # the stage that failed, or the last stage if none did
+    stage: str
+    message: str
+    # the time spent in each stage that was reached
+    seconds: dict[str, float]
+
+
+class _Item(typing.NamedTuple):
+    r"""A graph on its way through the pipeline."""
+
+    url: str
+    filename: str | None
+    # private directory for the files of the graph until it is installed
+    workdir: pathlib.Path
+    # the time spent in each stage that was completed
+    seconds: dict[str, float]
+    # the output of the last stage that completed
+    path: pathlib.Path | None = None
+    # the directory that the prepared graph is moved to
+    graph_dir: pathlib.Path | None = None
+
 
 def main():
     parser = argparse.ArgumentParser(
         description=(
-            "Download a graph from Network Repository and preprocess it to make it "
+            "Download graphs from Network Repository and preprocess them to make them "
             "ready for the experiments."
         )
     )
     _ = parser.add_argument(
-        "url",
-        help="URL of the ZIP file containing the graph data",
+        "urls",
+        nargs="*",
+        metavar="url",
+        help=(
+            "URL of a ZIP file containing graph data; given more than one, the graphs "
+            "are downloaded, extracted and preprocessed in a pipeline"
+        ),
+    )
+    _ = parser.add_argument(
+        "-m",
+        "--manifest",
+        help=(
+            "Path of a manifest file listing more URLs, in the format read by "
+            "download.py --manifest"
+        ),
+    )
+    _ = parser.add_argument(
+        "-O",
+        "--outdir",
+        help=(
+            "Parent directory of the prepared graphs (default: the 'data/graphs' "
+            "directory in the script's directory)"
+        ),
+    )
+    _ = parser.add_argument(
+        "--download-jobs",
+        type=int,
+        default=4,
+        help="Number of files to download at the same time (default: 4)",
+    )
+    _ = parser.add_argument(
+        "--extract-jobs",
+        type=int,
+        default=2,
+        help="Number of ZIP files to extract at the same time (default: 2)",
+    )
+    _ = parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help=(
+            "Number of worker processes parsing graphs and computing their properties "
+            "(default: the number of CPUs)"
+        ),
+    )
+    _ = parser.add_argument(
+        "--no-cache",
+        action="store_false",
+        dest="cache",
+        help="Do not use the download cache (see download.py --no-cache)",
     )
 
     args = parser.parse_args()
 
-    logger.info(f"Downloading '{args.url}' ...")
-    zip_path = download.download(args.url)
+    entries: list[tuple[str, str | None]] = [(url, None) for url in args.urls]
+    if args.manifest:
+        entries += download.read_manifest(args.manifest)
+    if not entries:
+        parser.error("No URLs given")
+
+    if len(entries) == 1:
+        url, filename = entries[0]
+
+        logger.info(f"Downloading '{url}' ...")
+        zip_path = download.download(url, filename=filename, cache=args.cache)
+
+        # parse the graph as it is decompressed rather than extracting it first
+        logger.info(f"Parsing and preparing the graph in '{zip_path}' ...")
+        graph_dir = preprocess_graph.from_zip(zip_path, out_parent=args.outdir)
+        logger.info(f"Wrote the graph to '{graph_dir}'")
+
+        logger.info("Success!")
+        return
+
+    start = time.perf_counter()
+    outcomes = prepare_all(
+        entries,
+        out_parent=args.outdir,
+        download_jobs=args.download_jobs,
+        extract_jobs=args.extract_jobs,
+        preprocess_jobs=args.jobs,
+        cache=args.cache,
+    )
+    elapsed = time.perf_counter() - start
+
+    failures = [outcome for outcome in outcomes if not outcome.ok]
+    work = ", ".join(
+        f"{stage} {sum(o.seconds.get(stage, 0.0) for o in outcomes):.1f}s"
+        for stage in STAGES
+    )
+    print(
+        f"Done: {len(outcomes) - len(failures)} succeeded, {len(failures)} failed "
+        f"in {elapsed:.1f}s ({work} of work)."
+    )
+    for outcome in failures:
+        print(f"FAILED {outcome.url} at {outcome.stage}: {outcome.message}")
+
+    if failures:
+        raise SystemExit(1)
+
+
+def prepare_all(
+    entries: abc.Iterable[str | tuple[str, str | None]],
+    out_parent: pathlib.Path | os.PathLike[typing.Any] | str | None = None,
+    download_jobs: int = 4,
+    extract_jobs: int = 2,
+    preprocess_jobs: int | None = None,
+    cache: bool = True,
+) -> list[Outcome]:
+    r"""Downloads, extracts and preprocesses many graphs in a pipeline, printing a
+    line of progress as each graph finishes.
+
+    Each of the :data:`STAGES` has its own workers, which take graphs from a bounded
+    queue fed by the previous stage, so that downloading, decompressing and parsing
+    different graphs overlap while the stages that fall behind hold back those
+    ahead of them instead of filling up the disk.  Downloads and extractions run in
+    threads and preprocessing (see :func:`preprocess_graph.in_extracted_dir`) in a
+    pool of worker processes.
+
+    A graph is prepared in a temporary directory and only moved into ``out_parent``,
+    replacing any earlier version, once it is complete.  A failure at any stage is
+    recorded in the graph's outcome and does not stop the others.
+
+    :param entries: URLs of the ZIP files, or pairs of a URL and the filename to save
+        it as (or None to guess it from the URL), as returned by
+        :func:`download.read_manifest`
+    :param out_parent: Parent directory of the prepared graphs, as in
+        :func:`extract.unzip`
+    :param download_jobs: Number of files to download at the same time
+    :param extract_jobs: Number of ZIP files to extract at the same time
+    :param preprocess_jobs: Number of worker processes preprocessing graphs; if None,
+        the number of CPUs
+    :param cache: Whether to use the download cache, as in :func:`download.download`
+    :return: The outcome for each graph, in the order in which they finished
+    """
+
+    pairs = [(e, None) if isinstance(e, str) else e for e in entries]
+    if preprocess_jobs is None:
+        preprocess_jobs = os.cpu_count() or 1
+
+    outcomes: list[Outcome] = []
+    lock = threading.Lock()
+    install_lock = threading.Lock()
+
+    def report(outcome: Outcome) -> None:
+        with lock:
+            outcomes.append(outcome)
+
+            if outcome.ok:
+                status = f"ok => {outcome.graph_dir}"
+            else:
+                status = f"FAILED at {outcome.stage} ({outcome.message})"
+            seconds = ", ".join(f"{s} {t:.1f}s" for s, t in outcome.seconds.items())
+            print(
+                f"[{len(outcomes)}/{len(pairs)}] {outcome.url}: {status} [{seconds}]",
+                flush=True,
+            )
+
+    with (
+        tempfile.TemporaryDirectory() as tmp_name,
+        concurrent.futures.ProcessPoolExecutor(max_workers=preprocess_jobs) as pool,
+    ):
+        tmp = pathlib.Path(tmp_name)
+
+        def download_one(item: _Item) -> _Item:
+            path = download.download(
+                item.url, destdir=item.workdir, filename=item.filename, cache=cache
+            )
+            return item._replace(path=pathlib.Path(path))
+
+        def extract_one(item: _Item) -> _Item:
+            assert item.path is not None
+            graph_dir = extract.extraction_dir(item.path, out_parent)
+            # unzip() deletes the ZIP file, which may be a hard link to a file in the
+            # download cache; unlinking it leaves the cached file in place
+            path = extract.unzip(item.path, out_parent=item.workdir)
+            return item._replace(path=path, graph_dir=graph_dir)
+
+        def preprocess_one(item: _Item) -> _Item:
+            assert item.path is not None and item.graph_dir is not None
+            _ = pool.submit(preprocess_graph.in_extracted_dir, item.path).result()
+            # two URLs may name the same graph
+            with install_lock:
+                _install(item.path, item.graph_dir)
+            return item._replace(path=item.graph_dir)
+
+        funcs = dict(
+            zip(STAGES, (download_one, extract_one, preprocess_one), strict=True)
+        )
+        jobs = dict(
+            zip(STAGES, (download_jobs, extract_jobs, preprocess_jobs), strict=True)
+        )
+
+        # each stage's queue holds as many graphs as the stage has workers, so that
+        # they can start as soon as they are free
+        inboxes = {stage: queue.Queue[_Item | None](jobs[stage]) for stage in STAGES}
+        outboxes = dict(
+            zip(STAGES, [*(inboxes[s] for s in STAGES[1:]), None], strict=True)
+        )
+
+        workers = {
+            stage: [
+                threading.Thread(
+                    target=_work,
+                    args=(stage, funcs[stage], inboxes[stage], outboxes[stage], report),
+                    name=f"{stage}-{i}",
+                    daemon=True,
+                )
+                for i in range(jobs[stage])
+            ]
+            for stage in STAGES
+        }
+        for threads in workers.values():
+            for thread in threads:
+                thread.start()
+
+        for i, (url, filename) in enumerate(pairs):
+            inboxes[STAGES[0]].put(_Item(url, filename, tmp / str(i), {}))
+
+        # shut the stages down in order, each once the one before has drained
+        for stage in STAGES:
+            for _ in workers[stage]:
+                inboxes[stage].put(None)
+            for thread in workers[stage]:
+                thread.join()
+
+    return outcomes
+
+
+def _work(
+    stage: str,
+    func: abc.Callable[[_Item], _Item],
+    inbox: "queue.Queue[_Item | None]",
+    outbox: "queue.Queue[_Item | None] | None",
+    report: abc.Callable[[Outcome], None],
+) -> None:
+    r"""Applies the function of a stage to each graph in ``inbox`` until it receives
+    None, passing the graphs on to ``outbox``, or reporting them as prepared if it is
+    the last stage, or as failed if the function raises."""
+
+    while (item := inbox.get()) is not None:
+        start = time.perf_counter()
+        try:
+            item = func(item)
+        except Exception as e:
+            logger.debug(traceback.format_exc())
+            seconds = {**item.seconds, stage: time.perf_counter() - start}
+            shutil.rmtree(item.workdir, ignore_errors=True)
+            report(
+                Outcome(
+                    item.url, None, False, stage, f"{type(e).__name__}: {e}", seconds
+                )
+            )
+            continue
+
+        item = item._replace(
+            seconds={**item.seconds, stage: time.perf_counter() - start}
+        )
+        if outbox is not None:
+            outbox.put(item)
+        else:
+            shutil.rmtree(item.workdir, ignore_errors=True)
+            report(Outcome(item.url, item.path, True, stage, "", item.seconds))
+
 
-    logger.info(f"Extracting '{zip_path}' ...")
-    extracted_dir = extract.unzip(zip_path)
+def _install(src: pathlib.Path, graph_dir: pathlib.Path) -> None:
+    r"""Moves the prepared graph in ``src`` to ``graph_dir``, replacing the directory
+    that is already there, if any."""
 
-    logger.info(f"Parsing and preparing the graph in '{extracted_dir}' ...")
-    preprocess_graph.in_extracted_dir(extracted_dir)
+    if not graph_dir.exists():
+        _ = shutil.move(src, graph_dir)
+    else:
+        old = graph_dir.with_name(f".{graph_dir.name}.old")
+        shutil.rmtree(old, ignore_errors=True)
+        os.replace(graph_dir, old)
+        try:
+            _ = shutil.move(src, graph_dir)
+        except BaseException:
+            shutil.rmtree(graph_dir, ignore_errors=True)
+            os.replace(old, graph_dir)
+            raise
+        shutil.rmtree(old)
 
-    logger.info("Success!")
+    properties_index.update(graph_dir)
+    logger.info(f"Wrote the graph to '{graph_dir}'")
 
 
 if __name__ == "__main__":
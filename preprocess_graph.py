@@ -5,14 +5,19 @@ import os
 import pathlib
 import shutil
 import typing
+import zipfile
 
 import networkx as nx
+import numpy as np
 
+import edge_files
+import extract
 import graph_properties
 import read_graph
 import utils
+import write_graph
 
-__all__ = ["in_extracted_dir"]
+__all__ = ["from_zip", "in_extracted_dir"]
 
 logger = utils.configure_logger(__name__)
 
@@ -27,9 +32,19 @@ def main():
         "graph_dir",
         nargs="?",
         help=(
-            "Path to the unzipped directory containing the graph data files; if this "
-            "argument is either not provided or provided as an empty string, the path "
-            "will be read from stdin"
+            "Path to the unzipped directory containing the graph data files, or to the "
+            "ZIP file itself, which is then read without extracting it and deleted; if "
+            "this argument is either not provided or provided as an empty string, the "
+            "path will be read from stdin"
+        ),
+    )
+    _ = parser.add_argument(
+        "-c",
+        "--compression",
+        choices=[c for c in edge_files.SUFFIXES if c is not None],
+        help=(
+            "Compress the edge list of the graph: 'gz' or 'xz' for a compressed text "
+            "file, or 'dv' for a delta-encoded binary file (default: plain text)"
         ),
     )
 
@@ -38,11 +53,20 @@ def main():
     if not args.graph_dir:
         args.graph_dir = input()
 
-    in_extracted_dir(args.graph_dir)
+    if zipfile.is_zipfile(args.graph_dir):
+        print(from_zip(args.graph_dir, compression=args.compression))
+    else:
+        in_extracted_dir(args.graph_dir, compression=args.compression)
+
 
+def in_extracted_dir(
+    graph_dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    compression: edge_files.Compression | None = None,
+):
+    """Processes a Network Repository graph to make it ready for the experiments.
 
-def in_extracted_dir(graph_dir: pathlib.Path | os.PathLike[typing.Any] | str):
-    """Processes a Network Repository graph to make it ready for the experiments."""
+    :param compression: Compression of the edge list written (see :mod:`edge_files`)
+    """
 
     logger.info(f"Processing graph data in the directory '{graph_dir}'")
 
@@ -55,7 +79,7 @@ def in_extracted_dir(graph_dir: pathlib.Path | os.PathLike[typing.Any] | str):
         raise ValueError(f"Not a directory: {graph_dir}")
 
     for path in graph_dir.iterdir():
-        if path.is_file() and path.suffix in (".mtx", ".edges"):
+        if path.is_file() and path.suffix in extract.GRAPH_SUFFIXES:
             logger.debug(
                 (
                     f"Taking graph data from the file '{path}' and ignoring other "
@@ -64,33 +88,14 @@ def in_extracted_dir(graph_dir: pathlib.Path | os.PathLike[typing.Any] | str):
             )
 
             try:
-                g = read_graph.from_file(path)
-
-                logger.info("Removing self-loops if they exist.")
-                g.remove_edges_from(nx.selfloop_edges(g))
-
-                logger.info("Relabeling nodes.")
-                g = nx.convert_node_labels_to_integers(g)
-
-                logger.info("Computing graph properties.")
-                props = graph_properties.compute(g)
+                # the directory is about to be emptied, so don't write a cache file
+                g, props = _prepare(read_graph.from_file(path, cache=False))
 
                 # delete everything in the directory
                 logger.info(f"Deleting everything in '{graph_dir}'")
-                for child in graph_dir.iterdir():
-                    if child.is_dir():
-                        shutil.rmtree(child)
-                    else:
-                        child.unlink()
-
-                # write the graph's edge list representation and properties to the dir
-                with open(graph_dir / "graph.edges", "wb") as f:
-                    logger.info(f"Writing '{f.name}'")
-                    nx.write_edgelist(g, f, data=False)
-                with open(graph_dir / "properties.yaml", "w") as f:
-                    logger.info(f"Writing '{f.name}'")
-                    for key, val in props.items():
-                        _ = f.write(f"{key}: {graph_properties.format_value(val)}\n")
+                _empty(graph_dir)
+
+                _write(graph_dir, g, props, compression)
                 return
 
             except ValueError as e:
@@ -109,5 +114,114 @@ def in_extracted_dir(graph_dir: pathlib.Path | os.PathLike[typing.Any] | str):
     raise ValueError(f"No graph data files found in '{graph_dir}'")
 
 
+def from_zip(
+    zip_filepath: pathlib.Path | os.PathLike[typing.Any] | str,
+    out_parent: pathlib.Path | os.PathLike[typing.Any] | str | None = None,
+    keep: bool = False,
+    compression: edge_files.Compression | None = None,
+) -> pathlib.Path:
+    """Processes a Network Repository graph straight from its ZIP file, the same as
+    :func:`extract.unzip` followed by :func:`in_extracted_dir`, but parsing the graph
+    as it is decompressed so that only the processed graph is written to disk.
+
+    :param zip_filepath: The path to the ZIP file
+    :param out_parent: Parent of the directory in which to write the graph, as in
+        :func:`extract.unzip`; anything already in that directory is deleted
+    :param keep: Whether to keep the ZIP file afterwards
+    :param compression: Compression of the edge list written (see :mod:`edge_files`)
+    :return: The path to the directory of the graph
+    """
+
+    if not os.fspath(zip_filepath):
+        raise ValueError("Path must not be empty")
+
+    zip_filepath = pathlib.Path(zip_filepath)
+    graph_dir = extract.extraction_dir(zip_filepath, out_parent)
+
+    logger.info(f"Processing graph data in the ZIP file '{zip_filepath}'")
+
+    with zipfile.ZipFile(zip_filepath) as zip_file:
+        member = extract.graph_member(zip_file)
+        logger.debug(
+            f"Taking graph data from '{member.filename}' and ignoring other files in "
+            f"'{zip_filepath}'"
+        )
+
+        source = f"'{member.filename}' in '{zip_filepath}'"
+        try:
+            with zip_file.open(member) as f:
+                g, props = _prepare(read_graph.from_file(f))
+        except ValueError as e:
+            raise ValueError(
+                f"Error reading and processing graph from {source}: {e}"
+            ) from e
+        except RuntimeError as e:
+            raise RuntimeError(
+                f"Error reading and processing graph from {source}: {e}"
+            ) from e
+        except Exception as e:
+            raise Exception(
+                f"Error reading and processing graph from {source}: {e}"
+            ) from e
+
+    if graph_dir.exists():
+        logger.info(f"Deleting everything in '{graph_dir}'")
+        _empty(graph_dir)
+    else:
+        graph_dir.mkdir()
+
+    _write(graph_dir, g, props, compression)
+
+    if not keep:
+        logger.info(f"Deleting '{zip_filepath}'")
+        zip_filepath.unlink()
+
+    return graph_dir
+
+
+def _prepare(g: nx.Graph) -> tuple[nx.Graph, dict[str, int | float | bool]]:
+    logger.info("Removing self-loops if they exist.")
+    g.remove_edges_from(nx.selfloop_edges(g))
+
+    logger.info("Relabeling nodes.")
+    g = nx.convert_node_labels_to_integers(g)
+
+    logger.info("Computing graph properties.")
+    props = graph_properties.compute(g)
+
+    return g, props
+
+
+def _empty(dir: pathlib.Path) -> None:
+    for child in dir.iterdir():
+        if child.is_dir():
+            shutil.rmtree(child)
+        else:
+            child.unlink()
+
+
+def _write(
+    graph_dir: pathlib.Path,
+    g: nx.Graph,
+    props: dict[str, int | float | bool],
+    compression: edge_files.Compression | None = None,
+) -> None:
+    # write the graph's edge list representation and properties to the dir
+    edges_path = edge_files.path_for(graph_dir, compression)
+    logger.info(f"Writing '{edges_path}'")
+    if compression == "dv":
+        # the nodes have been relabeled with integers
+        endpoints = np.fromiter(
+            (v for edge in g.edges() for v in edge),
+            dtype=np.int64,
+            count=2 * g.number_of_edges(),
+        )
+        write_graph.to_edge_list_file(edges_path, endpoints[0::2], endpoints[1::2])
+    else:
+        with edge_files.open_edges(edges_path, "wb") as f:
+            nx.write_edgelist(g, f, data=False)
+    graph_properties.write_properties(graph_dir, props)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import os
+import pathlib
+import re
+import sqlite3
+import typing
+from collections import abc
+
+import yaml
+
+import utils
+
+__all__ = [
+    "INDEX_NAME",
+    "index_path",
+    "parse_filter",
+    "query",
+    "rebuild",
+    "sync",
+    "update",
+]
+
+logger = utils.configure_logger(__name__)
+
+# name of the index file in the parent directory of the graphs
+INDEX_NAME = "properties.sqlite"
+
+# the C implementation of the YAML loader is much faster, but is only available if
+# PyYAML was built against LibYAML
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# seconds to wait for another process that is updating the index
+_TIMEOUT = 60
+
+# declared SQL types of the columns by the Python type of the property
+_SQL_TYPES: dict[type, str] = {bool: "BOOLEAN", int: "INTEGER", float: "REAL"}
+
+_FILTER = re.compile(
+    r"\s*(?:(?P<negated>not\s+|!)\s*)?(?P<column>\w+)\s*"
+    r"(?:(?P<op>==|=|!=|<=|>=|<|>)\s*(?P<value>\S+)\s*)?"
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Bring the index of the properties of the graphs in the data directory up "
+            "to date with their 'properties.yaml' files, and print the number of "
+            "graphs indexed."
+        )
+    )
+    _ = parser.add_argument(
+        "data_dir",
+        nargs="?",
+        default="data/graphs/",
+        help=(
+            "Directory whose subdirectories contain the graphs (default: data/graphs/)"
+        ),
+    )
+    _ = parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Rebuild the index from scratch (default: update only what changed)",
+    )
+
+    args = parser.parse_args()
+
+    print(rebuild(args.data_dir) if args.rebuild else sync(args.data_dir))
+
+
+def index_path(
+    data_dir: pathlib.Path | os.PathLike[typing.Any] | str,
+) -> pathlib.Path:
+    r"""Returns the path of the index of the properties of the graphs in
+    ``data_dir``."""
+
+    if not os.fspath(data_dir):
+        raise ValueError("Cannot specify an empty path or string for data_dir")
+
+    return pathlib.Path(data_dir) / INDEX_NAME
+
+
+def update(
+    graph_dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    props: abc.Mapping[str, int | float | bool | str] | None = None,
+) -> None:
+    r"""Updates the entry of a graph in the index in its parent directory after its
+    ``properties.yaml`` has been written.
+
+    A failure to update the index is only logged, as :func:`sync` catches up with
+    the file later.
+
+    :param graph_dir: Directory of the graph
+    :param props: The properties written, or None to read them from the file
+    """
+
+    if not os.fspath(graph_dir):
+        raise ValueError("Cannot specify an empty path or string for graph_dir")
+    else:
+        graph_dir = pathlib.Path(graph_dir)
+
+    try:
+        with _connect(graph_dir.parent) as conn:
+            _index(conn, graph_dir, props)
+    except sqlite3.Error as e:
+        # the index is brought up to date from the file the next time it is read
+        logger.warning(f"Could not update the index for '{graph_dir}': {e}")
+
+
+def sync(data_dir: pathlib.Path | os.PathLike[typing.Any] | str) -> int:
+    r"""Brings the index up to date with the ``properties.yaml`` files in the
+    subdirectories of ``data_dir``.
+
+    Only the files whose size or modification time differ from those recorded in the
+    index are read, and the entries of graphs that no longer have a
+    ``properties.yaml`` file are removed.
+
+    :return: The number of graphs in the index
+    """
+
+    data_dir = index_path(data_dir).parent
+
+    with _connect(data_dir) as conn:
+        indexed = {
+            name: (size, mtime_ns)
+            for name, size, mtime_ns in conn.execute(
+                "SELECT name, file_size, file_mtime_ns FROM graphs"
+            )
+        }
+
+        found: set[str] = set()
+        for path in data_dir.glob("*/properties.yaml"):
+            found.add(path.parent.name)
+            stat = path.stat()
+            if indexed.get(path.parent.name) != (stat.st_size, stat.st_mtime_ns):
+                logger.info(f"Indexing '{path}'")
+                _index(conn, path.parent)
+
+        for name in indexed.keys() - found:
+            logger.info(f"Removing '{name}' from the index")
+            _ = conn.execute("DELETE FROM graphs WHERE name = ?", (name,))
+
+    return len(found)
+
+
+def rebuild(data_dir: pathlib.Path | os.PathLike[typing.Any] | str) -> int:
+    r"""Rebuilds the index from the ``properties.yaml`` files in the subdirectories
+    of ``data_dir``.
+
+    :return: The number of graphs in the index
+    """
+
+    path = index_path(data_dir)
+    path.unlink(missing_ok=True)
+    return sync(path.parent)
+
+
+def parse_filter(spec: str) -> tuple[str, str, list[typing.Any]]:
+    r"""Translates a filter on the properties into an SQL condition.
+
+    A filter is either the name of a property, e.g., ``connected``, which selects the
+    graphs for which it is true (or nonzero), optionally preceded by ``not`` or
+    ``!``, or a comparison of a property with a value, e.g., ``order > 10000``,
+    using one of ``=``, ``==``, ``!=``, ``<``, ``<=``, ``>`` or ``>=``.  The values
+    ``yes``, ``no``, ``true`` and ``false`` stand for booleans.
+
+    :return: The name of the property, and the condition and its parameters
+    """
+
+    match = _FILTER.fullmatch(spec)
+    if match is None or (match["negated"] and match["op"]):
+        raise ValueError(f"Malformed filter: '{spec}'")
+
+    name = match["column"]
+    column = _quote(name)
+    if match["op"] is None:
+        return name, (f"NOT {column}" if match["negated"] else column), []
+
+    op = "=" if match["op"] == "==" else match["op"]
+    return name, f"{column} {op} ?", [_parse_value(match["value"])]
+
+
+def query(
+    data_dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    filters: abc.Iterable[str] = (),
+    sort: abc.Iterable[str] = (),
+    columns: abc.Iterable[str] | None = None,
+) -> dict[str, list[typing.Any]]:
+    r"""Reads the properties of the graphs in ``data_dir`` from the index, after
+    bringing it up to date (see :func:`sync`).
+
+    :param filters: Filters that the graphs must all pass (see :func:`parse_filter`)
+    :param sort: Properties to sort the graphs by, each preceded by ``-`` to sort in
+        descending order; the graphs are sorted by name last
+    :param columns: Properties to read, after the name of the graph; if None, all
+        of them
+    :return: The name and the properties of each graph, by column; a property that a
+        graph does not have is None, and booleans are returned as :class:`bool`
+    """
+
+    data_dir = index_path(data_dir).parent
+    _ = sync(data_dir)
+
+    with _connect(data_dir) as conn:
+        types = _property_types(conn)
+
+        def check(column: str) -> str:
+            # an unknown quoted name would be taken for a string literal
+            if column != "name" and column not in types:
+                raise ValueError(f"Unknown property: {column}")
+            return column
+
+        conditions: list[str] = []
+        params: list[typing.Any] = []
+        for spec in filters:
+            column, condition, values = parse_filter(spec)
+            _ = check(column)
+            conditions.append(condition)
+            params += values
+
+        order_by: list[str] = []
+        for key in sort:
+            column = check(key.lstrip("+-"))
+            order_by.append(_quote(column) + (" DESC" if key.startswith("-") else ""))
+        order_by.append("name")
+
+        columns = list(types) if columns is None else list(map(check, columns))
+
+        sql = "SELECT " + ", ".join(["name", *map(_quote, columns)]) + " FROM graphs"
+        if conditions:
+            sql += " WHERE " + " AND ".join(f"({c})" for c in conditions)
+        sql += " ORDER BY " + ", ".join(order_by)
+
+        rows = conn.execute(sql, params).fetchall()
+
+    data: dict[str, list[typing.Any]] = {"name": [row[0] for row in rows]}
+    for i, column in enumerate(columns, start=1):
+        is_bool = types[column] == "BOOLEAN"
+        data[column] = [
+            bool(row[i]) if is_bool and row[i] is not None else row[i] for row in rows
+        ]
+
+    return data
+
+
+@contextlib.contextmanager
+def _connect(data_dir: pathlib.Path) -> abc.Iterator[sqlite3.Connection]:
+    r"""Opens the index in ``data_dir`` in a transaction that is committed on exit,
+    creating it if it does not exist."""
+
+    conn = sqlite3.connect(data_dir / INDEX_NAME, timeout=_TIMEOUT)
+    try:
+        with conn:
+            _ = conn.execute(
+                "CREATE TABLE IF NOT EXISTS graphs ("
+                "name TEXT PRIMARY KEY, file_size INTEGER, file_mtime_ns INTEGER)"
+            )
+            yield conn
+    finally:
+        conn.close()
+
+
+def _index(
+    conn: sqlite3.Connection,
+    graph_dir: pathlib.Path,
+    props: abc.Mapping[str, int | float | bool | str] | None = None,
+) -> None:
+    path = graph_dir / "properties.yaml"
+    stat = path.stat()
+    if props is None:
+        with open(path) as f:
+            props = yaml.load(f, _Loader)
+    assert props is not None
+
+    types = _property_types(conn)
+    for key, val in props.items():
+        if key not in types:
+            sql_type = _SQL_TYPES.get(type(val), "TEXT")
+            _ = conn.execute(f"ALTER TABLE graphs ADD COLUMN {_quote(key)} {sql_type}")
+
+    columns = ["name", "file_size", "file_mtime_ns", *props]
+    _ = conn.execute(
+        f"INSERT OR REPLACE INTO graphs ({', '.join(map(_quote, columns))}) "
+        f"VALUES ({', '.join('?' * len(columns))})",
+        [graph_dir.name, stat.st_size, stat.st_mtime_ns, *props.values()],
+    )
+
+
+def _property_types(conn: sqlite3.Connection) -> dict[str, str]:
+    r"""Returns the declared type of each property column of the index, in the
+    order in which they were added."""
+
+    return {
+        name: sql_type
+        for _, name, sql_type, *_ in conn.execute("PRAGMA table_info(graphs)")
+        if name not in ("name", "file_size", "file_mtime_ns")
+    }
+
+
+def _quote(column: str) -> str:
+    if not re.fullmatch(r"\w+", column):
+        raise ValueError(f"Invalid property name: '{column}'")
+    # properties such as 'order' are SQL keywords
+    return f'"{column}"'
+
+
+def _parse_value(text: str) -> int | float | str:
+    lowered = text.lower()
+    if lowered in ("yes", "true"):
+        return 1
+    if lowered in ("no", "false"):
+        return 0
+    for parse in (int, float):
+        try:
+            return parse(text)
+        except ValueError:
+            pass
+    return text
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 
 import argparse
+import collections
+import concurrent.futures
+import io
 import os
 import pathlib
 import re
@@ -8,11 +11,28 @@ import typing
 from collections import abc
 
 import networkx as nx
+import numpy as np
+import numpy.typing as npt
 import scipy.io
 
+import edge_files
+import graph_cache
 import utils
-
-__all__ = ["from_edge_list_file", "from_file", "from_mtx_file"]
+from csr_graph import CSRGraph
+
+__all__ = [
+    "Backend",
+    "EdgeArrays",
+    "from_edge_arrays",
+    "from_edge_list_file",
+    "from_file",
+    "from_mtx_file",
+    "read_edge_arrays",
+    "read_mtx_arrays",
+    "to_csr",
+]
+
+Backend: typing.TypeAlias = typing.Literal["networkx", "csr"]
 
 logger = utils.configure_logger(__name__)
 
@@ -51,38 +71,116 @@ def main():
             "integers, starting with zero (default: do not relabel)"
         ),
     )
+    _ = parser.add_argument(
+        "-b",
+        "--backend",
+        choices=typing.get_args(Backend),
+        default="networkx",
+        help=(
+            "Graph representation to read the input into; with 'csr', edges are "
+            "printed in ascending order of their endpoints (default: networkx)"
+        ),
+    )
+
+    _ = parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=(
+            "Parse the input file even if it has an up-to-date binary cache file, and "
+            "do not write one (default: use and write cache files)"
+        ),
+    )
 
     args = parser.parse_args()
 
     if not args.graph_filepath:
         args.graph_filepath = input()
 
-    g = from_file(args.graph_filepath, args.format)
+    g = from_file(
+        args.graph_filepath,
+        args.format,
+        backend=args.backend,
+        cache=not args.no_cache,
+    )
 
     if args.relabel:
         logger.debug("Relabeling nodes.")
-        g = nx.convert_node_labels_to_integers(g)
+        g = (
+            g.without_labels()
+            if isinstance(g, CSRGraph)
+            else nx.convert_node_labels_to_integers(g)
+        )
 
     logger.debug("Printing an edge list representation of the graph.")
-    for line in nx.generate_edgelist(g, data=False):
-        print(line)
+    if isinstance(g, CSRGraph):
+        labels = g.labels
+        for u, v in zip(*(arr.tolist() for arr in g.edges()), strict=True):
+            print(f"{u} {v}" if labels is None else f"{labels[u]} {labels[v]}")
+    else:
+        for line in nx.generate_edgelist(g, data=False):
+            print(line)
+
+
+@typing.overload
+def from_file(
+    filepath: pathlib.Path | os.PathLike[typing.Any] | str | typing.IO[bytes],
+    format: typing.Literal["mtx", "edges"] | str | None = None,
+    backend: typing.Literal["networkx"] = "networkx",
+    cache: bool = True,
+) -> nx.Graph: ...
 
 
+@typing.overload
 def from_file(
-    filepath: pathlib.Path | os.PathLike[typing.Any] | str,
+    filepath: pathlib.Path | os.PathLike[typing.Any] | str | typing.IO[bytes],
     format: typing.Literal["mtx", "edges"] | str | None = None,
-) -> nx.Graph:
-    r"""Reads a graph from a file in one of the supported formats."""
+    *,
+    backend: typing.Literal["csr"],
+    cache: bool = True,
+) -> CSRGraph: ...
 
-    if not os.fspath(filepath):
-        raise ValueError("Path must not be empty")
 
-    filepath = pathlib.Path(filepath)
+def from_file(
+    filepath: pathlib.Path | os.PathLike[typing.Any] | str | typing.IO[bytes],
+    format: typing.Literal["mtx", "edges"] | str | None = None,
+    backend: Backend = "networkx",
+    cache: bool = True,
+) -> nx.Graph | CSRGraph:
+    r"""Reads a graph from a file in one of the supported formats.
+
+    :param filepath: Path to the file, or a file object opened in binary mode, such
+        as a member of a ZIP archive opened with :meth:`zipfile.ZipFile.open`, whose
+        format is guessed from its ``name`` attribute if not specified; a path to
+        a compressed edge list (see :mod:`edge_files`) is decompressed as it is read
+    :param backend: Whether to return an :class:`nx.Graph` (``"networkx"``) or a
+        :class:`CSRGraph` (``"csr"``), which takes a fraction of the memory
+    :param cache: Whether to load an edge-list file from its binary cache file (see
+        :mod:`graph_cache`) if it is up to date, and to write the cache file
+        otherwise; with the ``"networkx"`` backend, the nodes of a graph loaded
+        from the cache are in ascending order of their labels; ignored for file
+        objects
+    """
+
+    if isinstance(filepath, str | os.PathLike):
+        if not os.fspath(filepath):
+            raise ValueError("Path must not be empty")
+
+        filepath = pathlib.Path(filepath)
+        filename = filepath.name
+    else:
+        filename = str(getattr(filepath, "name", ""))
+        cache = False
+
+    # compressed files are edge lists, e.g., 'graph.edges.gz'
+    if isinstance(filepath, pathlib.Path) and edge_files.compression_of(filepath):
+        if format not in (None, "edges"):
+            raise ValueError(f"Compressed files must be edge lists, not {format}")
+        format = "edges"
 
     # if the format is not specified, guess it from the filename extension
     if format is None:
         logger.debug("Guessing the format from the filename suffix.")
-        suffix = filepath.suffix
+        suffix = pathlib.PurePath(filename).suffix
         if suffix == "":
             raise ValueError("Could not determine the format of the input file.")
         format = suffix[1:]
@@ -91,23 +189,59 @@ def from_file(
     elif format not in ("mtx", "edges"):
         raise ValueError(f"Unrecognized format: {format}")
 
-    match format:
-        case "mtx":
+    if backend not in typing.get_args(Backend):
+        raise ValueError(f"Unrecognized backend: {backend}")
+
+    match format, backend:
+        case "mtx", "networkx":
             logger.info("Reading as a Matrix Market file.")
             return from_mtx_file(filepath)
 
-        case "edges":
+        case "mtx", "csr":
+            logger.info("Reading as a Matrix Market file.")
+            return _csr_from_mtx_file(filepath)
+
+        case "edges", "networkx" if not cache:
             logger.info("Reading as an edge list file.")
             return from_edge_list_file(filepath)
 
+        case "edges", _:
+            path = filepath if cache and isinstance(filepath, pathlib.Path) else None
+            g = _csr_from_edge_list_file_cached(path) if path else None
+
+            if g is None:
+                logger.info("Reading as an edge list file.")
+                g = to_csr(read_edge_arrays(filepath))
+
+                if path:
+                    try:
+                        _ = graph_cache.store(path, g)
+                    except OSError as e:
+                        logger.warning(f"Could not write the cache file: {e}")
+
+            return g if backend == "csr" else g.to_networkx()
+
         case _:
             raise ValueError(f"Unrecognized format: {format}")
 
 
-def from_mtx_file(filepath: pathlib.Path) -> nx.Graph:
+def _csr_from_edge_list_file_cached(filepath: pathlib.Path) -> CSRGraph | None:
+    try:
+        return graph_cache.load(filepath)
+    except OSError as e:
+        logger.warning(f"Could not read the cache file: {e}")
+        return None
+
+
+def from_mtx_file(filepath: pathlib.Path | typing.IO[bytes]) -> nx.Graph:
     r"""Reads an adjacency matrix from a file in the Matrix Market format [1]_ and
     : constructs an :class:`nx.Graph` from it, following [2]_.
 
+    The file is read with :func:`read_mtx_arrays`, and the nodes and edges are added
+    in the same order as :func:`nx.from_scipy_sparse_array` or
+    :func:`nx.from_numpy_array` would add them from the matrix returned by
+    :func:`scipy.io.mmread`, but without the values of the entries as weights.
+
     .. rubric:: References
 
     .. [1] https://math.nist.gov/MatrixMarket/formats.html#MMformat
@@ -115,34 +249,526 @@ def from_mtx_file(filepath: pathlib.Path) -> nx.Graph:
     """
 
     logger.debug("Reading an adjacency matrix from the Matrix Market data.")
-    adj_mat = scipy.io.mmread(filepath)
-    is_dense = scipy.io.mminfo(filepath)[3] == "array"
+    g = from_edge_arrays(read_mtx_arrays(filepath))
+
+    logger.info("Successfully parsed Matrix Market data and created an nx.Graph!")
+    return g
+
+
+class EdgeArrays(typing.NamedTuple):
+    r"""The edges of a graph as two parallel arrays of endpoints, in the order in
+    which they were read.
+
+    If :attr:`labels` is ``None``, the values in :attr:`sources` and :attr:`targets`
+    are the (integer) node labels themselves; otherwise they are indices into
+    :attr:`labels`, which holds the original labels in order of first appearance.
+
+    :attr:`num_nodes` is the number of nodes when the file declares it, as a Matrix
+    Market file does, in which case the nodes are ``0, ..., num_nodes - 1`` and some
+    may be isolated; otherwise it is ``None`` and the nodes are the endpoints.
+    """
+
+    sources: npt.NDArray[np.int64]
+    targets: npt.NDArray[np.int64]
+    labels: list[str] | None = None
+    num_nodes: int | None = None
+
+
+def _csr_from_mtx_file(filepath: pathlib.Path | typing.IO[bytes]) -> CSRGraph:
+    r"""Reads an adjacency matrix from a Matrix Market file into a
+    :class:`CSRGraph` with the same edges as :func:`from_mtx_file` would create."""
+
+    g = to_csr(read_mtx_arrays(filepath))
+
+    logger.info("Successfully parsed Matrix Market data and created a CSRGraph!")
+    return g
+
+
+def read_mtx_arrays(
+    file: pathlib.Path | os.PathLike[typing.Any] | str | typing.IO[bytes],
+    chunk_size: int = 1 << 23,
+    max_workers: int | None = None,
+) -> EdgeArrays:
+    r"""Reads the nonzero pattern of a square matrix in the Matrix Market format as
+    the edges of a graph, without densifying it.
+
+    The header is parsed once to find the layout of the matrix.  The body of a
+    ``coordinate`` matrix is parsed by :func:`scipy.io.mmread`, whose C++ reader
+    parses chunks of the file in parallel, and only the indices of its entries are
+    kept, so every entry is an edge, as in :func:`nx.from_scipy_sparse_array`.  The
+    body of an ``array`` matrix, which :func:`scipy.io.mmread` would densify, is
+    instead read in chunks of about ``chunk_size`` bytes that are scanned for
+    nonzero entries with NumPy by a pool of ``max_workers`` threads while the next
+    chunks are read.
+
+    :param file: Path to the file, or a file object opened in binary mode
+    :param chunk_size: Approximate number of bytes of an ``array`` matrix to parse at
+        once
+    :param max_workers: Number of threads parsing the chunks of an ``array`` matrix;
+        if None, as many as :class:`concurrent.futures.ThreadPoolExecutor` uses by
+        default
+    :return: The zero-based row and column indices of the edges, ordered as
+        :func:`scipy.io.mmread` lists the entries of a sparse matrix, with the
+        entries mirrored from a symmetric matrix's stored triangle after those
+        stored, or in row-major order for the ``array`` layout; and the matrix's
+        order as :attr:`EdgeArrays.num_nodes`
+    """
+
+    if isinstance(file, str | os.PathLike):
+        if not os.fspath(file):
+            raise ValueError("Path must not be empty")
+
+        with open(file, "rb") as f:
+            return read_mtx_arrays(f, chunk_size, max_workers)
 
-    if is_dense:
-        logger.debug(
-            "Creating nx.Graph from the dense adjacency matrix (all entries given)."
+    header, (layout, field, symmetry, shape) = _read_mtx_header(file)
+    num_rows, num_cols = shape[:2]
+    if num_rows != num_cols:
+        raise ValueError(f"Adjacency matrix not square: nx,ny={(num_rows, num_cols)}")
+
+    if layout == "coordinate":
+        if file.seekable():
+            _ = file.seek(0)
+        else:
+            file = io.BytesIO(header + file.read())
+
+        coo = scipy.io.mmread(file)
+        return EdgeArrays(
+            coo.row.astype(np.int64), coo.col.astype(np.int64), num_nodes=num_rows
         )
-        g = nx.convert_matrix.from_numpy_array(adj_mat)
+
+    rows, cols = _read_mtx_array(
+        file, num_rows, field, symmetry, chunk_size, max_workers
+    )
+
+    if symmetry != "general":
+        # mirror the stored triangle
+        off_diagonal = rows != cols
+        rows, cols = (
+            np.concatenate((rows, cols[off_diagonal])),
+            np.concatenate((cols, rows[off_diagonal])),
+        )
+
+    # list the entries in row-major order, as np.nonzero would
+    order = np.argsort(rows * num_rows + cols, kind="stable")
+    return EdgeArrays(rows[order], cols[order], num_nodes=num_rows)
+
+
+def _read_mtx_header(
+    file: typing.IO[bytes],
+) -> tuple[bytes, tuple[str, str, str, tuple[int, ...]]]:
+    r"""Reads the banner, comments and size line of a Matrix Market file.
+
+    :return: The bytes read, and the layout (``coordinate`` or ``array``), field and
+        symmetry of the matrix and its numbers of rows and columns, followed by the
+        number of entries for the coordinate layout
+    """
+
+    lines = [file.readline()]
+    banner = lines[0].decode().split()
+    if len(banner) != 5 or banner[0] != "%%MatrixMarket" or banner[1] != "matrix":
+        raise ValueError("Not a Matrix Market file: missing or malformed banner")
+
+    layout, field, symmetry = (word.lower() for word in banner[2:])
+    if layout not in ("coordinate", "array"):
+        raise ValueError(f"Unsupported Matrix Market layout: {layout}")
+    if field not in ("real", "double", "integer", "complex", "pattern"):
+        raise ValueError(f"Unsupported Matrix Market field: {field}")
+    if symmetry not in ("general", "symmetric", "skew-symmetric", "hermitian"):
+        raise ValueError(f"Unsupported Matrix Market symmetry: {symmetry}")
+    if layout == "array" and field == "pattern":
+        raise ValueError("Matrix Market array layout cannot have the pattern field")
+
+    while line := file.readline():
+        lines.append(line)
+        line = line.strip()
+        if line and not line.startswith(b"%"):
+            shape = tuple(int(token) for token in line.split())
+            if len(shape) != (3 if layout == "coordinate" else 2):
+                raise ValueError(f"Malformed Matrix Market size line: {line!r}")
+            return b"".join(lines), (layout, field, symmetry, shape)
+
+    raise ValueError("Matrix Market file ended before the size line")
+
+
+def _iter_line_chunks(file: typing.IO[bytes], chunk_size: int) -> abc.Iterator[bytes]:
+    r"""Yields the rest of ``file`` in chunks of whole lines, each ending with a
+    newline."""
+
+    leftover = b""
+    while data := file.read(chunk_size):
+        chunk = leftover + data
+        cut = chunk.rfind(b"\n") + 1
+        chunk, leftover = chunk[:cut], chunk[cut:]
+        if chunk:
+            yield chunk
+
+    if leftover.strip():
+        yield leftover + b"\n"
+
+
+_T = typing.TypeVar("_T")
+
+
+def _map_chunks(
+    func: abc.Callable[[bytes], _T],
+    chunks: abc.Iterator[bytes],
+    max_workers: int | None,
+) -> list[_T]:
+    r"""Applies ``func`` to each chunk in a pool of threads, reading ahead at most
+    twice as many chunks as there are threads to bound the memory used.
+
+    :return: The results in the order of the chunks
+    """
+
+    if max_workers is None:
+        # the default of ThreadPoolExecutor
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    read_ahead = 2 * max_workers
+    results: list[_T] = []
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: collections.deque[concurrent.futures.Future[_T]] = collections.deque()
+
+        for chunk in chunks:
+            pending.append(executor.submit(func, chunk))
+            if len(pending) >= read_ahead:
+                results.append(pending.popleft().result())
+
+        results.extend(future.result() for future in pending)
+
+    return results
+
+
+def _read_mtx_array(
+    file: typing.IO[bytes],
+    order: int,
+    field: str,
+    symmetry: str,
+    chunk_size: int,
+    max_workers: int | None,
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    r"""Finds the nonzero entries of a matrix in the array layout, whose stored
+    entries are listed in column-major order: all of them for a general matrix, the
+    lower triangle for a symmetric or Hermitian one, and the strict lower triangle
+    for a skew-symmetric one.
+
+    :return: The zero-based row and column indices of the nonzero stored entries
+    """
+
+    values_per_entry = 2 if field == "complex" else 1
+
+    def nonzero(chunk: bytes) -> tuple[npt.NDArray[np.int64], int]:
+        values = np.array(chunk.split(), dtype=np.float64)
+        if values.size % values_per_entry:
+            raise ValueError("Malformed Matrix Market complex entries")
+        is_nonzero = (values != 0).reshape(-1, values_per_entry).any(axis=1)
+        return np.flatnonzero(is_nonzero), is_nonzero.size
+
+    parsed = _map_chunks(nonzero, _iter_line_chunks(file, chunk_size), max_workers)
+
+    # positions of the nonzero entries among the stored ones
+    offsets = np.cumsum([0] + [count for _, count in parsed])
+    positions = np.concatenate(
+        [pos + offset for (pos, _), offset in zip(parsed, offsets, strict=False)]
+        or [np.empty(0, np.int64)]
+    )
+
+    # the column j stores the rows j + skip, ..., order - 1
+    skip = {"general": None, "skew-symmetric": 1}.get(symmetry, 0)
+    if skip is None:
+        expected = order * order
+        rows, cols = positions % order, positions // order
     else:
-        logger.debug(
-            "Creating nx.Graph from the sparse adjacency matrix (given like edge list)."
+        col_sizes = np.maximum(order - skip - np.arange(order, dtype=np.int64), 0)
+        col_starts = np.concatenate(([0], np.cumsum(col_sizes)))
+        expected = int(col_starts[-1])
+        cols = np.searchsorted(col_starts, positions, side="right") - 1
+        rows = cols + skip + (positions - col_starts[cols])
+
+    if offsets[-1] != expected:
+        raise ValueError(
+            f"Expected {expected} entries in the Matrix Market data, found "
+            f"{offsets[-1]}"
         )
-        g = nx.convert_matrix.from_scipy_sparse_array(adj_mat)
 
-    logger.info("Successfully parsed Matrix Market data and created an nx.Graph!")
-    return g
+    return rows.astype(np.int64), cols.astype(np.int64)
 
 
-def from_edge_list_file(filepath: pathlib.Path) -> nx.Graph:
-    r"""Reads a graph represented as a list of edges, one per line, from a file."""
+def from_edge_list_file(filepath: pathlib.Path | typing.IO[bytes]) -> nx.Graph:
+    r"""Reads a graph represented as a list of edges, one per line, from a file.
+
+    The nodes are labelled with :class:`int`\ s if every node label in the file is a
+    non-negative integer and with the original :class:`str` labels otherwise.
+    """
 
-    with open(filepath) as file:
-        g = parse_edge_list(file.readlines())
+    g = from_edge_arrays(read_edge_arrays(filepath))
 
     logger.info("Successfully read as an edge list file and created an nx.Graph!")
     return g
 
 
+def from_edge_arrays(edges: EdgeArrays) -> nx.Graph:
+    r"""Creates an :class:`nx.Graph` from the edges in an :class:`EdgeArrays`, adding
+    nodes and edges in the same order as :func:`parse_edge_list` would."""
+
+    sources = edges.sources.tolist()
+    targets = edges.targets.tolist()
+
+    g = nx.Graph()
+    if edges.num_nodes is not None:
+        g.add_nodes_from(range(edges.num_nodes))
+    if edges.labels is None:
+        g.add_edges_from(zip(sources, targets, strict=True))
+    else:
+        labels = edges.labels
+        g.add_edges_from(
+            (labels[u], labels[v]) for u, v in zip(sources, targets, strict=True)
+        )
+
+    return g
+
+
+def to_csr(edges: EdgeArrays) -> CSRGraph:
+    r"""Creates a :class:`CSRGraph` from the edges in an :class:`EdgeArrays`.
+
+    Integer labels are numbered in ascending order and string labels in order of
+    first appearance; either way the original labels are kept in
+    :attr:`CSRGraph.labels` unless they coincide with the node indices.
+    """
+
+    if edges.num_nodes is not None:
+        return CSRGraph.from_edges(
+            edges.sources, edges.targets, num_nodes=edges.num_nodes
+        )
+
+    if edges.labels is None:
+        return CSRGraph.from_labeled_edges(edges.sources, edges.targets)
+
+    return CSRGraph.from_edges(
+        edges.sources,
+        edges.targets,
+        num_nodes=len(edges.labels),
+        labels=edges.labels,
+    )
+
+
+def read_edge_arrays(
+    file: pathlib.Path | os.PathLike[typing.Any] | str | typing.IO[bytes],
+    chunk_size: int = 1 << 23,
+) -> EdgeArrays:
+    r"""Reads an edge-list representation of a graph into an :class:`EdgeArrays`
+    without building an :class:`nx.Graph`.
+
+    The file is read in chunks of about ``chunk_size`` bytes, each of which is
+    tokenized with NumPy, accepting the same comment prefixes and delimiters as
+    :func:`parse_edge_list`.  If a node label that is not a non-negative integer is
+    encountered, the rest of the file is parsed line by line with
+    :func:`parse_edge_list`'s rules and the labels are returned as strings.
+
+    A path to a compressed file (see :mod:`edge_files`) is decompressed as it is
+    read.
+
+    :param file: Path to the file, or a file object opened in binary mode
+    :param chunk_size: Approximate number of bytes to tokenize at once
+    :return: The edges in the order in which they appear in the file
+    """
+
+    if isinstance(file, str | os.PathLike):
+        if not os.fspath(file):
+            raise ValueError("Path must not be empty")
+
+        if edge_files.compression_of(file) == "dv":
+            with open(file, "rb") as f:
+                return EdgeArrays(*edge_files.decode_delta(f.read()))
+
+        with edge_files.open_edges(file) as f:
+            return read_edge_arrays(f, chunk_size)
+
+    sources: list[npt.NDArray[np.int64]] = []
+    targets: list[npt.NDArray[np.int64]] = []
+    line_num = 0
+    leftover = b""
+
+    while True:
+        data = file.read(chunk_size)
+        at_eof = not data
+
+        chunk = leftover + data
+        if at_eof:
+            leftover = b""
+            if chunk and not chunk.endswith(b"\n"):
+                chunk += b"\n"
+        else:
+            # tokenize only whole lines, carrying the partial last line over; a
+            # '\r' at the end may be the first half of a '\r\n'
+            cut = max(chunk.rfind(b"\n"), chunk.rfind(b"\r", 0, len(chunk) - 1)) + 1
+            chunk, leftover = chunk[:cut], chunk[cut:]
+
+        if chunk:
+            parsed = _tokenize_chunk(chunk, line_num)
+            if parsed is None:
+                logger.info(
+                    "Found non-integer node labels; falling back to line-by-line "
+                    "parsing."
+                )
+                lines = _decode_lines(chunk + leftover, file)
+                return _parse_labeled_edge_arrays(lines, sources, targets, line_num)
+
+            sources.append(parsed[0])
+            targets.append(parsed[1])
+            line_num += chunk.count(b"\n") + chunk.count(b"\r") - chunk.count(b"\r\n")
+
+        if at_eof:
+            break
+
+    return EdgeArrays(
+        np.concatenate(sources) if sources else np.empty(0, dtype=np.int64),
+        np.concatenate(targets) if targets else np.empty(0, dtype=np.int64),
+    )
+
+
+# lookup tables indexed by byte value; the delimiters are the ASCII characters that
+# '\s' matches in a str, and commas
+_IS_DELIMITER = np.zeros(256, dtype=np.bool_)
+_IS_DELIMITER[list(b" \t\n\r\v\f\x1c\x1d\x1e\x1f,")] = True
+_IS_COMMENT_PREFIX = np.zeros(256, dtype=np.bool_)
+_IS_COMMENT_PREFIX[list(b"#%")] = True
+
+# the longest run of decimal digits that is guaranteed to fit in an int64
+_MAX_DIGITS = 18
+
+
+def _tokenize_chunk(
+    chunk: bytes, first_line_num: int
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]] | None:
+    r"""Extracts the first two tokens of each line in ``chunk``, which must end with
+    a newline, as integers.
+
+    Lines end with ``\n``, ``\r\n`` or ``\r``, as in a file opened in text mode.
+
+    :return: The arrays of sources and targets, or ``None`` if any of the extracted
+        tokens is not a non-negative decimal integer without leading zeros, which
+        would make tokens such as ``03`` and ``3`` the same node
+    """
+
+    buf = np.frombuffer(chunk, dtype=np.uint8)
+    is_newline = buf == ord("\n")
+    is_cr = buf == ord("\r")
+    is_cr[:-1] &= ~is_newline[1:]
+    is_newline |= is_cr
+    del is_cr
+    newline_pos = np.flatnonzero(is_newline)
+
+    is_delim = _IS_DELIMITER[buf]
+    is_comment = _IS_COMMENT_PREFIX[buf]
+    if is_comment.any():
+        # a byte is commented out if a comment prefix occurs after the last newline
+        # preceding it (or at its own position)
+        pos = np.arange(buf.size)
+        last_newline = np.maximum.accumulate(np.where(is_newline, pos, -1))
+        last_comment = np.maximum.accumulate(np.where(is_comment, pos, -1))
+        is_delim |= last_comment > last_newline
+        del pos, last_newline, last_comment
+
+    # token boundaries; the chunk ends with a newline, so every token ends in it
+    in_token = ~is_delim
+    starts = np.flatnonzero(in_token[1:] & is_delim[:-1]) + 1
+    if in_token[0]:
+        starts = np.concatenate(([0], starts))
+    ends = np.flatnonzero(in_token[:-1] & is_delim[1:]) + 1
+    del is_delim, in_token, is_comment
+
+    # group the tokens by line and keep only the first two of each line
+    line_of_token = np.searchsorted(newline_pos, starts)
+    is_first_of_line = np.ones(starts.size, dtype=np.bool_)
+    is_first_of_line[1:] = line_of_token[1:] != line_of_token[:-1]
+    first = np.flatnonzero(is_first_of_line)
+    tokens_per_line = np.diff(np.append(first, starts.size))
+
+    for line in line_of_token[first[tokens_per_line < 2]]:
+        logger.warning(
+            f"Skipping line #{first_line_num + int(line) + 1}: less than 2 tokens."
+        )
+
+    first = first[tokens_per_line >= 2]
+    token_ids = np.stack((first, first + 1), axis=1).ravel()
+    token_starts = starts[token_ids]
+    token_ends = ends[token_ids]
+    del starts, ends, line_of_token, is_first_of_line, first, tokens_per_line
+
+    lengths = token_ends - token_starts
+    width = int(lengths.max()) if lengths.size else 0
+    if width > _MAX_DIGITS:
+        return None
+
+    # gather the digits right-aligned into a (tokens, width) matrix, least
+    # significant digit first, and evaluate the place-value sums row-wise
+    place = np.arange(width)
+    present = place < lengths[:, None]
+    digit_pos = np.where(present, token_ends[:, None] - 1 - place, 0)
+    digits = buf[digit_pos].astype(np.int64) - ord("0")
+    if np.any(present & ((digits < 0) | (digits > 9))):
+        return None
+    if np.any((lengths > 1) & (buf[token_starts] == ord("0"))):
+        return None
+    digits[~present] = 0
+    values = digits @ (10 ** place.astype(np.int64))
+
+    return values[0::2].copy(), values[1::2].copy()
+
+
+def _decode_lines(head: bytes, rest: typing.IO[bytes]) -> abc.Iterator[str]:
+    r"""Yields the lines of ``head`` followed by the remaining lines of ``rest``, both
+    decoded as UTF-8.
+
+    The lines are split on ``\n``, ``\r\n`` and ``\r`` only, as in a file opened
+    in text mode, before they are decoded, as :meth:`str.splitlines` would also
+    split them on other characters, such as ``\v`` and ``\u2028``.
+    """
+
+    tail = rest.read()
+    for line in (head + tail).splitlines(keepends=True):
+        yield line.decode()
+
+
+def _parse_labeled_edge_arrays(
+    lines: abc.Iterable[str],
+    sources: abc.Iterable[npt.NDArray[np.int64]],
+    targets: abc.Iterable[npt.NDArray[np.int64]],
+    first_line_num: int,
+) -> EdgeArrays:
+    r"""Parses ``lines`` with :func:`parse_edge_list`'s rules into an
+    :class:`EdgeArrays` with string labels, after the edges with integer labels that
+    were already tokenized from the preceding lines."""
+
+    labels: list[str] = []
+    index: dict[str, int] = {}
+
+    def index_of(label: str) -> int:
+        i = index.get(label)
+        if i is None:
+            i = index[label] = len(labels)
+            labels.append(label)
+        return i
+
+    ids: list[int] = []
+    for u, v in zip(
+        (x for arr in sources for x in arr.tolist()),
+        (x for arr in targets for x in arr.tolist()),
+        strict=True,
+    ):
+        ids.append(index_of(str(u)))
+        ids.append(index_of(str(v)))
+
+    for u, v in _iter_edge_list_tokens(lines, first_line_num):
+        ids.append(index_of(u))
+        ids.append(index_of(v))
+
+    endpoints = np.array(ids, dtype=np.int64)
+    return EdgeArrays(endpoints[0::2].copy(), endpoints[1::2].copy(), labels)
+
+
 def parse_edge_list(lines: abc.Iterable[str]) -> nx.Graph:
     r"""Creates an :class:`nx.Graph` by parsing an edge-list representation of it.
 
@@ -158,7 +784,17 @@ def parse_edge_list(lines: abc.Iterable[str]) -> nx.Graph:
     """
 
     g = nx.Graph()
-    line_num = 0
+    g.add_edges_from(_iter_edge_list_tokens(lines))
+    return g
+
+
+def _iter_edge_list_tokens(
+    lines: abc.Iterable[str], first_line_num: int = 0
+) -> abc.Iterator[tuple[str, str]]:
+    r"""Yields the pair of node labels on each line of an edge-list representation,
+    following the rules described in :func:`parse_edge_list`."""
+
+    line_num = first_line_num
 
     for line in lines:
         line_num += 1
@@ -181,9 +817,7 @@ def parse_edge_list(lines: abc.Iterable[str]) -> nx.Graph:
             logger.warning(f"Skipping line #{line_num}: less than 2 tokens.")
             continue
 
-        g.add_edge(*nodes)
-
-    return g
+        yield nodes[0], nodes[1]
 
 
 if __name__ == "__main__":
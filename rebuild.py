@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import io
+import os
+import pathlib
+import shlex
+import shutil
+import traceback
+import typing
+from collections import abc
+
+import yaml
+
+import add_lcc
+import cache_graphs
+import edge_files
+import graph_cache
+import graph_properties
+import manifest
+import read_graph
+import run_experiments
+import utils
+
+__all__ = ["ARTIFACTS", "Outcome", "Target", "plan", "rebuild"]
+
+logger = utils.configure_logger(__name__)
+
+# the kinds of artifacts derived from the edge list of each graph, in the order in
+# which they are rebuilt
+ARTIFACTS = ("properties", "lcc", "cache", "results")
+
+# modules and packages whose versions each kind of artifact depends on
+_MODULES: dict[str, tuple[str, ...]] = {
+    "properties": ("graph_properties", "read_graph", "edge_files", "csr_graph"),
+    "lcc": ("add_lcc", "graph_properties", "read_graph", "edge_files", "write_graph"),
+    "cache": ("cache_graphs", "graph_cache", "read_graph", "edge_files", "csr_graph"),
+    # the results depend on the solvers rather than on run_experiments (see plan)
+    "results": (),
+}
+_PACKAGES: dict[str, tuple[str, ...]] = {
+    "properties": ("networkx", "numpy", "scipy"),
+    "lcc": ("numpy", "scipy"),
+    "cache": ("numpy",),
+    "results": (),
+}
+
+
+class Target(typing.NamedTuple):
+    r"""An artifact derived from a graph, and how to derive it."""
+
+    # e.g. 'properties' or 'results:vc'
+    name: str
+    # directory whose manifest records the artifact
+    dir: pathlib.Path
+    inputs: tuple[pathlib.Path, ...]
+    outputs: tuple[pathlib.Path, ...]
+    tool: dict[str, str]
+    build: abc.Callable[[], None]
+    # values to note in the record of the artifact once it is built or adopted
+    notes: abc.Callable[[], dict[str, int]] | None = None
+
+
+class Outcome(typing.NamedTuple):
+    r"""What happened to a :class:`Target`."""
+
+    target: Target
+    # 'up to date', 'stale', 'rebuilt', 'adopted' or 'failed'
+    status: str
+    message: str
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Rebuild the artifacts derived from each graph in the dataset "
+            "(properties, LCC, cache file and solver results) whose inputs or tools "
+            "changed since they were built, as recorded in a manifest.json file next "
+            "to them."
+        )
+    )
+    _ = parser.add_argument(
+        "-d",
+        "--data_dir",
+        default="data/graphs/",
+        help=(
+            "Directory whose subdirectories contain the graphs (default: data/graphs/)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-r",
+        "--results_dir",
+        default="results/cvc_and_vc_vs_local_ratio_vc/",
+        help=(
+            "Directory of the results of the experiment, as in run_experiments.py "
+            "(default: results/cvc_and_vc_vs_local_ratio_vc/)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-g",
+        "--graph",
+        action="append",
+        dest="graphs",
+        help=(
+            "Name of a graph to check; can be given multiple times (default: all "
+            "graphs in the data directory)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-n",
+        "--dry_run",
+        action="store_true",
+        help="Only list the stale artifacts and why they are stale",
+    )
+    _ = parser.add_argument(
+        "--adopt",
+        action="store_true",
+        help=(
+            "Record all stale artifacts that exist as up to date without rebuilding "
+            "them, e.g., after rebuilding them with the other scripts"
+        ),
+    )
+    _ = parser.add_argument(
+        "--rebuild_untracked",
+        action="store_true",
+        help=(
+            "Rebuild the artifacts that have no record in a manifest (default: "
+            "record those whose files all exist as up to date, so that the first "
+            "run on an existing dataset does not rebuild it)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Number of threads hashing files (default: as many as Python chooses)",
+    )
+
+    args = parser.parse_args()
+
+    if args.dry_run and args.adopt:
+        parser.error("Cannot combine --dry_run with --adopt")
+    if args.adopt and args.rebuild_untracked:
+        parser.error("Cannot combine --adopt with --rebuild_untracked")
+
+    outcomes = rebuild(
+        args.data_dir,
+        args.results_dir,
+        graphs=args.graphs,
+        dry_run=args.dry_run,
+        adopt=args.adopt,
+        rebuild_untracked=args.rebuild_untracked,
+        max_workers=args.jobs,
+    )
+
+    counts = {
+        status: sum(outcome.status == status for outcome in outcomes)
+        for status in ("up to date", "stale", "rebuilt", "adopted", "failed")
+    }
+    print(
+        "Done: " + ", ".join(f"{n} {status}" for status, n in counts.items() if n) + "."
+    )
+
+    if counts["failed"]:
+        raise SystemExit(1)
+
+
+def plan(
+    graph_dir: pathlib.Path,
+    results_dir: pathlib.Path,
+    hasher: manifest.Hasher,
+    solvers: abc.Mapping[str, str] = run_experiments.EXECUTABLE_PATH,
+) -> abc.Iterator[Target]:
+    r"""Yields the artifacts derived from the graph in ``graph_dir`` (see
+    :data:`ARTIFACTS`).
+
+    The targets are yielded lazily, so that those that depend on the results of
+    earlier ones (e.g., whether the graph has an LCC depends on its properties) are
+    planned only once the earlier ones have been rebuilt.  Only the artifacts that
+    exist or have been recorded are tracked, except for the properties and the LCC,
+    which every graph in the dataset has if applicable; the cache file and the
+    results of a solver are created by ``cache_graphs.py`` and
+    ``run_experiments.py``.
+
+    Rebuilding the properties only writes a missing ``properties.yaml`` and brings
+    its extra properties up to date, as :func:`graph_properties.for_graph` keeps the
+    properties in an existing file, which were computed from the original graph
+    with its isolated nodes, unless the edge list has changed since they were
+    recorded.  Then they are recomputed from the edge list with as many isolated
+    nodes as the record notes, and the properties fail to rebuild if it notes none.
+
+    The results of a solver are derived by its command line, its executable and
+    :data:`run_experiments.RESULTS_FORMAT_VERSION`, but not by the source of
+    ``run_experiments.py``, as the solvers may take hours to run again.
+
+    :param graph_dir: Directory of the graph
+    :param results_dir: Directory of the results of the experiment
+    :param hasher: Hasher used to find the versions of the tools
+    :param solvers: Command line of each solver by name
+    """
+
+    edges_path = edge_files.find(graph_dir) or edge_files.path_for(graph_dir)
+    props_path = graph_dir / "properties.yaml"
+    m = manifest.Manifest.load(graph_dir, hasher)
+    records = m.records
+
+    def tool(kind: str) -> dict[str, str]:
+        return manifest.tool_version(_MODULES[kind], _PACKAGES[kind], hasher=hasher)
+
+    def build_properties() -> None:
+        record = records.get("properties")
+        isolated_nodes = None
+        if (
+            record is not None
+            and props_path.exists()
+            and hasher.digests([edges_path])[edges_path]
+            != record.inputs.get(m.relative(edges_path))
+        ):
+            if "isolated_nodes" not in record.notes:
+                raise RuntimeError(
+                    "the edge list changed, but the number of isolated nodes of the "
+                    "graph was not recorded; re-run preprocess_graph.py"
+                )
+            isolated_nodes = record.notes["isolated_nodes"]
+
+        _quietly(
+            lambda dir: graph_properties.for_graph(dir, isolated_nodes=isolated_nodes),
+            graph_dir,
+        )
+
+    def note_isolated_nodes() -> dict[str, int]:
+        # the nodes that the properties count beyond those of the edge list
+        with open(props_path) as f:
+            order = int(yaml.load(f, yaml.SafeLoader)["order"])
+        g = read_graph.from_file(edges_path, backend="csr", cache=False)
+        return {"isolated_nodes": max(order - g.order(), 0)}
+
+    # the properties of an LCC are derived along with it
+    if not _is_lcc(graph_dir):
+        yield Target(
+            "properties",
+            graph_dir,
+            (edges_path,),
+            (props_path,),
+            tool("properties"),
+            build_properties,
+            note_isolated_nodes,
+        )
+
+        with open(props_path) as f:
+            props = yaml.load(f, yaml.SafeLoader)
+
+        if not props["connected"]:
+            lcc_dir = graph_dir.parent / f"{graph_dir.name}_lcc"
+            lcc_edges_path = edge_files.find(lcc_dir) or edge_files.path_for(lcc_dir)
+
+            def build_lcc() -> None:
+                # keep the compression of the LCC's edge list
+                compression = edge_files.compression_of(lcc_edges_path)
+                shutil.rmtree(lcc_dir, ignore_errors=True)
+                _quietly(lambda dir: add_lcc.for_graph(dir, compression), graph_dir)
+
+            yield Target(
+                "lcc",
+                lcc_dir,
+                (edges_path,),
+                (
+                    lcc_edges_path,
+                    lcc_dir / "properties.yaml",
+                    lcc_dir / "node_mapping.txt",
+                ),
+                tool("lcc"),
+                build_lcc,
+            )
+
+    cache_path = graph_cache.cache_path(edges_path)
+    if cache_path.exists() or "cache" in records:
+        yield Target(
+            "cache",
+            graph_dir,
+            (edges_path,),
+            (cache_path,),
+            tool("cache"),
+            lambda: _quietly(
+                lambda dir: cache_graphs.for_graph(dir, force=True), graph_dir
+            ),
+        )
+
+    res_dir = results_dir / graph_dir.name
+    res_records = manifest.Manifest.load(res_dir, hasher).records
+    for solver, command in solvers.items():
+        name = f"results:{solver}"
+        job = run_experiments.Job(
+            graph_dir,
+            solver,
+            command,
+            run_experiments.SOLUTION_NAMES.get(solver, (solver,)),
+            0,
+        )
+        outputs = tuple(
+            res_dir / f"{solution}_{kind}.txt"
+            for solution in job.solution_names
+            for kind in ("nodes", "cardinality")
+        )
+        if not (all(path.is_file() for path in outputs) or name in res_records):
+            continue
+
+        def build_results(job: run_experiments.Job = job) -> None:
+            outcome = run_experiments.run_job(job, results_dir)
+            if not outcome.ok:
+                raise RuntimeError(outcome.message)
+
+        yield Target(
+            name,
+            res_dir,
+            (edges_path,),
+            outputs,
+            {
+                **tool("results"),
+                **manifest.tool_version(
+                    executables=_executables(command), hasher=hasher
+                ),
+                "command": command,
+                "format": str(run_experiments.RESULTS_FORMAT_VERSION),
+            },
+            build_results,
+        )
+
+
+def rebuild(
+    data_dir: pathlib.Path | os.PathLike[typing.Any] | str = "data/graphs/",
+    results_dir: pathlib.Path
+    | os.PathLike[typing.Any]
+    | str = "results/cvc_and_vc_vs_local_ratio_vc/",
+    graphs: abc.Iterable[str] | None = None,
+    solvers: abc.Mapping[str, str] = run_experiments.EXECUTABLE_PATH,
+    dry_run: bool = False,
+    adopt: bool = False,
+    rebuild_untracked: bool = False,
+    max_workers: int | None = None,
+) -> list[Outcome]:
+    r"""Rebuilds the stale artifacts derived from each graph in ``data_dir`` (see
+    :func:`plan`), printing a line for each artifact that is not up to date.
+
+    An artifact is stale if its manifest has no record of it, if its outputs were
+    modified or removed, or if the contents of its inputs or the versions of the
+    tools that derive it (the source files of the modules involved, the versions of
+    the packages involved and the solvers' executables) changed since it was
+    recorded.  The files of the whole dataset are hashed up front by a pool of
+    ``max_workers`` threads, and the digests are kept in the manifests along with
+    the sizes and modification times of the files, so that files that have not
+    changed are not hashed again.
+
+    An artifact without a record whose outputs all exist, e.g., in a dataset that
+    has not been tracked yet, is recorded as up to date ("adopted") instead of
+    being rebuilt, unless ``rebuild_untracked`` is true.
+
+    The original graphs are processed before their LCCs, so that an LCC that is
+    rebuilt is checked afterwards.  A failure to rebuild an artifact is reported and
+    leaves it stale without stopping the others.
+
+    :param graphs: Names of the graphs to check; if None, all of them
+    :param solvers: Command line of each solver by name
+    :param dry_run: Whether to only report the stale artifacts
+    :param adopt: Whether to record all stale artifacts whose outputs exist as up
+        to date instead of rebuilding them
+    :param rebuild_untracked: Whether to rebuild the artifacts without a record
+        instead of adopting them
+    :param max_workers: Number of threads hashing files
+    :return: The outcome for each artifact
+    """
+
+    if not os.fspath(data_dir):
+        raise ValueError("Cannot specify an empty path or string for data_dir")
+    else:
+        data_dir = pathlib.Path(data_dir)
+
+    if not os.fspath(results_dir):
+        raise ValueError("Cannot specify an empty path or string for results_dir")
+    else:
+        results_dir = pathlib.Path(results_dir)
+
+    graph_dirs = sorted(
+        (dir for dir in data_dir.iterdir() if edge_files.find(dir) is not None),
+        key=lambda dir: (_is_lcc(dir), dir.name),
+    )
+    if graphs is not None:
+        graphs = set(graphs)
+        graph_dirs = [dir for dir in graph_dirs if dir.name in graphs]
+
+    hasher = manifest.Hasher(max_workers)
+
+    # warm up the hasher on everything that may be checked, in parallel
+    for dir in graph_dirs:
+        _ = manifest.Manifest.load(dir, hasher)
+        _ = manifest.Manifest.load(results_dir / dir.name, hasher)
+    _ = hasher.digests(
+        path
+        for dir in graph_dirs
+        for parent in (dir, results_dir / dir.name)
+        if parent.is_dir()
+        for path in parent.iterdir()
+        if path.is_file() and path.name != manifest.MANIFEST_NAME
+    )
+
+    outcomes: list[Outcome] = []
+
+    for graph_dir in graph_dirs:
+        # reload the manifests as each target updates them
+        targets = plan(graph_dir, results_dir, hasher, solvers)
+
+        while True:
+            try:
+                target = next(targets)
+            except StopIteration:
+                break
+            except Exception as e:
+                logger.debug(traceback.format_exc())
+                print(f"{graph_dir.name}: FAILED to plan ({type(e).__name__}: {e})")
+                break
+
+            outcome = _process(target, hasher, dry_run, adopt, rebuild_untracked)
+            outcomes.append(outcome)
+            if outcome.status != "up to date":
+                print(
+                    f"{graph_dir.name} {target.name}: {outcome.status} "
+                    f"({outcome.message})",
+                    flush=True,
+                )
+
+    return outcomes
+
+
+def _process(
+    target: Target,
+    hasher: manifest.Hasher,
+    dry_run: bool,
+    adopt: bool,
+    rebuild_untracked: bool,
+) -> Outcome:
+    m = manifest.Manifest.load(target.dir, hasher)
+    reason = m.check(target.name, target.inputs, target.outputs, target.tool)
+    if reason is None:
+        return Outcome(target, "up to date", "")
+
+    if (
+        target.name not in m.records
+        and not rebuild_untracked
+        and all(path.is_file() for path in target.outputs)
+    ):
+        # built before the dataset was tracked
+        adopt = True
+
+    if dry_run:
+        return Outcome(target, "stale", f"{reason}; to be adopted" if adopt else reason)
+
+    try:
+        if not adopt:
+            target.build()
+        notes = None if target.notes is None else target.notes()
+        m.record(target.name, target.inputs, target.outputs, target.tool, notes)
+    except Exception as e:
+        logger.debug(traceback.format_exc())
+        return Outcome(target, "failed", f"{reason}; {type(e).__name__}: {e}")
+
+    return Outcome(target, "adopted" if adopt else "rebuilt", reason)
+
+
+def _is_lcc(dir: pathlib.Path) -> bool:
+    return dir.name.endswith("_lcc") and (
+        edge_files.find(dir.parent / dir.name.removesuffix("_lcc")) is not None
+    )
+
+
+def _executables(command: str) -> list[pathlib.Path]:
+    r"""Returns the program that a solver's command line runs, if it can be found."""
+
+    words = shlex.split(command)
+    program = shutil.which(words[0]) if words else None
+    if program is None:
+        # run_experiments looks up relative paths in the current directory
+        return [pathlib.Path(words[0])] if words else []
+    return [pathlib.Path(program)]
+
+
+def _quietly(func: abc.Callable[[pathlib.Path], None], dir: pathlib.Path) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(dir)
+
+
+if __name__ == "__main__":
+    main()
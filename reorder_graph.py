@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import pathlib
+import typing
+from collections import abc
+
+import numpy as np
+import numpy.typing as npt
+import scipy.sparse.csgraph
+
+import edge_files
+import graph_properties
+import read_graph
+import write_graph
+from csr_graph import CSRGraph
+
+__all__ = [
+    "ORDERINGS",
+    "bfs_order",
+    "degree_order",
+    "for_graph",
+    "for_graphs_in_root",
+    "rcm_order",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Add a copy of a graph (or all graphs) to the dataset with its nodes "
+            "renumbered for locality, and print the bandwidth before and after."
+        )
+    )
+    _ = parser.add_argument(
+        "-a",
+        "--all",
+        action="store_true",
+        help="Process all graph data points that are subdirectories of the given path",
+    )
+    _ = parser.add_argument(
+        "-m",
+        "--method",
+        choices=list(ORDERINGS),
+        default="rcm",
+        help=(
+            "'rcm' for the reverse Cuthill-McKee ordering, 'degree' for descending "
+            "degree, or 'bfs' for breadth-first order (default: rcm)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-c",
+        "--compression",
+        choices=[c for c in edge_files.SUFFIXES if c is not None],
+        help=(
+            "Compress the edge list of the copy: 'gz' or 'xz' for a compressed text "
+            "file, or 'dv' for a delta-encoded binary file (default: plain text)"
+        ),
+    )
+    _ = parser.add_argument(
+        "path",
+        nargs="?",
+        help=(
+            "Directory for the graph or the parent directory for all graphs if `--all` "
+            "is specified; if this argument is either not provided or provided as an "
+            "empty string, the path will be read from stdin"
+        ),
+    )
+
+    args = parser.parse_args()
+
+    if not args.path:
+        args.path = input()
+
+    if args.all:
+        for_graphs_in_root(args.path, args.method, args.compression)
+    else:
+        for_graph(args.path, args.method, args.compression)
+
+
+def for_graphs_in_root(
+    rootdir: pathlib.Path | os.PathLike[typing.Any] | str = "./data/graphs/",
+    method: str = "rcm",
+    compression: edge_files.Compression | None = None,
+) -> None:
+    if not os.fspath(rootdir):
+        raise ValueError("Cannot specify an empty path or string for path")
+    else:
+        rootdir = pathlib.Path(rootdir)
+
+    for dir in sorted(rootdir.iterdir()):
+        if edge_files.find(dir) is None:
+            continue
+
+        for_graph(dir, method, compression)
+
+
+def for_graph(
+    dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    method: str = "rcm",
+    compression: edge_files.Compression | None = None,
+) -> None:
+    r"""Adds a copy of the graph in ``dir`` to the dataset as ``<dir>_<method>``,
+    with its nodes renumbered in the order given by one of the :data:`ORDERINGS`,
+    and a ``node_mapping.txt`` file that maps its labels to those of the graph, as
+    for the LCCs.
+
+    The edges are written sorted by their endpoints in the new numbering, and the
+    bandwidth and the average edge span (see the ``bandwidth`` property of
+    :mod:`graph_properties`) of the graph and of the copy are printed.
+    """
+
+    if method not in ORDERINGS:
+        raise ValueError(f"Unrecognized ordering: {method}")
+
+    if not os.fspath(dir):
+        raise ValueError("Cannot specify an empty path or string for dir")
+    else:
+        dir = pathlib.Path(dir)
+
+    print(f"{dir} => ", end="")
+
+    # copies are not reordered again
+    new_dir = dir.parent / f"{dir.name}_{method}"
+    if new_dir.exists() or dir.name.endswith(tuple(f"_{m}" for m in ORDERINGS)):
+        print("skipped")
+        return
+
+    edges_path = edge_files.find(dir)
+    if edges_path is None:
+        raise FileNotFoundError(f"No edge list in '{dir}'")
+    edges = read_graph.read_edge_arrays(edges_path)
+    if edges.labels is not None:
+        raise ValueError(f"Non-integer node labels in '{edges_path}'")
+
+    g = read_graph.to_csr(edges)
+    del edges
+    order = ORDERINGS[method](g)
+    h = g.relabeled(order)
+    sources, targets = h.edges()
+    props = graph_properties.compute_from_edges(sources, targets, num_nodes=h.order())
+
+    new_dir.mkdir()
+    write_graph.to_edge_list_file(
+        edge_files.path_for(new_dir, compression), sources, targets
+    )
+    graph_properties.write_properties(new_dir, props)
+    write_graph.to_node_mapping_file(
+        new_dir / "node_mapping.txt",
+        np.arange(h.order()),
+        np.asarray(h.labels),
+    )
+
+    before = graph_properties.compute_extra(g, ["bandwidth"])
+    after = graph_properties.compute_extra(h, ["bandwidth"])
+    print(
+        f"{new_dir} (bandwidth {before['bandwidth']} -> {after['bandwidth']}, "
+        f"average edge span {before['avg_edge_span']:.1f} -> "
+        f"{after['avg_edge_span']:.1f})"
+    )
+
+
+def rcm_order(g: CSRGraph) -> npt.NDArray[np.int64]:
+    r"""Returns the reverse Cuthill-McKee ordering of the nodes, which numbers
+    them breadth first from a peripheral node of each component, visiting the
+    neighbors of each node in ascending order of degree, and then reverses the
+    numbering; this keeps the bandwidth small on mesh-like graphs."""
+
+    return scipy.sparse.csgraph.reverse_cuthill_mckee(
+        g.to_scipy(), symmetric_mode=True
+    ).astype(np.int64)
+
+
+def degree_order(g: CSRGraph) -> npt.NDArray[np.int64]:
+    r"""Returns the nodes in descending order of degree, which numbers the hubs of
+    a skewed graph next to each other (ties are kept in the order of the graph)."""
+
+    return np.argsort(-g.degree(), kind="stable")
+
+
+def bfs_order(g: CSRGraph) -> npt.NDArray[np.int64]:
+    r"""Returns the nodes in breadth-first order, one component after another, each
+    from a node of minimum degree.
+
+    A single search from an extra node joined to the start of every component
+    visits each component in the order of a search from its start, so sorting the
+    visited nodes by component (stably) gives the order.
+    """
+
+    n = g.order()
+    num_components, component = scipy.sparse.csgraph.connected_components(
+        g.to_scipy(), directed=False
+    )
+    by_degree = np.lexsort((g.degree(), component))
+    firsts = np.flatnonzero(np.diff(component[by_degree], prepend=-1))
+    starts = by_degree[firsts]
+    assert starts.size == num_components
+
+    rows = np.concatenate((g._rows(), np.full(starts.size, n)))
+    cols = np.concatenate((g.indices, starts))
+    extended = scipy.sparse.csr_array(
+        (np.ones(rows.size, dtype=np.int8), (rows, cols)), shape=(n + 1, n + 1)
+    )
+    visited = scipy.sparse.csgraph.breadth_first_order(
+        extended, n, directed=True, return_predecessors=False
+    )[1:]
+    return visited[np.argsort(component[visited], kind="stable")].astype(np.int64)
+
+
+# the orderings by name, each of which returns the nodes of a graph in their new
+# order, i.e., the old index of each new index
+ORDERINGS: dict[str, abc.Callable[[CSRGraph], npt.NDArray[np.int64]]] = {
+    "rcm": rcm_order,
+    "degree": degree_order,
+    "bfs": bfs_order,
+}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import os
+import pathlib
+import re
+import sqlite3
+import typing
+from collections import abc
+
+import tabulate
+
+import properties_index
+import run_experiments
+import utils
+
+__all__ = [
+    "DB_NAME",
+    "GROUPINGS",
+    "connect",
+    "graph_family",
+    "import_results",
+    "query",
+    "ratios",
+    "solution_sizes",
+]
+
+logger = utils.configure_logger(__name__)
+
+# name of the database in the directory of the experiments
+DB_NAME = "results.sqlite"
+
+# seconds to wait for another process that is importing results
+_TIMEOUT = 60
+
+# how the ratios of solution sizes can be grouped, by the SQL expression to group on
+GROUPINGS = {
+    "family": "g.family",
+    "experiment": "a.experiment",
+    "graph": "a.graph",
+    "all": "'all'",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER
+);
+CREATE TABLE IF NOT EXISTS graphs (
+    name TEXT PRIMARY KEY, family TEXT
+);
+CREATE TABLE IF NOT EXISTS solutions (
+    experiment TEXT, graph TEXT, algorithm TEXT, size INTEGER,
+    PRIMARY KEY (experiment, graph, algorithm)
+);
+CREATE TABLE IF NOT EXISTS runs (
+    experiment TEXT, graph TEXT, solver TEXT, trial INTEGER,
+    wall_seconds REAL, user_seconds REAL, sys_seconds REAL, max_rss_kib INTEGER,
+    PRIMARY KEY (experiment, graph, solver, trial)
+);
+"""
+
+_CARDINALITY_SUFFIX = "_cardinality.txt"
+_RUNS_SUFFIX = "_runs.tsv"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Import the results of the experiments into a database and query it. The "
+            "database is updated incrementally, reading only the result files that "
+            "changed, before every query."
+        )
+    )
+    _ = parser.add_argument(
+        "-r",
+        "--results_root",
+        default="results/",
+        help=(
+            "Directory whose subdirectories hold the results of each experiment, one "
+            "subdirectory per graph, and which holds the database (default: results/)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-d",
+        "--data_dir",
+        default="data/graphs/",
+        help=(
+            "Directory whose subdirectories contain the graphs, whose properties can "
+            "be queried as the 'props' schema (default: data/graphs/)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-f",
+        "--format",
+        default="simple",
+        help=(
+            "Name of the format of the output table as used by the python-tabulate "
+            "package (default: simple)."
+        ),
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    _ = subparsers.add_parser(
+        "import", help="Import the result files that changed and print their number"
+    )
+
+    ratio_parser = subparsers.add_parser(
+        "ratio",
+        help=(
+            "Summarize the ratios of the sizes of the solutions found by two "
+            "algorithms on the same graphs"
+        ),
+    )
+    _ = ratio_parser.add_argument("numerator", help="Algorithm, e.g., vc")
+    _ = ratio_parser.add_argument("denominator", help="Algorithm, e.g., local_ratio_vc")
+    _ = ratio_parser.add_argument(
+        "-b",
+        "--by",
+        choices=list(GROUPINGS),
+        default="family",
+        help="How to group the graphs (default: family)",
+    )
+    _ = ratio_parser.add_argument(
+        "-e",
+        "--experiment",
+        action="append",
+        dest="experiments",
+        help=(
+            "Experiment to include; can be given multiple times (default: all "
+            "experiments)"
+        ),
+    )
+
+    sql_parser = subparsers.add_parser(
+        "sql",
+        help=(
+            "Run an SQL query on the tables files, graphs(name, family), "
+            "solutions(experiment, graph, algorithm, size) and runs(experiment, "
+            "graph, solver, trial, wall_seconds, user_seconds, sys_seconds, "
+            "max_rss_kib), and props.graphs with the properties of the graphs"
+        ),
+    )
+    _ = sql_parser.add_argument("query", help="The SQL query")
+
+    args = parser.parse_args()
+
+    if args.command == "import":
+        print(import_results(args.results_root))
+        return
+
+    if args.command == "ratio":
+        data = ratios(
+            args.numerator,
+            args.denominator,
+            by=args.by,
+            experiments=args.experiments,
+            results_root=args.results_root,
+        )
+    else:
+        _ = import_results(args.results_root)
+        try:
+            data = query(
+                args.query, results_root=args.results_root, data_dir=args.data_dir
+            )
+        except sqlite3.Error as e:
+            parser.error(f"Invalid query: {e}")
+
+    print(tabulate.tabulate(data, headers="keys", tablefmt=args.format))
+
+
+def graph_family(name: str) -> str:
+    r"""Returns the family of a graph: the leading run of letters in its name, e.g.,
+    ``bcsstk`` for ``bcsstk17_lcc`` or ``bio`` for ``bio-CE-CX``, or the whole name if
+    it does not start with a letter."""
+
+    match = re.match(r"[A-Za-z]+", name)
+    return match[0] if match else name
+
+
+@contextlib.contextmanager
+def connect(
+    results_root: pathlib.Path | os.PathLike[typing.Any] | str = "results/",
+) -> abc.Iterator[sqlite3.Connection]:
+    r"""Opens the database in ``results_root`` in a transaction that is committed on
+    exit, creating it if it does not exist."""
+
+    if not os.fspath(results_root):
+        raise ValueError("Cannot specify an empty path or string for results_root")
+
+    conn = sqlite3.connect(pathlib.Path(results_root) / DB_NAME, timeout=_TIMEOUT)
+    try:
+        with conn:
+            _ = conn.executescript(_SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def import_results(
+    results_root: pathlib.Path | os.PathLike[typing.Any] | str = "results/",
+    experiments: abc.Iterable[str] | None = None,
+) -> int:
+    r"""Brings the database in ``results_root`` up to date with the result files of
+    the experiments in its subdirectories.
+
+    The sizes of the solutions are read from the ``<algorithm>_cardinality.txt``
+    files and the measurements of the solver runs from the ``<solver>_runs.tsv``
+    files in ``<experiment>/<graph>/`` (see
+    :func:`run_experiments.write_measurements`).  Only the files whose size or
+    modification time differ from those recorded in the database are read, and the
+    rows of files that were removed are deleted.
+
+    :param experiments: Names of the experiments to import; if None, all of them
+    :return: The number of files read or removed
+    """
+
+    if not os.fspath(results_root):
+        raise ValueError("Cannot specify an empty path or string for results_root")
+    else:
+        results_root = pathlib.Path(results_root)
+
+    if experiments is None:
+        exp_dirs = [entry.path for entry in os.scandir(results_root) if entry.is_dir()]
+    else:
+        exp_dirs = [os.path.join(results_root, name) for name in experiments]
+
+    changes = 0
+
+    with connect(results_root) as conn:
+        for exp_dir in exp_dirs:
+            experiment = os.path.basename(exp_dir)
+            prefix = f"{experiment}/"
+            known = {
+                path: (size, mtime_ns)
+                for path, size, mtime_ns in conn.execute(
+                    "SELECT path, size, mtime_ns FROM files "
+                    "WHERE substr(path, 1, length(?)) = ?",
+                    (prefix, prefix),
+                )
+            }
+            seen: set[str] = set()
+
+            for graph_entry in os.scandir(exp_dir):
+                if not graph_entry.is_dir():
+                    continue
+                graph = graph_entry.name
+                _ = conn.execute(
+                    "INSERT OR IGNORE INTO graphs VALUES (?, ?)",
+                    (graph, graph_family(graph)),
+                )
+
+                for entry in os.scandir(graph_entry.path):
+                    kind = _kind(entry.name)
+                    if kind is None or not entry.is_file():
+                        continue
+
+                    path = f"{experiment}/{graph}/{entry.name}"
+                    seen.add(path)
+                    stat = entry.stat()
+                    if known.get(path) == (stat.st_size, stat.st_mtime_ns):
+                        continue
+
+                    logger.info(f"Importing '{path}'")
+                    _import_file(conn, experiment, graph, entry.name, entry.path)
+                    _ = conn.execute(
+                        "INSERT OR REPLACE INTO files VALUES (?, ?, ?)",
+                        (path, stat.st_size, stat.st_mtime_ns),
+                    )
+                    changes += 1
+
+            for path in known.keys() - seen:
+                logger.info(f"Removing '{path}' from the database")
+                _, graph, name = path.split("/")
+                _remove_file(conn, experiment, graph, name)
+                _ = conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                changes += 1
+
+    return changes
+
+
+def query(
+    sql: str,
+    params: abc.Sequence[typing.Any] | abc.Mapping[str, typing.Any] = (),
+    results_root: pathlib.Path | os.PathLike[typing.Any] | str = "results/",
+    data_dir: pathlib.Path | os.PathLike[typing.Any] | str | None = None,
+) -> dict[str, list[typing.Any]]:
+    r"""Runs an SQL query on the database in ``results_root``.
+
+    If ``data_dir`` is given, its properties index (see :mod:`properties_index`) is
+    brought up to date and attached as the ``props`` schema, so that the query can
+    join ``props.graphs`` on the names of the graphs.
+
+    :return: The rows returned, by column
+    """
+
+    with connect(results_root) as conn:
+        if data_dir is not None:
+            _ = properties_index.sync(data_dir)
+            _ = conn.execute(
+                "ATTACH DATABASE ? AS props",
+                (os.fspath(properties_index.index_path(data_dir)),),
+            )
+
+        cursor = conn.execute(sql, params)
+        columns = [column[0] for column in cursor.description or ()]
+        rows = cursor.fetchall()
+
+    return {column: [row[i] for row in rows] for i, column in enumerate(columns)}
+
+
+def solution_sizes(
+    experiment: str,
+    results_root: pathlib.Path | os.PathLike[typing.Any] | str = "results/",
+) -> dict[str, dict[str, int]]:
+    r"""Returns the sizes of the solutions of an experiment by algorithm and then by
+    graph.  The algorithms are ordered as the solvers in
+    :data:`run_experiments.SOLUTION_NAMES` print them, followed by any others in
+    alphabetical order."""
+
+    data = query(
+        "SELECT algorithm, graph, size FROM solutions WHERE experiment = ?",
+        (experiment,),
+        results_root,
+    )
+
+    known = [
+        name for names in run_experiments.SOLUTION_NAMES.values() for name in names
+    ]
+    sizes: dict[str, dict[str, int]] = {}
+    for algorithm in sorted(
+        set(data["algorithm"]),
+        key=lambda a: (known.index(a), "") if a in known else (len(known), a),
+    ):
+        sizes[algorithm] = {}
+    for algorithm, graph, size in zip(
+        data["algorithm"], data["graph"], data["size"], strict=True
+    ):
+        sizes[algorithm][graph] = size
+
+    return sizes
+
+
+def ratios(
+    numerator: str,
+    denominator: str,
+    by: str = "family",
+    experiments: abc.Iterable[str] | None = None,
+    results_root: pathlib.Path | os.PathLike[typing.Any] | str = "results/",
+) -> dict[str, list[typing.Any]]:
+    r"""Summarizes the ratios of the sizes of the solutions found by two algorithms
+    on the same graphs in the same experiments, after importing any new results.
+
+    :param by: How to group the graphs (see :data:`GROUPINGS`)
+    :param experiments: Names of the experiments to include; if None, all of them
+    :return: For each group, the number of graphs and the mean, minimum and maximum
+        of the ratios
+    """
+
+    if by not in GROUPINGS:
+        raise ValueError(f"Unrecognized grouping: {by}")
+
+    experiments = None if experiments is None else list(experiments)
+    _ = import_results(results_root, experiments)
+
+    sql = f"""
+        SELECT {GROUPINGS[by]} AS "{by}", COUNT(*) AS graphs,
+            AVG(CAST(a.size AS REAL) / b.size) AS mean_ratio,
+            MIN(CAST(a.size AS REAL) / b.size) AS min_ratio,
+            MAX(CAST(a.size AS REAL) / b.size) AS max_ratio
+        FROM solutions AS a
+        JOIN solutions AS b
+            ON b.experiment = a.experiment AND b.graph = a.graph
+            AND b.algorithm = ?
+        JOIN graphs AS g ON g.name = a.graph
+        WHERE a.algorithm = ? AND b.size > 0
+    """
+    params: list[typing.Any] = [denominator, numerator]
+    if experiments is not None:
+        sql += f" AND a.experiment IN ({', '.join('?' * len(experiments))})"
+        params += experiments
+    sql += f" GROUP BY {GROUPINGS[by]} ORDER BY {GROUPINGS[by]}"
+
+    return query(sql, params, results_root)
+
+
+def _kind(filename: str) -> str | None:
+    if filename.endswith(_CARDINALITY_SUFFIX):
+        return "solution"
+    if filename.endswith(_RUNS_SUFFIX):
+        return "runs"
+    return None
+
+
+def _import_file(
+    conn: sqlite3.Connection, experiment: str, graph: str, filename: str, path: str
+) -> None:
+    _remove_file(conn, experiment, graph, filename)
+
+    if _kind(filename) == "solution":
+        with open(path) as f:
+            size = int(f.read().strip())
+        _ = conn.execute(
+            "INSERT INTO solutions VALUES (?, ?, ?, ?)",
+            (experiment, graph, filename.removesuffix(_CARDINALITY_SUFFIX), size),
+        )
+    else:
+        solver = filename.removesuffix(_RUNS_SUFFIX)
+        _ = conn.executemany(
+            "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (experiment, graph, solver, trial, *m)
+                for trial, m in enumerate(run_experiments.read_measurements(path), 1)
+            ),
+        )
+
+
+def _remove_file(
+    conn: sqlite3.Connection, experiment: str, graph: str, filename: str
+) -> None:
+    if _kind(filename) == "solution":
+        _ = conn.execute(
+            "DELETE FROM solutions "
+            "WHERE experiment = ? AND graph = ? AND algorithm = ?",
+            (experiment, graph, filename.removesuffix(_CARDINALITY_SUFFIX)),
+        )
+    else:
+        _ = conn.execute(
+            "DELETE FROM runs WHERE experiment = ? AND graph = ? AND solver = ?",
+            (experiment, graph, filename.removesuffix(_RUNS_SUFFIX)),
+        )
+
+
+if __name__ == "__main__":
+    main()
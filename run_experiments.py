@@ -0,0 +1,758 @@
+#!/usr/bin/env python3
+
+import argparse
+import concurrent.futures
+import contextlib
+import io
+import os
+import pathlib
+import shlex
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import typing
+from collections import abc
+
+import yaml
+
+import baseline_solvers
+import edge_files
+import utils
+import write_graph
+
+__all__ = [
+    "BASELINE_COMMANDS",
+    "EXECUTABLE_PATH",
+    "RESULTS_FORMAT_VERSION",
+    "SOLUTION_NAMES",
+    "Job",
+    "Measurement",
+    "Outcome",
+    "plan_jobs",
+    "read_measurements",
+    "run",
+    "run_job",
+    "write_measurements",
+]
+
+logger = utils.configure_logger(__name__)
+
+# number of bytes of solver output parsed at once
+_READ_SIZE = 1 << 20
+
+# number of bytes of a failed solver's stderr included in its outcome
+_MAX_STDERR = 1 << 12
+
+# a program, run in a fresh interpreter, that runs the command line after its first
+# argument as a child and writes the exit code, wall time and resources of the child
+# to the file descriptor given as its first argument; the peak memory reported for a
+# process includes that of the process it was forked from, which would be the
+# runner's if it started the solver itself, and is only that of this small
+# interpreter instead
+_MEASURE = """
+import os, sys, time
+fd = int(sys.argv[1])
+start = time.perf_counter()
+pid = os.fork()
+if pid == 0:
+    try:
+        os.close(fd)
+        os.execvp(sys.argv[2], sys.argv[2:])
+    except OSError as e:
+        print(f"could not run {sys.argv[2]!r}: {e}", file=sys.stderr)
+    os._exit(127)
+_, status, usage = os.wait4(pid, 0)
+wall = time.perf_counter() - start
+code = os.waitstatus_to_exitcode(status)
+fields = (code, wall, usage.ru_utime, usage.ru_stime, usage.ru_maxrss)
+os.write(fd, " ".join(map(str, fields)).encode())
+"""
+
+# bump whenever the result files saved from the output of a solver change, to have
+# rebuild.py run the solvers again
+RESULTS_FORMAT_VERSION = 1
+
+# commands that run the solvers, which are looked up relative to the current
+# directory; replace the values with the paths on your system, or override them with
+# the --solver option
+EXECUTABLE_PATH: dict[str, str] = {
+    "vc": "bin/vc",
+    "local_ratio_vc": "bin/local_ratio_vc",
+}
+
+# commands that run the NumPy implementations of the baseline algorithms in
+# baseline_solvers.py, which need no executables and can be selected by name alone
+# with the --solver option
+BASELINE_COMMANDS: dict[str, str] = {
+    f"np_{name}": shlex.join(
+        [
+            sys.executable,
+            str(pathlib.Path(__file__).with_name("baseline_solvers.py")),
+            name,
+        ]
+    )
+    for name in baseline_solvers.ALGORITHMS
+}
+
+# names of the solutions that each solver prints, one per line and in this order;
+# the results for a solution named `x` are saved in `x_nodes.txt` and
+# `x_cardinality.txt`, and a solver not listed here prints one solution named after
+# the solver itself
+SOLUTION_NAMES: dict[str, tuple[str, ...]] = {
+    "vc": ("cvc", "vc"),
+    "local_ratio_vc": ("local_ratio_vc",),
+}
+
+
+class Job(typing.NamedTuple):
+    r"""One run of a solver on a graph."""
+
+    graph_dir: pathlib.Path
+    solver: str
+    command: str
+    solution_names: tuple[str, ...]
+    size: int
+
+
+class Outcome(typing.NamedTuple):
+    r"""The result of a :class:`Job`."""
+
+    job: Job
+    ok: bool
+    message: str
+    seconds: float
+    measurements: tuple["Measurement", ...] = ()
+
+
+class Measurement(typing.NamedTuple):
+    r"""The resources used by one trial of a :class:`Job`."""
+
+    wall_seconds: float
+    user_seconds: float
+    sys_seconds: float
+    max_rss_kib: int
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run the vertex cover solvers on the graphs in the dataset in parallel, "
+            "largest graphs first, skipping runs whose results already exist."
+        )
+    )
+    _ = parser.add_argument(
+        "-d",
+        "--data_dir",
+        default="data/graphs/",
+        help=(
+            "Directory whose subdirectories contain the graphs (default: data/graphs/)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-r",
+        "--results_dir",
+        default="results/cvc_and_vc_vs_local_ratio_vc/",
+        help=(
+            "Directory in which to save the results for this experiment, one "
+            "subdirectory per graph (default: results/cvc_and_vc_vs_local_ratio_vc/)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-s",
+        "--solver",
+        action="append",
+        metavar="NAME=COMMAND",
+        help=(
+            "Solver to run and the command line that runs it, which reads the graph "
+            "from stdin and prints 'node, node, ... => cardinality' lines, or just the "
+            "name of one of the baseline solvers ("
+            + ", ".join(BASELINE_COMMANDS)
+            + "); can be given multiple times (default: "
+            + ", ".join(f"{name}={cmd}" for name, cmd in EXECUTABLE_PATH.items())
+            + ")"
+        ),
+    )
+    _ = parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of solver runs to execute at the same time (default: 1)",
+    )
+    _ = parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        help="Time limit for each run in seconds (default: none)",
+    )
+    _ = parser.add_argument(
+        "-m",
+        "--memory_limit",
+        type=int,
+        help="Virtual memory limit for each run in MiB (default: none)",
+    )
+    _ = parser.add_argument(
+        "-n",
+        "--trials",
+        type=int,
+        default=1,
+        help=(
+            "Number of times to run each solver on each graph, recording the time "
+            "and memory used by each (default: 1)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-w",
+        "--warmup",
+        type=int,
+        default=0,
+        help="Number of unrecorded runs before the trials (default: 0)",
+    )
+    _ = parser.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        help="Rerun solvers even if their results already exist (default: skip them)",
+    )
+    _ = parser.add_argument(
+        "--include_disconnected",
+        action="store_true",
+        help="Also run on graphs that are not connected (default: skip them)",
+    )
+
+    args = parser.parse_args()
+
+    if args.trials < 1:
+        parser.error("--trials must be at least 1")
+    if args.warmup < 0:
+        parser.error("--warmup must not be negative")
+
+    solvers = dict(EXECUTABLE_PATH)
+    if args.solver:
+        solvers = {}
+        for spec in args.solver:
+            name, sep, command = spec.partition("=")
+            if not sep and name in BASELINE_COMMANDS:
+                command = BASELINE_COMMANDS[name]
+            elif not sep or not name or not command:
+                parser.error(f"Expected NAME=COMMAND for --solver, got '{spec}'")
+            solvers[name] = command
+
+    jobs = plan_jobs(
+        args.data_dir,
+        args.results_dir,
+        solvers,
+        force=args.force,
+        include_disconnected=args.include_disconnected,
+    )
+    outcomes = run(
+        jobs,
+        args.results_dir,
+        max_workers=args.jobs,
+        timeout=args.timeout,
+        memory_limit=args.memory_limit,
+        trials=args.trials,
+        warmup=args.warmup,
+    )
+
+    failures = [outcome for outcome in outcomes if not outcome.ok]
+    print(f"Done: {len(outcomes) - len(failures)} succeeded, {len(failures)} failed.")
+    for outcome in failures:
+        print(
+            f"FAILED {outcome.job.solver} on {outcome.job.graph_dir.name}: "
+            f"{outcome.message}"
+        )
+
+    if failures:
+        raise SystemExit(1)
+
+
+def plan_jobs(
+    data_dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    results_dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    solvers: abc.Mapping[str, str] = EXECUTABLE_PATH,
+    force: bool = False,
+    include_disconnected: bool = False,
+) -> list[Job]:
+    r"""Lists the runs of each solver on each graph in ``data_dir``, largest graph
+    (by its ``size`` in ``properties.yaml``) first.
+
+    :param data_dir: Directory whose subdirectories contain the graphs
+    :param results_dir: Directory in which the results of the experiment are saved
+    :param solvers: Command line of each solver by name
+    :param force: Whether to include runs whose results already exist
+    :param include_disconnected: Whether to include graphs that are not connected
+    """
+
+    if not os.fspath(data_dir):
+        raise ValueError("Cannot specify an empty path or string for data_dir")
+    else:
+        data_dir = pathlib.Path(data_dir)
+
+    if not os.fspath(results_dir):
+        raise ValueError("Cannot specify an empty path or string for results_dir")
+    else:
+        results_dir = pathlib.Path(results_dir)
+
+    jobs: list[Job] = []
+
+    for graph_dir in data_dir.iterdir():
+        if edge_files.find(graph_dir) is None:
+            continue
+
+        with open(graph_dir / "properties.yaml") as f:
+            props = yaml.load(f, yaml.SafeLoader)
+
+        if not props["connected"] and not include_disconnected:
+            logger.info(f"Skipping '{graph_dir.name}' as it is not connected")
+            continue
+
+        for solver, command in solvers.items():
+            job = Job(
+                graph_dir,
+                solver,
+                command,
+                SOLUTION_NAMES.get(solver, (solver,)),
+                int(props["size"]),
+            )
+
+            if not force and _results_exist(job, results_dir):
+                logger.info(f"Skipping {solver} on '{graph_dir.name}' (done already)")
+                continue
+
+            jobs.append(job)
+
+    jobs.sort(key=lambda job: (-job.size, job.graph_dir.name, job.solver))
+    return jobs
+
+
+def run(
+    jobs: abc.Iterable[Job],
+    results_dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    max_workers: int = 1,
+    timeout: float | None = None,
+    memory_limit: int | None = None,
+    trials: int = 1,
+    warmup: int = 0,
+) -> list[Outcome]:
+    r"""Executes ``jobs`` with at most ``max_workers`` running at the same time,
+    starting them in the order given, and prints a line of progress as each
+    finishes.
+
+    See :func:`run_job` for the parameters.
+
+    :return: The outcome of each job, in the order in which they finished
+    """
+
+    jobs = list(jobs)
+    outcomes: list[Outcome] = []
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                run_job, job, results_dir, timeout, memory_limit, trials, warmup
+            )
+            for job in jobs
+        ]
+
+        for future in concurrent.futures.as_completed(futures):
+            outcome = future.result()
+            outcomes.append(outcome)
+
+            status = "ok" if outcome.ok else f"FAILED ({outcome.message})"
+            if outcome.measurements:
+                best = min(outcome.measurements)
+                status += (
+                    f", best of {len(outcome.measurements)}: "
+                    f"{best.wall_seconds:.2f}s, {best.max_rss_kib // 1024} MiB"
+                )
+            print(
+                f"[{len(outcomes)}/{len(jobs)}] {outcome.job.solver} on "
+                f"{outcome.job.graph_dir.name}: {status} ({outcome.seconds:.1f}s)",
+                flush=True,
+            )
+
+    return outcomes
+
+
+def run_job(
+    job: Job,
+    results_dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    timeout: float | None = None,
+    memory_limit: int | None = None,
+    trials: int = 1,
+    warmup: int = 0,
+) -> Outcome:
+    r"""Runs a solver on a graph and saves each solution it prints in
+    ``<results_dir>/<graph>/<solution>_nodes.txt`` and
+    ``<results_dir>/<graph>/<solution>_cardinality.txt``, and the resources used by
+    each trial in ``<results_dir>/<graph>/<solver>_runs.tsv`` (see
+    :func:`write_measurements`).
+
+    The solver reads the edge list directly as its stdin (a compressed one is first
+    decompressed into a temporary file, outside of the measurements), and its output
+    is parsed as it arrives and streamed into the result files, so the memory used
+    here does not grow with the size of the graph or of the solutions.  The result
+    files are replaced atomically only after every trial has succeeded, so an
+    interrupted run leaves no partial results behind.
+
+    :param timeout: Time limit for each trial in seconds, after which the solver is
+        killed
+    :param memory_limit: Virtual memory limit in MiB
+    :param trials: Number of times to run the solver and measure its resources; the
+        solutions printed in the last trial are saved
+    :param warmup: Number of times to run the solver before the trials, which are
+        neither measured nor saved
+    """
+
+    if trials < 1:
+        raise ValueError("Expected at least one trial")
+
+    res_dir = pathlib.Path(results_dir) / job.graph_dir.name
+    res_dir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    measurements: list[Measurement] = []
+
+    for trial in range(warmup + trials):
+        with _SolutionWriter(res_dir, job.solution_names) as writer:
+            result = _run_once(job, writer, timeout, memory_limit)
+            if isinstance(result, str):
+                return Outcome(job, False, result, _elapsed(start), tuple(measurements))
+
+            if trial < warmup:
+                continue
+
+            measurements.append(result)
+            if len(measurements) == trials:
+                write_measurements(res_dir / f"{job.solver}_runs.tsv", measurements)
+                writer.commit()
+
+    return Outcome(job, True, "", _elapsed(start), tuple(measurements))
+
+
+def write_measurements(
+    path: pathlib.Path | os.PathLike[typing.Any] | str,
+    measurements: abc.Iterable[Measurement],
+) -> None:
+    r"""Writes the measurements of the trials of a run to a TSV file with a header
+    line followed by one line per trial, replacing the file atomically."""
+
+    path = pathlib.Path(path)
+    lines = ["\t".join(("trial", *Measurement._fields))]
+    for trial, m in enumerate(measurements, 1):
+        lines.append(
+            f"{trial}\t{m.wall_seconds:.6f}\t{m.user_seconds:.6f}\t"
+            f"{m.sys_seconds:.6f}\t{m.max_rss_kib}"
+        )
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    _ = tmp_path.write_text("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
+
+
+def read_measurements(
+    path: pathlib.Path | os.PathLike[typing.Any] | str,
+) -> list[Measurement]:
+    r"""Reads the measurements written by :func:`write_measurements`."""
+
+    with open(path) as f:
+        header = f.readline().rstrip("\n").split("\t")
+        columns = [header.index(field) for field in Measurement._fields]
+
+        measurements: list[Measurement] = []
+        for line in f:
+            values = line.rstrip("\n").split("\t")
+            measurements.append(
+                Measurement(
+                    float(values[columns[0]]),
+                    float(values[columns[1]]),
+                    float(values[columns[2]]),
+                    int(values[columns[3]]),
+                )
+            )
+
+    return measurements
+
+
+def _run_once(
+    job: Job,
+    writer: "_SolutionWriter",
+    timeout: float | None,
+    memory_limit: int | None,
+) -> Measurement | str:
+    r"""Runs a solver once, streaming its output into ``writer``.
+
+    The solver is started by a small helper process (see :data:`_MEASURE`), which
+    measures the resources that the solver alone uses.
+
+    :return: The resources used by the solver, or a message if it failed
+    """
+
+    read_fd, write_fd = os.pipe()
+    with (
+        open(read_fd, "rb") as report,
+        open(write_fd, "wb") as report_writer,
+        _edge_list_text(job.graph_dir) as stdin,
+        tempfile.TemporaryFile() as stderr,
+    ):
+        try:
+            proc = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-I",
+                    "-S",
+                    "-c",
+                    _MEASURE,
+                    str(write_fd),
+                    *_command_line(job.command, memory_limit),
+                ],
+                stdin=stdin,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                start_new_session=True,
+                pass_fds=(write_fd,),
+            )
+        except OSError as e:
+            return f"could not run '{job.command}': {e}"
+        finally:
+            # the report ends when the helper that writes it exits
+            report_writer.close()
+
+        # kill the solver from a timer rather than polling, as reading its output
+        # blocks until it exits or closes stdout; the solver runs in its own process
+        # group so that any processes it started, which may hold stdout open, are
+        # killed with it
+        timed_out = threading.Event()
+
+        def kill() -> None:
+            timed_out.set()
+            _kill(proc)
+
+        timer = threading.Timer(timeout, kill) if timeout is not None else None
+        if timer is not None:
+            timer.start()
+
+        error: str | None = None
+        try:
+            # a buffered pipe, whose read1 returns what has arrived so far
+            stdout = typing.cast(io.BufferedReader, proc.stdout)
+            with stdout:
+                while chunk := stdout.read1(_READ_SIZE):
+                    writer.write(chunk)
+        except ValueError as e:
+            error = str(e)
+            _kill(proc)
+        finally:
+            _ = proc.wait()
+            if timer is not None:
+                timer.cancel()
+
+        if timed_out.is_set():
+            return f"timed out after {timeout}s"
+        if error is not None:
+            return error
+
+        fields = report.read().split()
+        if len(fields) != 5:
+            return f"the solver was killed (exit code {proc.returncode})"
+        returncode = int(fields[0])
+        wall_seconds, user_seconds, sys_seconds = map(float, fields[1:4])
+        max_rss = int(fields[4])
+
+        if returncode != 0:
+            _ = stderr.seek(0)
+            message = stderr.read(_MAX_STDERR).decode(errors="replace").strip()
+            return f"exited with code {returncode}; stderr: {message}"
+
+    try:
+        writer.close()
+    except ValueError as e:
+        return str(e)
+
+    if writer.count != len(job.solution_names):
+        return (
+            f"expected {len(job.solution_names)} solution line(s), got {writer.count}"
+        )
+
+    if sys.platform == "darwin":
+        # reported in bytes rather than KiB
+        max_rss //= 1024
+
+    return Measurement(wall_seconds, user_seconds, sys_seconds, max_rss)
+
+
+def _kill(proc: subprocess.Popen[bytes]) -> None:
+    # the process group may be gone, and its ID reused, once the solver is reaped
+    if proc.returncode is None:
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(proc.pid, signal.SIGKILL)
+
+
+@contextlib.contextmanager
+def _edge_list_text(graph_dir: pathlib.Path) -> abc.Iterator[typing.BinaryIO]:
+    r"""Opens the edge list of a graph as plain text, decompressing a compressed one
+    into a temporary file first."""
+
+    path = edge_files.find(graph_dir)
+    if path is None:
+        raise FileNotFoundError(f"No edge list in '{graph_dir}'")
+
+    compression = edge_files.compression_of(path)
+    if compression is None:
+        with open(path, "rb") as f:
+            yield f
+        return
+
+    with tempfile.TemporaryFile() as f:
+        if compression == "dv":
+            with open(path, "rb") as src:
+                write_graph.to_edge_list_file(f, *edge_files.decode_delta(src.read()))
+        else:
+            with edge_files.open_edges(path) as src:
+                shutil.copyfileobj(src, f)
+        _ = f.seek(0)
+        yield typing.cast(typing.BinaryIO, f)
+
+
+def _command_line(command: str, memory_limit: int | None) -> list[str]:
+    args = shlex.split(command)
+
+    if memory_limit is not None:
+        # apply the limit in a shell that then replaces itself with the solver, as
+        # setting it in the child before exec is unsafe with threads
+        args = [
+            "/bin/sh",
+            "-c",
+            'ulimit -v "$0" && exec "$@"',
+            str(memory_limit * 1024),
+            *args,
+        ]
+
+    return args
+
+
+class _SolutionWriter:
+    r"""Parses ``node, node, ... => cardinality`` lines incrementally from chunks of
+    a solver's output, writing the nodes of each solution (one node per line) and its
+    cardinality to temporary files next to the result files.
+
+    :meth:`commit` moves the temporary files into place, and leaving the context
+    without committing removes them.
+    """
+
+    def __init__(self, res_dir: pathlib.Path, solution_names: tuple[str, ...]):
+        self._res_dir = res_dir
+        self._solution_names = solution_names
+        self._pending = b""
+        self._nodes_file: typing.BinaryIO | None = None
+        self._in_nodes = True
+        self._tmp_paths: dict[pathlib.Path, pathlib.Path] = {}
+        self.count = 0
+
+    def __enter__(self) -> "_SolutionWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._nodes_file is not None:
+            self._nodes_file.close()
+        for tmp_path in self._tmp_paths.values():
+            tmp_path.unlink(missing_ok=True)
+
+    def write(self, chunk: bytes) -> None:
+        buf = self._pending + chunk
+
+        while buf:
+            if self._in_nodes:
+                i = buf.find(b" => ")
+                newline = buf.find(b"\n", 0, i if i >= 0 else len(buf))
+                if newline >= 0:
+                    raise _malformed(buf[:newline])
+
+                if i < 0:
+                    # write the complete nodes so far; what follows the last
+                    # separator may be a partial node or a partial ' => '
+                    cut = buf.rfind(b", ") + 2
+                    if cut >= 2:
+                        self._write_nodes(buf[:cut])
+                        buf = buf[cut:]
+                    break
+
+                self._write_nodes(buf[:i])
+                assert self._nodes_file is not None
+                _ = self._nodes_file.write(b"\n")
+                self._nodes_file.close()
+                self._nodes_file = None
+                self._in_nodes = False
+                buf = buf[i + 4 :]
+            else:
+                newline = buf.find(b"\n")
+                if newline < 0:
+                    break
+
+                self._write_cardinality(buf[:newline])
+                buf = buf[newline + 1 :]
+
+        self._pending = buf
+
+    def close(self) -> None:
+        r"""Finishes the last solution, which need not end with a newline."""
+
+        if not self._in_nodes:
+            self._write_cardinality(self._pending)
+        elif self._pending.strip():
+            raise _malformed(self._pending)
+        self._pending = b""
+
+    def commit(self) -> None:
+        for path, tmp_path in self._tmp_paths.items():
+            os.replace(tmp_path, path)
+        self._tmp_paths.clear()
+
+    def _open(self, kind: str) -> typing.BinaryIO:
+        if self.count >= len(self._solution_names):
+            raise ValueError(
+                f"expected {len(self._solution_names)} solution line(s), got more"
+            )
+
+        path = self._res_dir / f"{self._solution_names[self.count]}_{kind}.txt"
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        self._tmp_paths[path] = tmp_path
+        return open(tmp_path, "wb")
+
+    def _write_nodes(self, data: bytes) -> None:
+        if self._nodes_file is None:
+            self._nodes_file = self._open("nodes")
+        _ = self._nodes_file.write(data.replace(b", ", b"\n"))
+
+    def _write_cardinality(self, data: bytes) -> None:
+        with self._open("cardinality") as f:
+            _ = f.write(data.strip())
+        self.count += 1
+        self._in_nodes = True
+
+
+def _malformed(line: bytes) -> ValueError:
+    return ValueError(
+        f"Malformed solver output: '{line[:80].decode(errors='replace')}'"
+    )
+
+
+def _results_exist(job: Job, results_dir: pathlib.Path) -> bool:
+    res_dir = results_dir / job.graph_dir.name
+    return all(
+        (res_dir / f"{name}_{kind}.txt").is_file()
+        for name in job.solution_names
+        for kind in ("nodes", "cardinality")
+    )
+
+
+def _elapsed(start: float) -> float:
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,28 @@
 #!/usr/bin/env python3
 
 import argparse
+import os
 import pathlib
+import typing
+from collections import abc
 
 import tabulate
-import yaml
+
+import graph_properties
+import properties_index
 
 __all__ = ["collect_data"]
 
+# columns of the table, before any that are selected explicitly
+_BASIC_COLUMNS = (
+    "order",
+    "size",
+    "max_degree",
+    "avg_degree",
+    "density",
+    "connected",
+)
+
 
 def main() -> None:
     parser = argparse.ArgumentParser(
@@ -38,33 +53,115 @@ def main() -> None:
             "package (default: simple)."
         ),
     )
+    _ = parser.add_argument(
+        "-d",
+        "--data_dir",
+        default="data/graphs/",
+        help=(
+            "Directory whose subdirectories contain the graphs (default: data/graphs/)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-w",
+        "--where",
+        action="append",
+        default=[],
+        metavar="FILTER",
+        help=(
+            "Only include the graphs that pass a filter such as 'order > 10000', "
+            "'connected' or 'not connected'; can be given multiple times (default: "
+            "all graphs)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-s",
+        "--sort",
+        action="append",
+        default=[],
+        metavar="PROPERTY",
+        help=(
+            "Sort the graphs by a property, in descending order if it is preceded by "
+            "'-', as in --sort=-size; can be given multiple times (default: by name)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-c",
+        "--column",
+        action="append",
+        default=[],
+        dest="columns",
+        metavar="PROPERTY",
+        help=(
+            "Add a column for a property, such as one of the extra properties ("
+            f"{', '.join(graph_properties.EXTRA_PROPERTIES)}), which is computed "
+            "first for the graphs that lack it; can be given multiple times "
+            "(default: only the basic properties)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help=(
+            "Number of worker processes computing extra properties (default: the "
+            "number of CPUs)"
+        ),
+    )
 
     args = parser.parse_args()
 
-    data = collect_data()
+    try:
+        data = collect_data(
+            args.data_dir, args.where, args.sort, args.columns, jobs=args.jobs
+        )
+    except ValueError as e:
+        parser.error(str(e))
 
     table_str = tabulate.tabulate(data, headers=data.keys(), tablefmt=args.format)
     print(table_str)
 
 
-def collect_data() -> dict[str, list[str] | list[int] | list[float] | list[bool]]:
-    data: dict[str, list[str] | list[int] | list[float] | list[bool]] = {
-        "name": [],
-        "order": [],
-        "size": [],
-        "max_degree": [],
-        "avg_degree": [],
-        "density": [],
-        "connected": [],
-    }
+def collect_data(
+    data_dir: pathlib.Path | os.PathLike[typing.Any] | str = "data/graphs/",
+    filters: abc.Iterable[str] = (),
+    sort: abc.Iterable[str] = (),
+    columns: abc.Iterable[str] = (),
+    jobs: int | None = None,
+) -> dict[str, list[str] | list[int] | list[float] | list[bool]]:
+    r"""Collects the properties of the graphs in ``data_dir`` from the properties
+    index (see :func:`properties_index.query` for the filters and sort keys).
+
+    :param columns: Properties to include after the basic ones; the name of one of
+        the :data:`graph_properties.EXTRA_PROPERTIES` stands for all of its keys.
+        The extra properties that these, the filters or the sort keys refer to are
+        computed first for the graphs that lack them (see
+        :func:`graph_properties.for_graphs_in_root`).
+    :param jobs: Number of worker processes computing extra properties
+    """
 
-    for path in pathlib.Path("data/graphs/").glob("*/properties.yaml"):
-        data["name"].append(path.parent.name)
-        with open(path) as f:
-            for k, v in yaml.load(f, yaml.SafeLoader).items():
-                data[k].append(v)
+    filters = list(filters)
+    sort = list(sort)
+
+    selected = list(_BASIC_COLUMNS)
+    for column in columns:
+        prop = graph_properties.EXTRA_PROPERTIES.get(column)
+        selected += prop.keys if prop is not None else [column]
+    selected = list(dict.fromkeys(selected))
+
+    referenced = {
+        *selected,
+        *(properties_index.parse_filter(spec)[0] for spec in filters),
+        *(key.lstrip("+-") for key in sort),
+    }
+    extra = [
+        name
+        for name, prop in graph_properties.EXTRA_PROPERTIES.items()
+        if referenced & set(prop.keys)
+    ]
+    if extra:
+        _ = graph_properties.for_graphs_in_root(data_dir, extra, jobs=jobs)
 
-    return data
+    return properties_index.query(data_dir, filters, sort, columns=selected)
 
 
 if __name__ == "__main__":
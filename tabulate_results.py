@@ -3,12 +3,31 @@
 import argparse
 import os
 import pathlib
+import statistics
 import typing
+from collections import abc
 
 import tabulate
-import yaml
 
-__all__ = ["collect_results"]
+import graph_properties
+import properties_index
+import results_db
+import run_experiments
+
+__all__ = ["AGGREGATES", "collect_results"]
+
+# functions that summarize the measurements of the trials of a solver run
+AGGREGATES: dict[str, abc.Callable[[list[float]], float]] = {
+    "median": statistics.median,
+    "mean": statistics.mean,
+    "min": min,
+    "max": max,
+}
+
+
+# the measurements of the solver runs, in the order of the columns of the runs table
+# of the results database
+_METRICS = ("wall_s", "cpu_s", "max_rss_mib")
 
 
 def main() -> None:
@@ -59,9 +78,66 @@ def main() -> None:
         ),
     )
 
+    _ = parser.add_argument(
+        "-a",
+        "--aggregate",
+        action="append",
+        choices=sorted(AGGREGATES),
+        help=(
+            "Add the wall time, CPU time and peak memory of each solver, aggregated "
+            "over the trials recorded in '<solver>_runs.tsv' with this function; can "
+            "be given multiple times (default: no time or memory columns)"
+        ),
+    )
+
+    _ = parser.add_argument(
+        "-b",
+        "--bounds",
+        action="store_true",
+        help=(
+            "Add the best lower and upper bounds on the size of a minimum vertex cover "
+            "of each graph, computed and cached if needed, and the gap of the size of "
+            "each solution to the lower bound"
+        ),
+    )
+
+    _ = parser.add_argument(
+        "-w",
+        "--where",
+        action="append",
+        default=[],
+        metavar="FILTER",
+        help=(
+            "Only include the graphs whose properties pass a filter such as "
+            "'order > 10000' or 'connected'; can be given multiple times (default: "
+            "all graphs)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-s",
+        "--sort",
+        action="append",
+        default=[],
+        metavar="PROPERTY",
+        help=(
+            "Sort the graphs by a property, in descending order if it is preceded by "
+            "'-', as in --sort=-size; can be given multiple times (default: by name)"
+        ),
+    )
+
     args = parser.parse_args()
 
-    data = collect_results(args.data_dir, args.results_dir)
+    try:
+        data = collect_results(
+            args.data_dir,
+            args.results_dir,
+            args.aggregate or (),
+            bounds=args.bounds,
+            filters=args.where,
+            sort=args.sort,
+        )
+    except ValueError as e:
+        parser.error(str(e))
 
     table_str = tabulate.tabulate(data, headers=data.keys(), tablefmt=args.format)
     print(table_str)
@@ -70,7 +146,31 @@ def main() -> None:
 def collect_results(
     data_dir: pathlib.Path | os.PathLike[typing.Any] | str,
     results_dir: pathlib.Path | os.PathLike[typing.Any] | str,
-) -> dict[str, list[str] | list[int] | list[float]]:
+    aggregates: abc.Sequence[str] = (),
+    bounds: bool = False,
+    filters: abc.Iterable[str] = (),
+    sort: abc.Iterable[str] = (),
+) -> dict[str, list[typing.Any]]:
+    r"""Collects the properties of each graph in ``results_dir``, as recorded in the
+    properties index of ``data_dir``, and the sizes of the solutions found for it.
+
+    The graphs are selected and ordered by their properties with ``filters`` and
+    ``sort`` as in :func:`properties_index.query`.
+
+    For each name in ``aggregates`` (see :data:`AGGREGATES`), columns named
+    ``<solver>_wall_s_<name>``, ``<solver>_cpu_s_<name>`` and
+    ``<solver>_max_rss_mib_<name>`` are added with the wall time, user plus system
+    CPU time and peak resident memory of each solver over its trials, or None for a
+    graph whose measurements were not recorded.
+
+    If ``bounds`` is true, the columns ``vc_lb`` and ``vc_ub`` are added with the
+    bounds on the size of a minimum vertex cover of :mod:`vc_bounds`, which are
+    computed for the graphs with results that do not have them yet (and added to
+    their ``properties.yaml``, leaving the other properties as they are), and a column
+    ``<algorithm>_gap`` with the relative gap ``(size - vc_lb) / vc_lb`` of each
+    solution, or None if either is missing or the lower bound is 0.
+    """
+
     if not os.fspath(data_dir):
         raise ValueError("Cannot specify an empty path or string for data_dir")
     else:
@@ -81,32 +181,67 @@ def collect_results(
     else:
         results_dir = pathlib.Path(results_dir)
 
-    data: dict[str, list[str] | list[int] | list[float]] = {
-        "name": [],
-        "order": [],
-        "size": [],
-        "max_degree": [],
-        "avg_degree": [],
-        "density": [],
-        "cvc_size": [],
-        "vc_size": [],
-        "local_ratio_vc_size": [],
-    }
-
-    for path in results_dir.iterdir():
-        assert path.is_dir(), f"Expected {path} to be a directory"
-        name = path.name
-        data["name"].append(name)
-
-        with open(data_dir / name / "properties.yaml") as f:
-            for k, v in yaml.load(f, yaml.SafeLoader).items():
-                if k not in data:
-                    continue
-                data[k].append(v)
-
-        for algo in ("cvc", "vc", "local_ratio_vc"):
-            with open(path / f"{algo}_cardinality.txt") as f:
-                data[f"{algo}_size"].append(int(f.read().strip()))
+    for aggregate in aggregates:
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"Unrecognized aggregate: {aggregate}")
+
+    results_root, experiment = results_dir.parent, results_dir.name
+    _ = results_db.import_results(results_root, [experiment])
+    sizes = results_db.solution_sizes(experiment, results_root)
+
+    # the measurements of each trial of each solver on each graph
+    runs = results_db.query(
+        "SELECT graph, solver, wall_seconds, user_seconds + sys_seconds, "
+        "max_rss_kib / 1024.0 FROM runs WHERE experiment = ? "
+        "ORDER BY graph, solver, trial",
+        (experiment,),
+        results_root,
+    )
+    metrics: dict[tuple[str, str], dict[str, list[float]]] = {}
+    for graph, solver, *values in zip(*runs.values(), strict=True):
+        by_metric = metrics.setdefault(
+            (graph, solver), {metric: [] for metric in _METRICS}
+        )
+        for metric, value in zip(_METRICS, values, strict=True):
+            by_metric[metric].append(value)
+
+    solvers = list(run_experiments.EXECUTABLE_PATH)
+    solvers += sorted({solver for _, solver in metrics} - set(solvers))
+    graphs = {graph for by_graph in sizes.values() for graph in by_graph}
+    graphs |= {graph for graph, _ in metrics}
+
+    columns = ["order", "size", "max_degree", "avg_degree", "density"]
+    if bounds:
+        _ = graph_properties.for_graphs_in_root(data_dir, ["vc_bounds"], graphs=graphs)
+        columns += ["vc_lb", "vc_ub"]
+
+    data: dict[str, list[typing.Any]] = properties_index.query(
+        data_dir, filters, sort, columns=columns
+    )
+    rows = [i for i, name in enumerate(data["name"]) if name in graphs]
+    data = {key: [values[i] for i in rows] for key, values in data.items()}
+
+    for algorithm, by_graph in sizes.items():
+        data[f"{algorithm}_size"] = [by_graph.get(name) for name in data["name"]]
+
+    if bounds:
+        for algorithm in sizes:
+            data[f"{algorithm}_gap"] = [
+                (size - lb) / lb if size is not None and lb else None
+                for size, lb in zip(
+                    data[f"{algorithm}_size"], data["vc_lb"], strict=True
+                )
+            ]
+
+    for aggregate in aggregates:
+        for solver in solvers:
+            for metric in _METRICS:
+                data[f"{solver}_{metric}_{aggregate}"] = [
+                    AGGREGATES[aggregate](trials)
+                    if (trials := metrics.get((name, solver), {}).get(metric))
+                    else None
+                    for name in data["name"]
+                ]
 
     return data
 
@@ -0,0 +1,178 @@
+import contextlib
+import http.server
+import io
+import logging
+import os
+import pathlib
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import download
+
+_ETAG = '"v1"'
+_LAST_MODIFIED = "Sun, 09 Sep 2001 01:46:40 GMT"
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    server: "_Server"
+
+    def do_GET(self) -> None:
+        self.server.requests.append((self.path, dict(self.headers)))
+        body = self.server.files.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+
+        if self.headers.get("If-None-Match") == _ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        start = 0
+        range_ = self.headers.get("Range")
+        if range_ and self.headers.get("If-Range", _ETAG) == _ETAG:
+            start = int(range_.removeprefix("bytes=").removesuffix("-"))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/*")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body) - start))
+        self.send_header("ETag", _ETAG)
+        self.send_header("Last-Modified", _LAST_MODIFIED)
+        self.end_headers()
+
+        # a connection that breaks off after some of the file
+        stop = self.server.cut_after.pop(self.path, len(body))
+        _ = self.wfile.write(body[start:stop])
+        self.close_connection = True
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.files: dict[str, bytes] = {}
+        self.cut_after: dict[str, int] = {}
+        self.requests: list[tuple[str, dict[str, str]]] = []
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+    def requests_for(self, path: str) -> list[dict[str, str]]:
+        return [headers for p, headers in self.requests if p == path]
+
+
+class TestDownload(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = pathlib.Path(tmp.name)
+        self.destdir = self.tmp / "downloads"
+
+        patcher = mock.patch.dict(
+            os.environ, {"VC_DOWNLOAD_CACHE": str(self.tmp / "cache")}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.server = _Server()
+        thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        )
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        # overwriting an existing file is logged as a warning
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        stdout = contextlib.redirect_stdout(io.StringIO())
+        _ = stdout.__enter__()
+        self.addCleanup(stdout.__exit__, None, None, None)
+
+    def _download(self, path: str, cache: bool = False) -> pathlib.Path:
+        return pathlib.Path(
+            download.download(self.server.url(path), destdir=self.destdir, cache=cache)
+        )
+
+    def test_manifest(self) -> None:
+        self.server.files = {"/a.zip": b"a" * 1000, "/b.zip": b"b" * 2000}
+        manifest = self.tmp / "manifest.txt"
+        _ = manifest.write_text(
+            "# graphs\n"
+            f"{self.server.url('/a.zip')}\n"
+            "\n"
+            f"{self.server.url('/b.zip')} renamed.zip\n"
+            f"{self.server.url('/missing.zip')}\n"
+        )
+
+        entries = download.read_manifest(manifest)
+        self.assertEqual(
+            entries,
+            [
+                (self.server.url("/a.zip"), None),
+                (self.server.url("/b.zip"), "renamed.zip"),
+                (self.server.url("/missing.zip"), None),
+            ],
+        )
+
+        outcomes = download.download_all(entries, self.destdir, cache=False)
+        by_url = {outcome.url: outcome for outcome in outcomes}
+        self.assertTrue(by_url[self.server.url("/a.zip")].ok)
+        self.assertTrue(by_url[self.server.url("/b.zip")].ok)
+        self.assertFalse(by_url[self.server.url("/missing.zip")].ok)
+        self.assertIn("404", by_url[self.server.url("/missing.zip")].message)
+
+        self.assertEqual((self.destdir / "a.zip").read_bytes(), b"a" * 1000)
+        self.assertEqual((self.destdir / "renamed.zip").read_bytes(), b"b" * 2000)
+        self.assertFalse((self.destdir / "missing.zip").exists())
+
+    def test_resumes_with_range_request(self) -> None:
+        body = bytes(range(256)) * 400
+        self.server.files["/g.zip"] = body
+        self.server.cut_after["/g.zip"] = 30_000
+
+        with self.assertRaisesRegex(OSError, "ended after"):
+            _ = self._download("/g.zip")
+        self.assertFalse((self.destdir / "g.zip").exists())
+
+        path = self._download("/g.zip")
+        self.assertEqual(path.read_bytes(), body)
+        first, second = self.server.requests_for("/g.zip")
+        self.assertNotIn("Range", first)
+        self.assertEqual(second["Range"], "bytes=30000-")
+        self.assertEqual(second["If-Range"], _ETAG)
+
+    def test_skips_unchanged_file(self) -> None:
+        self.server.files["/g.zip"] = b"g" * 1000
+        path = self._download("/g.zip")
+        mtime_ns = path.stat().st_mtime_ns
+
+        self.server.files["/g.zip"] = b"changed, but with the same ETag"
+        path = self._download("/g.zip")
+
+        self.assertEqual(path.read_bytes(), b"g" * 1000)
+        self.assertEqual(path.stat().st_mtime_ns, mtime_ns)
+        _, second = self.server.requests_for("/g.zip")
+        self.assertEqual(second["If-None-Match"], _ETAG)
+        self.assertEqual(second["If-Modified-Since"], _LAST_MODIFIED)
+
+    def test_failure_leaves_no_truncated_file(self) -> None:
+        self.destdir.mkdir()
+        _ = (self.destdir / "g.zip").write_bytes(b"old")
+        self.server.files["/g.zip"] = b"new" * 10_000
+        self.server.cut_after["/g.zip"] = 1000
+
+        with self.assertRaisesRegex(OSError, "ended after"):
+            _ = self._download("/g.zip", cache=True)
+
+        self.assertEqual((self.destdir / "g.zip").read_bytes(), b"old")
+        self.assertIsNone(download.download_cache.lookup(self.server.url("/g.zip")))
+
+
+if __name__ == "__main__":
+    unittest.main()
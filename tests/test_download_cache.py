@@ -0,0 +1,62 @@
+import os
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+import download_cache
+
+# an old modification time, as set from the Last-Modified header of a download
+_LAST_MODIFIED = 1_000_000_000
+
+
+class TestDownloadCache(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = pathlib.Path(tmp.name)
+        patcher = mock.patch.dict(
+            os.environ, {"VC_DOWNLOAD_CACHE": str(self.tmp / "cache")}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _download(self, name: str, size: int) -> pathlib.Path:
+        path = self.tmp / name
+        _ = path.write_bytes(name.encode().ljust(size, b"."))
+        os.utime(path, (_LAST_MODIFIED, _LAST_MODIFIED))
+        return path
+
+    def test_lookup_finds_added_file(self) -> None:
+        path = self._download("a", 100)
+        obj_path = download_cache.add("http://x/a", path)
+        self.assertEqual(download_cache.lookup("http://x/a"), obj_path)
+        self.assertEqual(obj_path.read_bytes(), path.read_bytes())
+        self.assertIsNone(download_cache.lookup("http://x/b"))
+
+    def test_evicts_least_recently_used(self) -> None:
+        a = self._download("a", 100)
+        _ = download_cache.add("http://x/a", a, max_bytes=1000)
+        b = self._download("b", 100)
+        _ = download_cache.add("http://x/b", b, max_bytes=1000)
+        _ = download_cache.lookup("http://x/a")
+
+        c = self._download("c", 100)
+        _ = download_cache.add("http://x/c", c, max_bytes=200)
+
+        self.assertIsNotNone(download_cache.lookup("http://x/a"))
+        self.assertIsNone(download_cache.lookup("http://x/b"))
+        self.assertIsNotNone(download_cache.lookup("http://x/c"))
+        # the entry of the evicted file is removed
+        entries = list((self.tmp / "cache" / "urls").glob("*.json"))
+        self.assertEqual(len(entries), 2)
+
+    def test_keeps_times_of_downloaded_file(self) -> None:
+        path = self._download("a", 100)
+        _ = download_cache.add("http://x/a", path)
+        _ = download_cache.lookup("http://x/a")
+        self.assertEqual(path.stat().st_mtime, _LAST_MODIFIED)
+
+
+if __name__ == "__main__":
+    unittest.main()
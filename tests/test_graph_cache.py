@@ -0,0 +1,44 @@
+import os
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import graph_cache
+from csr_graph import CSRGraph
+
+
+class TestGraphCache(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.edges_path = pathlib.Path(tmp.name) / "graph.edges"
+        _ = self.edges_path.write_text("0 1\n1 2\n")
+        self.g = CSRGraph.from_edges([0, 1], [1, 2])
+        _ = graph_cache.store(self.edges_path, self.g)
+
+    def _touch(self) -> None:
+        stat = self.edges_path.stat()
+        os.utime(self.edges_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def test_round_trip(self) -> None:
+        g = graph_cache.load(self.edges_path)
+        assert g is not None
+        np.testing.assert_array_equal(g.indptr, self.g.indptr)
+        np.testing.assert_array_equal(g.indices, self.g.indices)
+
+    def test_touched_file_is_hashed_once(self) -> None:
+        self._touch()
+        with mock.patch.object(
+            graph_cache, "_sha256", wraps=graph_cache._sha256
+        ) as sha256:
+            self.assertIsNotNone(graph_cache.load(self.edges_path))
+            self.assertIsNotNone(graph_cache.load(self.edges_path))
+        self.assertEqual(sha256.call_count, 1)
+
+    def test_changed_file_is_stale(self) -> None:
+        _ = self.edges_path.write_text("0 2\n1 2\n")
+        self._touch()
+        self.assertIsNone(graph_cache.load(self.edges_path))
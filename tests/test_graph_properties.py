@@ -0,0 +1,78 @@
+import contextlib
+import io
+import pathlib
+import tempfile
+import unittest
+
+import graph_properties
+import tabulate_graph_properties
+
+# a path and a triangle, as in a graph whose original file also had isolated nodes,
+# which the edge list does not represent
+_EDGES = "0 1\n1 2\n3 4\n4 5\n5 3\n"
+_PROPERTIES = (
+    "order: 9\n"
+    "size: 5\n"
+    "max_degree: 2\n"
+    "avg_degree: 1.1111111111111112\n"
+    "density: 0.1388888888888889\n"
+    "connected: no\n"
+)
+
+
+class TestForGraph(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = pathlib.Path(tmp.name) / "g"
+        self.dir.mkdir()
+        _ = (self.dir / "graph.edges").write_text(_EDGES)
+        stdout = contextlib.redirect_stdout(io.StringIO())
+        _ = stdout.__enter__()
+        self.addCleanup(stdout.__exit__, None, None, None)
+
+    def test_writes_missing_properties(self) -> None:
+        graph_properties.for_graph(self.dir)
+        props = graph_properties._read_yaml(self.dir / "properties.yaml")
+        self.assertEqual(props["order"], 6)
+        self.assertEqual(props["size"], 5)
+        self.assertFalse(props["connected"])
+
+    def test_keeps_existing_properties(self) -> None:
+        _ = (self.dir / "properties.yaml").write_text(_PROPERTIES)
+        graph_properties.for_graph(self.dir)
+        self.assertEqual((self.dir / "properties.yaml").read_text(), _PROPERTIES)
+
+    def test_adds_extra_properties_only(self) -> None:
+        _ = (self.dir / "properties.yaml").write_text(_PROPERTIES)
+        rewritten = graph_properties.for_graphs_in_root(
+            self.dir.parent, ["degeneracy", "bipartite"], jobs=1
+        )
+        self.assertEqual(rewritten, 1)
+
+        text = (self.dir / "properties.yaml").read_text()
+        self.assertTrue(text.startswith(_PROPERTIES))
+        props = graph_properties._read_yaml(self.dir / "properties.yaml")
+        self.assertEqual(props["degeneracy"], 2)
+        self.assertFalse(props["bipartite"])
+
+        # cached until the graph changes
+        self.assertEqual(
+            graph_properties.for_graphs_in_root(self.dir.parent, ["degeneracy"]), 0
+        )
+
+    def test_counts_isolated_nodes_in_extra_properties(self) -> None:
+        _ = (self.dir / "properties.yaml").write_text(_PROPERTIES)
+        data = tabulate_graph_properties.collect_data(
+            self.dir.parent, columns=["degree_histogram"], jobs=1
+        )
+
+        self.assertEqual(data["order"], [9])
+        self.assertEqual(data["connected"], [False])
+        self.assertEqual(data["degree_histogram"], ["0:3 1:2 2-3:4"])
+        text = (self.dir / "properties.yaml").read_text()
+        self.assertTrue(text.startswith(_PROPERTIES))
+
+
+if __name__ == "__main__":
+    unittest.main()
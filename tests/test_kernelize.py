@@ -0,0 +1,53 @@
+import itertools
+import logging
+import unittest
+
+import numpy as np
+import numpy.typing as npt
+
+import kernelize
+from csr_graph import CSRGraph
+
+
+def _minimum_cover(
+    sources: npt.NDArray[np.int64], targets: npt.NDArray[np.int64], n: int
+) -> npt.NDArray[np.bool_]:
+    r"""Finds a minimum vertex cover by trying every subset of the nodes."""
+
+    subsets = (np.arange(1 << n)[:, None] >> np.arange(n) & 1).astype(bool)
+    is_cover = (subsets[:, sources] | subsets[:, targets]).all(axis=1)
+    covers = subsets[is_cover]
+    return covers[np.argmin(covers.sum(axis=1))]
+
+
+class TestKernelize(unittest.TestCase):
+    def setUp(self) -> None:
+        logging.disable(logging.INFO)
+        self.addCleanup(logging.disable, logging.NOTSET)
+
+    def test_lifts_minimum_covers(self) -> None:
+        rng = np.random.default_rng(0)
+        for case in range(300):
+            n = int(rng.integers(1, 11))
+            pairs = np.array(list(itertools.combinations_with_replacement(range(n), 2)))
+            # self-loops are rarer than other edges
+            p = np.where(pairs[:, 0] == pairs[:, 1], 0.05, rng.uniform(0.1, 0.7))
+            pairs = pairs[rng.random(len(pairs)) < p].reshape(-1, 2)
+            g = CSRGraph.from_edges(pairs[:, 0], pairs[:, 1], num_nodes=n)
+
+            with self.subTest(case=case, edges=pairs.tolist()):
+                kernel = kernelize.kernelize(g)
+                log = kernel.log
+                k = log.kernel_nodes.size
+                kernel_cover = np.flatnonzero(
+                    _minimum_cover(
+                        np.searchsorted(log.kernel_nodes, kernel.sources),
+                        np.searchsorted(log.kernel_nodes, kernel.targets),
+                        k,
+                    )
+                )
+
+                cover = kernelize.lift(log, kernel_cover)
+                sources, targets = g.edges()
+                self.assertTrue((cover[sources] | cover[targets]).all())
+                self.assertEqual(cover.sum(), _minimum_cover(sources, targets, n).sum())
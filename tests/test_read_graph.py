@@ -0,0 +1,79 @@
+import logging
+import pathlib
+import random
+import tempfile
+import unittest
+
+import read_graph
+
+# edge lists on which the vectorized parser must agree with reading the lines of
+# the file in text mode and parsing them with parse_edge_list
+_CASES = [
+    b"0 1\n1 2\n2 0\n",
+    b"# comment\n0 1 % trailing comment\n%\n1 2 3.5 weight\n\n2\n",
+    b"1,2\n2 ,3,4\n,3 4\n",
+    b"1 2\na b\n3 4\n",
+    b"03 3\n7 00\n0 0\n",
+    b"1 2\r\n2 3\r\n",
+    b"1\r2\n3 4\r5 6\r",
+    b"1 2 # c\r3 4\n",
+    b"a\x0bb c\n",
+    b"1\x0b2\x0c3\n4\x1c5\n",
+    "a b\u2028c d\n".encode(),
+    "a\x85b c\n".encode(),
+    b"5 6",
+    b"5 6\r",
+    b"",
+]
+
+# tokens and separators that random edge lists are made of
+_ALPHABET = ["0", "1", "7", "02", "10", "x", " ", "\t", ",", "#", "\x0b", "\n"]
+_ALPHABET += ["\r", "\r\n"]
+
+_CHUNK_SIZES = [1, 2, 3, 5, 8, 64, 1 << 23]
+
+
+def _baseline(path: pathlib.Path) -> tuple[set[str], set[frozenset[str]]]:
+    with open(path) as f:
+        g = read_graph.parse_edge_list(f.readlines())
+    return set(g), {frozenset(e) for e in g.edges}
+
+
+def _vectorized(
+    path: pathlib.Path, chunk_size: int
+) -> tuple[set[str], set[frozenset[str]]]:
+    g = read_graph.from_edge_arrays(read_graph.read_edge_arrays(path, chunk_size))
+    return {str(u) for u in g}, {frozenset(map(str, e)) for e in g.edges}
+
+
+class TestReadEdgeArrays(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = pathlib.Path(tmp.name) / "graph.edges"
+
+        # lines with less than 2 tokens are logged as warnings
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+
+    def _check(self, data: bytes) -> None:
+        _ = self.path.write_bytes(data)
+        expected = _baseline(self.path)
+        for chunk_size in _CHUNK_SIZES:
+            with self.subTest(data=data, chunk_size=chunk_size):
+                self.assertEqual(_vectorized(self.path, chunk_size), expected)
+
+    def test_agrees_with_parse_edge_list(self) -> None:
+        for data in _CASES:
+            self._check(data)
+
+    def test_agrees_with_parse_edge_list_on_random_files(self) -> None:
+        rng = random.Random(0)
+        for _ in range(200):
+            text = "".join(rng.choices(_ALPHABET, k=rng.randrange(40)))
+            self._check(text.encode())
+
+    def test_leading_zeros_are_string_labels(self) -> None:
+        _ = self.path.write_bytes(b"03 3\n7 00\n")
+        edges = read_graph.read_edge_arrays(self.path)
+        self.assertEqual(edges.labels, ["03", "3", "7", "00"])
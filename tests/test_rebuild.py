@@ -0,0 +1,89 @@
+import contextlib
+import io
+import json
+import pathlib
+import tempfile
+import unittest
+
+import graph_properties
+import manifest
+import rebuild
+import run_experiments
+
+from . import test_run_experiments
+
+# a triangle, in a graph whose original file also had two isolated nodes
+_EDGES = "0 1\n1 2\n2 0\n"
+_PROPERTIES = (
+    "order: 5\nsize: 3\nmax_degree: 2\navg_degree: 1.2\ndensity: 0.3\nconnected: no\n"
+)
+
+
+class TestRebuild(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data_dir = pathlib.Path(tmp.name) / "graphs"
+        self.results_dir = pathlib.Path(tmp.name) / "results"
+        self.dir = self.data_dir / "g"
+        self.dir.mkdir(parents=True)
+        _ = (self.dir / "graph.edges").write_text(_EDGES)
+        _ = (self.dir / "properties.yaml").write_text(_PROPERTIES)
+        stdout = contextlib.redirect_stdout(io.StringIO())
+        _ = stdout.__enter__()
+        self.addCleanup(stdout.__exit__, None, None, None)
+
+    def _rebuild(self) -> str:
+        r"""Returns what happened to the properties of the graph."""
+
+        outcomes = rebuild.rebuild(
+            self.data_dir, self.results_dir, graphs=["g"], solvers={}
+        )
+        (status,) = (
+            outcome.status
+            for outcome in outcomes
+            if outcome.target.dir == self.dir and outcome.target.name == "properties"
+        )
+        return status
+
+    def test_adopts_existing_properties(self) -> None:
+        self.assertEqual(self._rebuild(), "adopted")
+        self.assertEqual((self.dir / "properties.yaml").read_text(), _PROPERTIES)
+        self.assertEqual(self._rebuild(), "up to date")
+
+    def test_recomputes_properties_of_changed_edges(self) -> None:
+        _ = self._rebuild()
+        with open(self.dir / "graph.edges", "a") as f:
+            _ = f.write("2 3\n")
+
+        self.assertEqual(self._rebuild(), "rebuilt")
+        props = graph_properties._read_yaml(self.dir / "properties.yaml")
+        self.assertEqual(props["size"], 4)
+        # the isolated nodes are kept
+        self.assertEqual(props["order"], 6)
+        self.assertFalse(props["connected"])
+        self.assertEqual(self._rebuild(), "up to date")
+
+    def test_fails_without_the_isolated_nodes(self) -> None:
+        _ = self._rebuild()
+        path = self.dir / manifest.MANIFEST_NAME
+        data = json.loads(path.read_text())
+        del data["artifacts"]["properties"]["notes"]
+        _ = path.write_text(json.dumps(data))
+        _ = (self.dir / "graph.edges").write_text(_EDGES + "2 3\n")
+
+        self.assertEqual(self._rebuild(), "failed")
+        self.assertEqual((self.dir / "properties.yaml").read_text(), _PROPERTIES)
+
+    def test_results_do_not_depend_on_the_runner_source(self) -> None:
+        command = test_run_experiments._command("ok", "stub")
+        job = run_experiments.Job(self.dir, "stub", command, ("stub",), 3)
+        self.assertTrue(run_experiments.run_job(job, self.results_dir).ok)
+
+        targets = rebuild.plan(
+            self.dir, self.results_dir, manifest.Hasher(), {"stub": command}
+        )
+        (tool,) = (target.tool for target in targets if target.name == "results:stub")
+        self.assertNotIn("module:run_experiments", tool)
+        self.assertEqual(tool["command"], command)
+        self.assertEqual(tool["format"], str(run_experiments.RESULTS_FORMAT_VERSION))
@@ -0,0 +1,162 @@
+import contextlib
+import io
+import logging
+import pathlib
+import shlex
+import sys
+import tempfile
+import unittest
+
+import run_experiments
+
+# a solver that behaves as given by its first argument: 'ok' prints a cover with all
+# the nodes of the edge list it reads, once per solution named by the remaining
+# arguments, 'sleep' hangs, 'fail' exits with an error and 'garbage' prints output
+# that is not a solution
+_STUB = """
+import sys, time
+mode = sys.argv[1]
+if mode == "ok":
+    nodes = sorted({int(x) for line in sys.stdin for x in line.split()})
+    for _ in sys.argv[2:]:
+        print(", ".join(map(str, nodes)) + f" => {len(nodes)}")
+elif mode == "sleep":
+    time.sleep(60)
+elif mode == "fail":
+    print("out of cheese", file=sys.stderr)
+    sys.exit(3)
+else:
+    print("not a solution")
+"""
+
+_EDGES = "0 1\n1 2\n2 0\n2 3\n"
+
+
+def _command(mode: str, *solution_names: str) -> str:
+    return shlex.join([sys.executable, "-c", _STUB, mode, *solution_names])
+
+
+class TestRunExperiments(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data_dir = pathlib.Path(tmp.name) / "graphs"
+        self.results_dir = pathlib.Path(tmp.name) / "results" / "exp"
+        self.res_dir = self.results_dir / "g"
+
+        graph_dir = self.data_dir / "g"
+        graph_dir.mkdir(parents=True)
+        _ = (graph_dir / "graph.edges").write_text(_EDGES)
+        _ = (graph_dir / "properties.yaml").write_text("size: 4\nconnected: yes\n")
+
+        logging.disable(logging.INFO)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        stdout = contextlib.redirect_stdout(io.StringIO())
+        _ = stdout.__enter__()
+        self.addCleanup(stdout.__exit__, None, None, None)
+
+    def _job(self, mode: str, solver: str = "stub") -> run_experiments.Job:
+        jobs = run_experiments.plan_jobs(
+            self.data_dir, self.results_dir, {solver: _command(mode, solver)}
+        )
+        self.assertEqual(len(jobs), 1)
+        return jobs[0]
+
+    def _result_files(self) -> list[str]:
+        if not self.res_dir.exists():
+            return []
+        return sorted(path.name for path in self.res_dir.iterdir())
+
+    def test_success(self) -> None:
+        outcome = run_experiments.run_job(self._job("ok"), self.results_dir, trials=2)
+
+        self.assertTrue(outcome.ok, outcome.message)
+        self.assertEqual(len(outcome.measurements), 2)
+        self.assertEqual(
+            self._result_files(),
+            ["stub_cardinality.txt", "stub_nodes.txt", "stub_runs.tsv"],
+        )
+        self.assertEqual((self.res_dir / "stub_nodes.txt").read_text(), "0\n1\n2\n3\n")
+        self.assertEqual((self.res_dir / "stub_cardinality.txt").read_text(), "4")
+        measurements = run_experiments.read_measurements(self.res_dir / "stub_runs.tsv")
+        self.assertEqual(
+            [m.max_rss_kib for m in measurements],
+            [m.max_rss_kib for m in outcome.measurements],
+        )
+        for m in measurements:
+            self.assertGreater(m.wall_seconds, 0)
+
+    def test_several_solutions(self) -> None:
+        job = self._job("ok", "vc")
+        self.assertEqual(job.solution_names, ("cvc", "vc"))
+        job = job._replace(command=_command("ok", "cvc", "vc"))
+
+        outcome = run_experiments.run_job(job, self.results_dir)
+
+        self.assertTrue(outcome.ok, outcome.message)
+        self.assertEqual((self.res_dir / "cvc_cardinality.txt").read_text(), "4")
+        self.assertEqual((self.res_dir / "vc_cardinality.txt").read_text(), "4")
+
+    def test_timeout(self) -> None:
+        outcome = run_experiments.run_job(
+            self._job("sleep"), self.results_dir, timeout=0.5
+        )
+
+        self.assertFalse(outcome.ok)
+        self.assertIn("timed out", outcome.message)
+        self.assertLess(outcome.seconds, 30)
+        self.assertEqual(self._result_files(), [])
+
+    def test_nonzero_exit(self) -> None:
+        outcome = run_experiments.run_job(self._job("fail"), self.results_dir)
+
+        self.assertFalse(outcome.ok)
+        self.assertIn("exited with code 3", outcome.message)
+        self.assertIn("out of cheese", outcome.message)
+        self.assertEqual(self._result_files(), [])
+
+    def test_malformed_output(self) -> None:
+        outcome = run_experiments.run_job(self._job("garbage"), self.results_dir)
+
+        self.assertFalse(outcome.ok)
+        self.assertIn("Malformed solver output", outcome.message)
+        self.assertEqual(self._result_files(), [])
+
+    def test_wrong_number_of_solutions(self) -> None:
+        job = self._job("ok")._replace(command=_command("ok", "a", "b"))
+        outcome = run_experiments.run_job(job, self.results_dir)
+
+        self.assertFalse(outcome.ok)
+        self.assertIn("expected 1 solution line(s)", outcome.message)
+        self.assertEqual(self._result_files(), [])
+
+    def test_skips_finished_runs(self) -> None:
+        solvers = {"stub": _command("ok", "stub"), "bad": _command("fail")}
+        jobs = run_experiments.plan_jobs(self.data_dir, self.results_dir, solvers)
+        outcomes = run_experiments.run(jobs, self.results_dir, max_workers=2)
+        self.assertEqual(
+            {outcome.job.solver: outcome.ok for outcome in outcomes},
+            {"stub": True, "bad": False},
+        )
+
+        # only the failed run is planned again, unless forced
+        jobs = run_experiments.plan_jobs(self.data_dir, self.results_dir, solvers)
+        self.assertEqual([job.solver for job in jobs], ["bad"])
+        jobs = run_experiments.plan_jobs(
+            self.data_dir, self.results_dir, solvers, force=True
+        )
+        self.assertEqual([job.solver for job in jobs], ["bad", "stub"])
+
+    def test_skips_disconnected_graphs(self) -> None:
+        _ = (self.data_dir / "g" / "properties.yaml").write_text(
+            "size: 4\nconnected: no\n"
+        )
+        solvers = {"stub": _command("ok", "stub")}
+
+        self.assertEqual(
+            run_experiments.plan_jobs(self.data_dir, self.results_dir, solvers), []
+        )
+        jobs = run_experiments.plan_jobs(
+            self.data_dir, self.results_dir, solvers, include_disconnected=True
+        )
+        self.assertEqual(len(jobs), 1)
@@ -0,0 +1,42 @@
+import itertools
+import unittest
+
+import numpy as np
+
+import vc_bounds
+from csr_graph import CSRGraph
+
+
+def _minimum_cover_size(n: int, edges: list[tuple[int, int]]) -> int:
+    for k in range(n + 1):
+        for nodes in itertools.combinations(range(n), k):
+            cover = set(nodes)
+            if all(u in cover or v in cover for u, v in edges):
+                return k
+    raise AssertionError("unreachable")
+
+
+class TestCompute(unittest.TestCase):
+    def test_bounds_enclose_the_minimum_cover(self) -> None:
+        rng = np.random.default_rng(1)
+        for _ in range(100):
+            n = int(rng.integers(1, 10))
+            pairs = list(itertools.combinations_with_replacement(range(n), 2))
+            keep = rng.random(len(pairs)) < rng.uniform(0.1, 0.6)
+            edges = [pair for pair, kept in zip(pairs, keep, strict=True) if kept]
+            sources = np.array([u for u, _ in edges], dtype=np.int64)
+            targets = np.array([v for _, v in edges], dtype=np.int64)
+            g = CSRGraph.from_edges(sources, targets, num_nodes=n)
+
+            bounds = vc_bounds.compute(g)
+            optimum = _minimum_cover_size(n, edges)
+            with self.subTest(n=n, edges=edges):
+                for key in vc_bounds.KEYS:
+                    if key.startswith("vc_lb"):
+                        self.assertLessEqual(bounds[key], optimum, key)
+                    else:
+                        self.assertGreaterEqual(bounds[key], optimum, key)
+
+
+if __name__ == "__main__":
+    unittest.main()
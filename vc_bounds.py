@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+
+import argparse
+
+import numpy as np
+import numpy.typing as npt
+import scipy.sparse
+import scipy.sparse.csgraph
+import tabulate
+
+import utils
+from csr_graph import CSRGraph
+
+__all__ = [
+    "KEYS",
+    "compute",
+    "degree_bound",
+    "half_integral_lp",
+    "lp_cover",
+    "maximal_matching",
+    "parallel_greedy_cover",
+    "prune_cover",
+]
+
+logger = utils.configure_logger(__name__)
+
+# names of the bounds on the size of a minimum vertex cover computed by `compute`
+KEYS = (
+    "vc_lb_matching",
+    "vc_lb_lp",
+    "vc_lb_degree",
+    "vc_lb",
+    "vc_ub_matching",
+    "vc_ub_greedy",
+    "vc_ub_lp",
+    "vc_ub",
+)
+
+# seed of the random priorities, so that the bounds of a graph are reproducible
+_SEED = 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compute lower and upper bounds on the size of a minimum vertex cover of "
+            "each graph in the data directory, caching them in 'properties.yaml', "
+            "and print them."
+        )
+    )
+    _ = parser.add_argument(
+        "-d",
+        "--data_dir",
+        default="data/graphs/",
+        help=(
+            "Directory whose subdirectories contain the graphs (default: data/graphs/)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-w",
+        "--where",
+        action="append",
+        default=[],
+        metavar="FILTER",
+        help=(
+            "Only include the graphs that pass a filter such as 'order > 10000' or "
+            "'connected'; can be given multiple times (default: all graphs)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Number of worker processes (default: the number of CPUs)",
+    )
+    _ = parser.add_argument(
+        "-f",
+        "--format",
+        default="simple",
+        help=(
+            "Name of the format of the output table as used by the python-tabulate "
+            "package (default: simple)."
+        ),
+    )
+
+    args = parser.parse_args()
+
+    # imported here, as graph_properties registers the bounds as a property
+    import graph_properties
+    import properties_index
+
+    try:
+        # the bounds are only computed for the graphs that pass the other filters
+        others = [
+            spec
+            for spec in args.where
+            if properties_index.parse_filter(spec)[0] not in KEYS
+        ]
+        graphs = properties_index.query(args.data_dir, others, columns=())["name"]
+        _ = graph_properties.for_graphs_in_root(
+            args.data_dir, ["vc_bounds"], args.jobs, graphs
+        )
+        data = properties_index.query(
+            args.data_dir, [*args.where, "vc_lb >= 0"], columns=KEYS
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(tabulate.tabulate(data, headers=data.keys(), tablefmt=args.format))
+
+
+def compute(g: CSRGraph) -> dict[str, int]:
+    r"""Computes lower and upper bounds on the size of a minimum vertex cover of a
+    graph, each of which is certified: the lower bounds by the structures they are
+    derived from, and the upper bounds by covers that are checked to cover every
+    edge.
+
+    * ``"vc_lb_matching"``: the size of a maximal matching, as every cover has an
+      endpoint of each of its edges (see :func:`maximal_matching`)
+    * ``"vc_lb_lp"``: the optimum of the linear-programming relaxation, rounded up,
+      which is at least the size of a maximum matching and equals the size of a
+      minimum cover of a bipartite graph (see :func:`lp_cover`)
+    * ``"vc_lb_degree"``: the least number of nodes whose degrees add up to the
+      number of edges (see :func:`degree_bound`)
+    * ``"vc_ub_matching"``: the endpoints of the maximal matching
+    * ``"vc_ub_greedy"``: a greedy cover (see :func:`parallel_greedy_cover`)
+    * ``"vc_ub_lp"``: the optimum of the relaxation rounded to a cover, which is at
+      most twice the optimum
+    * ``"vc_lb"`` and ``"vc_ub"``: the best of each
+
+    Each cover is pruned with :func:`prune_cover` before it is counted.
+    """
+
+    loops = g._rows()[g._selfloop_entries()]
+    if loops.size:
+        # the nodes with self-loops are in every cover; the bounds of the rest of the
+        # graph hold without their loops
+        g = g.without_selfloops()
+
+    sources, targets = g.edges()
+    degrees = g.degree()
+
+    matching = maximal_matching(sources, targets, g.order())
+    lp_bound, lp = lp_cover(g)
+    lower = {
+        "vc_lb_matching": int(matching.size),
+        "vc_lb_lp": lp_bound,
+        "vc_lb_degree": degree_bound(degrees),
+    }
+
+    covers: dict[str, npt.NDArray[np.bool_]] = {}
+    covers["vc_ub_matching"] = np.zeros(g.order(), dtype=np.bool_)
+    covers["vc_ub_matching"][sources[matching]] = True
+    covers["vc_ub_matching"][targets[matching]] = True
+    covers["vc_ub_greedy"] = parallel_greedy_cover(g)
+    covers["vc_ub_lp"] = lp
+
+    upper: dict[str, int] = {}
+    for key, cover in covers.items():
+        cover = prune_cover(g, cover)
+        cover[loops] = True
+        if not (cover[sources] | cover[targets]).all():
+            raise RuntimeError(f"The cover for {key} misses an edge")
+        upper[key] = int(np.count_nonzero(cover))
+
+    # removing the loops does not make the minimum cover larger, and every cover
+    # has the nodes with self-loops
+    lower = {key: max(val, int(loops.size)) for key, val in lower.items()}
+
+    return {
+        **lower,
+        "vc_lb": max(lower.values()),
+        **upper,
+        "vc_ub": min(upper.values()),
+    }
+
+
+def maximal_matching(
+    sources: npt.NDArray[np.int64], targets: npt.NDArray[np.int64], num_nodes: int
+) -> npt.NDArray[np.int64]:
+    r"""Finds a maximal matching of a graph without self-loops.
+
+    The edges are given random priorities, and in each round every edge that has
+    the highest priority among the remaining edges at both of its endpoints joins
+    the matching, after which the edges at the matched nodes are removed; this takes
+    a logarithmic number of rounds in expectation.
+
+    :return: The indices of the edges in the matching
+    """
+
+    priority = np.random.default_rng(_SEED).permutation(sources.size)
+    live = np.arange(sources.size)
+    matched_nodes = np.zeros(num_nodes, dtype=np.bool_)
+    matching: list[npt.NDArray[np.int64]] = []
+
+    while live.size:
+        us, vs, ps = sources[live], targets[live], priority[live]
+        best = np.full(num_nodes, -1, dtype=np.int64)
+        np.maximum.at(best, us, ps)
+        np.maximum.at(best, vs, ps)
+
+        chosen = (best[us] == ps) & (best[vs] == ps)
+        matching.append(live[chosen])
+        matched_nodes[us[chosen]] = True
+        matched_nodes[vs[chosen]] = True
+        live = live[~(matched_nodes[us] | matched_nodes[vs])]
+
+    return np.sort(np.concatenate(matching)) if matching else live
+
+
+def lp_cover(g: CSRGraph) -> tuple[int, npt.NDArray[np.bool_]]:
+    r"""Solves the linear-programming relaxation of the vertex cover problem of a
+    graph without self-loops exactly (see :func:`half_integral_lp`).
+
+    :return: The optimum of the relaxation rounded up, which is a lower bound, and
+        the nodes with a positive value in the solution, which form a cover of at
+        most twice the optimum
+    """
+
+    doubled = half_integral_lp(g)
+    return (int(doubled.sum()) + 1) // 2, doubled > 0
+
+
+def half_integral_lp(g: CSRGraph) -> npt.NDArray[np.int8]:
+    r"""Finds an optimal solution of the linear-programming relaxation of the vertex
+    cover problem of a graph without self-loops, whose values are all 0, 1/2 or 1,
+    through a maximum matching of its bipartite double cover.
+
+    The double cover has a left copy and a right copy of each node, and an edge
+    between the left copy of each node and the right copies of its neighbors.  Its
+    maximum matching is found as a maximum flow from a source joined to the left
+    copies to a sink joined to the right copies, with Dinic's algorithm, which is
+    fast on such unit-capacity networks.  The copies on the two sides of a minimum
+    cut, i.e., the unreached left copies and the reached right copies in the
+    residual network, form a minimum cover of the double cover (König's theorem),
+    and giving each node half the number of its copies in it is an optimal solution
+    of the relaxation, whose value is thus half the size of the matching.
+
+    :return: Twice the value of each node, i.e., the number of its copies in the
+        minimum cover of the double cover
+    """
+
+    n = g.order()
+    if n == 0 or g.indices.size == 0:
+        return np.zeros(n, dtype=np.int8)
+
+    source, sink = 2 * n, 2 * n + 1
+    rows = np.concatenate((np.full(n, source), g._rows(), n + np.arange(n)))
+    cols = np.concatenate((np.arange(n), n + g.indices, np.full(n, sink)))
+    capacities = scipy.sparse.csr_array(
+        (np.ones(rows.size, dtype=np.int32), (rows, cols)), shape=(2 * n + 2,) * 2
+    )
+    flow = scipy.sparse.csgraph.maximum_flow(capacities, source, sink, method="dinic")
+
+    residual = capacities - flow.flow
+    residual.data = (residual.data > 0).astype(np.int8)
+    residual.eliminate_zeros()
+    reached = np.zeros(2 * n + 2, dtype=np.bool_)
+    reached[
+        scipy.sparse.csgraph.breadth_first_order(
+            residual, source, directed=True, return_predecessors=False
+        )
+    ] = True
+
+    return (~reached[:n]).astype(np.int8) + reached[n : 2 * n]
+
+
+def degree_bound(degrees: npt.NDArray[np.int64]) -> int:
+    r"""Returns the least number of nodes whose degrees add up to at least the
+    number of edges of a graph without self-loops, as each node of a cover covers at
+    most its degree in edges."""
+
+    num_edges = int(degrees.sum()) // 2
+    if num_edges == 0:
+        return 0
+    covered = np.cumsum(np.sort(degrees)[::-1])
+    return int(np.searchsorted(covered, num_edges)) + 1
+
+
+def parallel_greedy_cover(g: CSRGraph) -> npt.NDArray[np.bool_]:
+    r"""Finds a vertex cover of a graph without self-loops greedily, in parallel
+    rounds.
+
+    Like the greedy algorithm that repeatedly takes a node of maximum degree in the
+    remaining graph, but in each round takes every node whose degree is higher than
+    those of all of its remaining neighbors (with ties broken at random), which are
+    independent of each other.
+
+    :return: Whether each node is in the cover
+    """
+
+    n = g.order()
+    sources, targets = g.edges()
+    tiebreak = np.random.default_rng(_SEED).permutation(n)
+    cover = np.zeros(n, dtype=np.bool_)
+    live = np.arange(sources.size)
+
+    while live.size:
+        us, vs = sources[live], targets[live]
+        degrees = np.bincount(us, minlength=n) + np.bincount(vs, minlength=n)
+        keys = degrees * n + tiebreak
+
+        neighbor_max = np.zeros(n, dtype=np.int64)
+        np.maximum.at(neighbor_max, us, keys[vs])
+        np.maximum.at(neighbor_max, vs, keys[us])
+        chosen = (degrees > 0) & (keys > neighbor_max)
+
+        cover |= chosen
+        live = live[~(chosen[us] | chosen[vs])]
+
+    return cover
+
+
+def prune_cover(g: CSRGraph, cover: npt.NDArray[np.bool_]) -> npt.NDArray[np.bool_]:
+    r"""Removes nodes from a vertex cover of a graph without self-loops while it
+    stays a cover, until it is minimal.
+
+    A node of the cover is redundant if all of its neighbors are in the cover.  In
+    each round, the redundant nodes of lowest degree among their redundant
+    neighbors (with ties broken at random) are removed, which are independent of
+    each other, so the cover stays a cover.
+
+    :return: The pruned cover, as a new array
+    """
+
+    cover = cover.copy()
+    n = g.order()
+    rows = g._rows()
+    keys = g.degree() * n + np.random.default_rng(_SEED).permutation(n)
+
+    while True:
+        uncovered_neighbor = np.zeros(n, dtype=np.bool_)
+        uncovered_neighbor[rows[~cover[g.indices]]] = True
+        redundant = cover & ~uncovered_neighbor
+        if not redundant.any():
+            return cover
+
+        entries = redundant[rows] & redundant[g.indices]
+        neighbor_min = np.full(n, np.iinfo(np.int64).max)
+        np.minimum.at(neighbor_min, rows[entries], keys[g.indices[entries]])
+        cover[redundant & (keys < neighbor_min)] = False
+
+
+if __name__ == "__main__":
+    main()
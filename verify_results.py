@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+
+import argparse
+import concurrent.futures
+import os
+import pathlib
+import time
+import traceback
+import typing
+from collections import abc
+
+import numpy as np
+import numpy.typing as npt
+import scipy.sparse.csgraph
+import tabulate
+
+import edge_files
+import read_graph
+import utils
+from csr_graph import CSRGraph
+
+__all__ = ["CONNECTED_ALGORITHMS", "Check", "verify", "verify_graph"]
+
+logger = utils.configure_logger(__name__)
+
+# algorithms whose solutions must also induce a connected subgraph
+CONNECTED_ALGORITHMS = ("cvc",)
+
+
+class Check(typing.NamedTuple):
+    r"""The result of verifying the solution of one algorithm on one graph."""
+
+    graph: str
+    algorithm: str
+    ok: bool
+    message: str
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Verify that the solutions in a results directory are vertex covers of "
+            "their graphs, that the connected vertex covers are connected and that "
+            "the cardinality files match the solutions, and print a report."
+        )
+    )
+    _ = parser.add_argument(
+        "-d",
+        "--data_dir",
+        default="data/graphs/",
+        help=(
+            "Directory whose subdirectories contain the graphs (default: data/graphs/)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-r",
+        "--results_dir",
+        default="results/cvc_and_vc_vs_local_ratio_vc/",
+        help=(
+            "Directory containing results for one experiment, one subdirectory per "
+            "graph (default: results/cvc_and_vc_vs_local_ratio_vc/)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-g",
+        "--graph",
+        action="append",
+        dest="graphs",
+        help=(
+            "Name of a graph to verify; can be given multiple times (default: all "
+            "graphs in the results directory)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Number of worker processes (default: the number of CPUs)",
+    )
+    _ = parser.add_argument(
+        "-a",
+        "--all",
+        action="store_true",
+        help="Report the solutions that pass as well (default: only failures)",
+    )
+    _ = parser.add_argument(
+        "-f",
+        "--format",
+        default="simple",
+        help=(
+            "Name of the format of the output table as used by the python-tabulate "
+            "package (default: simple)."
+        ),
+    )
+
+    args = parser.parse_args()
+
+    checks = verify(args.data_dir, args.results_dir, graphs=args.graphs, jobs=args.jobs)
+
+    failures = [check for check in checks if not check.ok]
+    shown = checks if args.all else failures
+    if shown:
+        print(tabulate.tabulate(shown, headers=Check._fields, tablefmt=args.format))
+    print(f"Done: {len(checks) - len(failures)} passed, {len(failures)} failed.")
+
+    if failures:
+        raise SystemExit(1)
+
+
+def verify(
+    data_dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    results_dir: pathlib.Path | os.PathLike[typing.Any] | str,
+    graphs: abc.Iterable[str] | None = None,
+    jobs: int | None = None,
+) -> list[Check]:
+    r"""Verifies the solutions of every algorithm on every graph in ``results_dir``
+    (see :func:`verify_graph`) in a pool of worker processes.
+
+    :param graphs: Names of the graphs to verify; if None, all of them
+    :param jobs: Number of worker processes; if None, the number of CPUs
+    :return: The checks, sorted by graph and algorithm
+    """
+
+    if not os.fspath(data_dir):
+        raise ValueError("Cannot specify an empty path or string for data_dir")
+    else:
+        data_dir = pathlib.Path(data_dir)
+
+    if not os.fspath(results_dir):
+        raise ValueError("Cannot specify an empty path or string for results_dir")
+    else:
+        results_dir = pathlib.Path(results_dir)
+
+    res_dirs = [path for path in results_dir.iterdir() if path.is_dir()]
+    if graphs is not None:
+        graphs = set(graphs)
+        res_dirs = [path for path in res_dirs if path.name in graphs]
+
+    # the repository keeps only the properties of the largest graphs
+    missing = [
+        path for path in res_dirs if edge_files.find(data_dir / path.name) is None
+    ]
+    for path in missing:
+        logger.warning(f"Skipping '{path.name}', which is not in '{data_dir}'")
+    res_dirs = [path for path in res_dirs if path not in missing]
+
+    checks: list[Check] = []
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(verify_graph, data_dir / path.name, path): path.name
+            for path in res_dirs
+        }
+
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                checks += future.result()
+            except Exception as e:
+                logger.debug(traceback.format_exc())
+                checks.append(
+                    Check(futures[future], "*", False, f"{type(e).__name__}: {e}")
+                )
+
+    return sorted(checks)
+
+
+def verify_graph(graph_dir: pathlib.Path, res_dir: pathlib.Path) -> list[Check]:
+    r"""Verifies the solution of each algorithm in ``res_dir``, which is read from
+    ``<algorithm>_nodes.txt`` (one node per line), against the graph in
+    ``graph_dir``.
+
+    A solution passes if its nodes are nodes of the graph without repetitions, its
+    size is the number in ``<algorithm>_cardinality.txt``, and every edge has an
+    endpoint in it, which is checked in a single vectorized pass over the edges with
+    the solution as a boolean mask over the nodes.  The solution of an algorithm in
+    :data:`CONNECTED_ALGORITHMS` must also induce a connected subgraph, which is
+    checked by labeling the connected components of the induced subgraph.
+
+    :return: The check for each algorithm, in alphabetical order
+    """
+
+    start = time.perf_counter()
+    edges_path = edge_files.find(graph_dir)
+    if edges_path is None:
+        raise FileNotFoundError(f"No edge list in '{graph_dir}'")
+    # verifying leaves the dataset as it is, so no cache file is written
+    g = read_graph.from_file(edges_path, backend="csr", cache=False)
+    sources, targets = g.edges()
+    logger.info(f"Read '{graph_dir.name}' in {time.perf_counter() - start:.2f}s")
+
+    checks: list[Check] = []
+
+    for nodes_path in sorted(res_dir.glob("*_nodes.txt")):
+        algorithm = nodes_path.name.removesuffix("_nodes.txt")
+        try:
+            message = _verify_solution(g, sources, targets, algorithm, nodes_path)
+        except (OSError, ValueError) as e:
+            message = f"{type(e).__name__}: {e}"
+        checks.append(Check(graph_dir.name, algorithm, message is None, message or ""))
+
+    return checks
+
+
+def _verify_solution(
+    g: CSRGraph,
+    sources: npt.NDArray[np.int64],
+    targets: npt.NDArray[np.int64],
+    algorithm: str,
+    nodes_path: pathlib.Path,
+) -> str | None:
+    r"""Verifies one solution.
+
+    :return: Why the solution is invalid, or None if it is valid
+    """
+
+    with open(nodes_path, "rb") as f:
+        labels = f.read().split()
+    nodes = _node_indices(g, labels)
+    if (nodes < 0).any():
+        unknown = labels[int(np.flatnonzero(nodes < 0)[0])].decode()
+        return f"node {unknown} is not in the graph"
+
+    mask = np.zeros(g.order(), dtype=np.bool_)
+    mask[nodes] = True
+    count = int(np.count_nonzero(mask))
+    if count != nodes.size:
+        return f"{nodes.size - count} repeated node(s)"
+
+    with open(nodes_path.with_name(f"{algorithm}_cardinality.txt")) as f:
+        cardinality = int(f.read().strip())
+    if cardinality != count:
+        return f"cardinality file says {cardinality}, but there are {count} nodes"
+
+    uncovered = ~(mask[sources] | mask[targets])
+    if uncovered.any():
+        i = int(np.flatnonzero(uncovered)[0])
+        u, v = _label(g, int(sources[i])), _label(g, int(targets[i]))
+        return f"{int(np.count_nonzero(uncovered))} uncovered edge(s), e.g., {u} {v}"
+
+    if algorithm in CONNECTED_ALGORITHMS and count > 1:
+        num_components, _ = scipy.sparse.csgraph.connected_components(
+            g.subgraph(mask).to_scipy(), directed=False
+        )
+        if num_components != 1:
+            return f"induces {num_components} connected components"
+
+    return None
+
+
+def _node_indices(g: CSRGraph, labels: list[bytes]) -> npt.NDArray[np.int64]:
+    r"""Returns the indices of the nodes of ``g`` with the given labels, or -1 for
+    labels of no node."""
+
+    if g.labels is None or (
+        isinstance(g.labels, np.ndarray) and g.labels.dtype.kind in "iu"
+    ):
+        try:
+            values = np.array(labels, dtype=np.int64)
+        except ValueError:
+            return np.full(len(labels), -1, dtype=np.int64)
+
+        if g.labels is None:
+            return np.where((values >= 0) & (values < g.order()), values, -1)
+
+        # integer labels are numbered in ascending order
+        sorted_labels = np.asarray(g.labels, dtype=np.int64)
+        indices = np.searchsorted(sorted_labels, values)
+        found = indices < sorted_labels.size
+        found[found] = sorted_labels[indices[found]] == values[found]
+        return np.where(found, indices, -1)
+
+    index = {str(label): i for i, label in enumerate(g.labels)}
+    return np.array([index.get(label.decode(), -1) for label in labels], np.int64)
+
+
+def _label(g: CSRGraph, v: int) -> typing.Any:
+    return v if g.labels is None else g.labels[v]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import os
+import pathlib
+import typing
+
+import numpy as np
+import numpy.typing as npt
+
+import edge_files
+
+__all__ = ["to_edge_list_file", "to_node_mapping_file"]
+
+# number of lines formatted at once, which bounds the memory used for the text
+_LINES_PER_CHUNK = 1 << 16
+
+
+def to_edge_list_file(
+    file: pathlib.Path | os.PathLike[typing.Any] | str | typing.BinaryIO,
+    sources: npt.ArrayLike,
+    targets: npt.ArrayLike,
+) -> None:
+    r"""Writes an edge list, one ``source target`` pair per line, in the same format
+    as :func:`nx.write_edgelist` with ``data=False``.
+
+    A path to a compressed file (see :mod:`edge_files`) is compressed as it is
+    written, and a delta-encoded file holds the same edges in the same order.
+
+    :param file: Path to the file, or a file object opened in binary mode
+    :param sources: One endpoint of each edge
+    :param targets: The other endpoint of each edge
+    """
+
+    if isinstance(file, str | os.PathLike) and os.fspath(file):
+        match edge_files.compression_of(file):
+            case "dv":
+                with open(file, "wb") as f:
+                    _ = f.write(edge_files.encode_delta(sources, targets))
+                return
+            case "gz" | "xz":
+                with edge_files.open_edges(file, "wb") as f:
+                    _write_pairs(f, sources, targets)
+                return
+
+    _write_pairs(file, sources, targets)
+
+
+def to_node_mapping_file(
+    file: pathlib.Path | os.PathLike[typing.Any] | str | typing.BinaryIO,
+    new_labels: npt.ArrayLike,
+    orig_labels: npt.ArrayLike,
+) -> None:
+    r"""Writes a node mapping, one ``new original`` pair of labels per line, as in the
+    ``node_mapping.txt`` files of the dataset."""
+
+    _write_pairs(file, new_labels, orig_labels)
+
+
+def _write_pairs(
+    file: pathlib.Path | os.PathLike[typing.Any] | str | typing.BinaryIO,
+    first: npt.ArrayLike,
+    second: npt.ArrayLike,
+) -> None:
+    if isinstance(file, str | os.PathLike):
+        if not os.fspath(file):
+            raise ValueError("Path must not be empty")
+
+        with open(file, "wb") as f:
+            _write_pairs(f, first, second)
+            return
+
+    first = np.asarray(first)
+    second = np.asarray(second)
+    if first.shape != second.shape:
+        raise ValueError("Expected arrays of equal lengths")
+
+    for start in range(0, first.size, _LINES_PER_CHUNK):
+        stop = start + _LINES_PER_CHUNK
+        lines = np.strings.add(
+            np.strings.add(first[start:stop].astype(np.str_), " "),
+            second[start:stop].astype(np.str_),
+        )
+        _ = file.write(("\n".join(lines.tolist()) + "\n").encode())